@@ -1,5 +1,18 @@
+"""
+ASGI girişi. AI etiket uç noktaları (notes.views.AITagGeneratorView) asenkron
+olduğundan bir ASGI sunucusuyla çalıştırıldığında model cevabı beklenirken
+worker bloklanmaz. Değişiklik bildirimleri (GET /api/events/, server-sent
+events) de sadece ASGI altında çalışır; boştaki bağlantılar thread tutmaz.
+Üretimde `gunicorn backend.asgi:application` (uvicorn worker'ları
+gunicorn.conf.py'de), geliştirmede `uvicorn backend.asgi:application --reload`.
+"""
 import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Django kurulduktan sonra içe aktarılmalı
+from notes.events import EventStreamApplication  # noqa: E402
+
+application = EventStreamApplication(django_application)
@@ -1,7 +1,8 @@
 from pathlib import Path
+import importlib.util
 import os
 import dj_database_url
-import google.generativeai as genai
+from django.core.exceptions import ImproperlyConfigured
 
 
 
@@ -37,6 +38,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    "notes.instrumentation.PerformanceMiddleware", # PERF_INSTRUMENTATION kapalıysa yüklenmez
+    "notes.routing.ReplicaRoutingMiddleware", # DATABASE_REPLICAS boşsa yüklenmez
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",  
     "django.middleware.common.CommonMiddleware",
@@ -52,7 +55,7 @@ ROOT_URLCONF = "backend.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [BASE_DIR.parent / "frontend/dist"],
+        "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -82,6 +85,59 @@ if database_url:
         conn_health_checks=True,
     )
 
+# SQLite üretim modu: WAL ile okumalar yazmayı beklemez, IMMEDIATE
+# transaction'lar yazma kilidini baştan alır (okuyup sonra yazan iki
+# transaction'ın birbirini "database is locked" ile düşürmesi yerine sıra
+# beklenir), busy_timeout kadar kilit beklenir. WAL veritabanı dosyasında
+# kalıcıdır; `-wal`/`-shm` dosyaları veritabanının yanında oluşur.
+SQLITE_OPTIMIZED = os.environ.get("SQLITE_OPTIMIZED", "0") == "1"
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024)) # bayt
+SQLITE_OPTIMIZED_OPTIONS = {
+    "transaction_mode": "IMMEDIATE",
+    "init_command": (
+        "PRAGMA journal_mode=WAL;"
+        f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS};"
+        # WAL'da NORMAL: commit'te fsync yok, sadece checkpoint'te; çökmede veri bozulmaz
+        "PRAGMA synchronous=NORMAL;"
+        f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};"
+    ),
+}
+if SQLITE_OPTIMIZED and DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"].setdefault("OPTIONS", {}).update(SQLITE_OPTIMIZED_OPTIONS)
+
+# Okuma replikaları (notes/routing.py): virgülle ayrılmış veritabanı URL'leri.
+# Güvenli isteklerdeki okumalar replikalara gider; yazan istemci
+# DATABASE_STICKY_SECONDS boyunca birincilden okur.
+DATABASE_REPLICAS = []
+for index, replica_url in enumerate(filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(","))):
+    DATABASES[f"replica{index}"] = {
+        **dj_database_url.parse(replica_url.strip(), conn_max_age=600, conn_health_checks=True),
+        # Testlerde ayrı veritabanı oluşturulmaz; birincil kullanılır
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica{index}")
+DATABASE_ROUTERS = ["notes.routing.ReplicaRouter"]
+DATABASE_STICKY_SECONDS = int(os.environ.get("DATABASE_STICKY_SECONDS", 5))
+
+# Varsayılan süreç içi önbellek; çok worker'lı kurulumda REDIS_URL ile paylaşımlı önbellek
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+redis_url = os.environ.get("REDIS_URL")
+if redis_url:
+    # Önbellek ve olay dağıtıcısı (RedisBroker) redis paketini ilk kullanımda
+    # içe aktarır; eksikse ilk istekte değil açılışta hata verilir
+    if importlib.util.find_spec("redis") is None:
+        raise ImproperlyConfigured("REDIS_URL ayarlı ama redis paketi kurulu değil (pip install redis).")
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": redis_url,
+    }
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = "tr-tr"
@@ -97,7 +153,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "notes.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
 }
@@ -144,6 +200,12 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage" 
 
 WHITENOISE_ROOT = BASE_DIR.parent / 'frontend' / 'dist'
+# Vite çıktısındaki hash'li dosyalar (assets/index-<8 karakter>.js) hiç değişmez;
+# WhiteNoise bunları `max-age=315360000, immutable` ile sunar. Sıkıştırılmış
+# kopyaları `npm run build` sonrasında `manage.py compress_frontend` üretir.
+WHITENOISE_IMMUTABLE_FILE_TEST = r"^/assets/.+-[\w-]{8}\.\w+$"
+# Arayüz kabuğu notes/spa.py tarafından bellekten ve sıkıştırılmış sunulur
+SPA_INDEX_FILE = WHITENOISE_ROOT / 'index.html'
 
 CSRF_COOKIE_SECURE = not DEBUG
 SESSION_COOKIE_SECURE = not DEBUG
@@ -152,11 +214,126 @@ SESSION_COOKIE_SAMESITE = 'None'
 
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 
-if GOOGLE_API_KEY:
-    try:
-        genai.configure(api_key=GOOGLE_API_KEY)
-        print("Google Generative AI başarıyla yapılandırıldı.")
-    except Exception as e:
-        print(f"KRİTİK HATA: Google Generative AI yapılandırılamadı: {e}")
-else:
+# AI etiket üretimi (bkz. notes/ai.py)
+AI_TAG_PROVIDER = os.environ.get("AI_TAG_PROVIDER", "notes.ai.GeminiTagProvider")
+AI_TAG_CACHE_SIZE = int(os.environ.get("AI_TAG_CACHE_SIZE", 1024))
+AI_TAG_CACHE_TTL = int(os.environ.get("AI_TAG_CACHE_TTL", 3600)) # saniye
+AI_TAG_CONCURRENCY = int(os.environ.get("AI_TAG_CONCURRENCY", 4))
+AI_TAG_TIMEOUT = float(os.environ.get("AI_TAG_TIMEOUT", 20)) # saniye
+AI_TAG_BATCH_LIMIT = 50
+
+# Etiket adı -> id süreç içi önbelleği (notes/tagging.py)
+TAG_ID_CACHE_SIZE = 5000
+TAG_ID_CACHE_TTL = 600 # saniye
+
+# Doğrulanmış token'lar için süreç içi önbellek (notes/authentication.py).
+# Alias verilirse paylaşımlı önbellek ikinci katman olarak kullanılır.
+# Güvenlik penceresi: pasifleştirme, kullanıcı silme ve token iptali sadece
+# işlemi yapan worker'ın yerel önbelleğini temizler; diğer worker'larda
+# kullanıcı AUTH_TOKEN_CACHE_TTL saniye (varsayılan 60) daha doğrulanabilir.
+# Bu kabul edilemiyorsa AUTH_TOKEN_CACHE_TTL=0 ile yerel katman kapatılır.
+# Sinyal tetiklemeyen toplu güncellemelerden sonra forget_user_tokens çağrılmalı;
+# aksi halde pasif kullanıcının token'ı bu süreler boyunca çalışır.
+AUTH_TOKEN_CACHE_SIZE = 10000
+AUTH_TOKEN_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_CACHE_TTL", 60)) # saniye
+AUTH_TOKEN_SHARED_CACHE_TTL = int(os.environ.get("AUTH_TOKEN_SHARED_CACHE_TTL", 300)) # saniye
+AUTH_TOKEN_CACHE_ALIAS = "default" if redis_url else None
+
+# Toplu not işlemleri (POST /api/notes/batch/) için en fazla işlem sayısı
+NOTE_BATCH_LIMIT = 500
+
+# Değişiklik bildirimleri (GET /api/events/, notes/events.py). Varsayılan
+# broker süreç içidir; REDIS_URL varsa olaylar worker'lar arasında Redis
+# pub/sub ile dağıtılır (redis paketi gerekir).
+NOTE_EVENTS_BACKEND = os.environ.get(
+    "NOTE_EVENTS_BACKEND",
+    "notes.events.RedisBroker" if redis_url else "notes.events.LocalBroker",
+)
+NOTE_EVENTS_REDIS_URL = redis_url
+NOTE_EVENTS_QUEUE_SIZE = 100 # Bağlantı başına bekleyen en fazla olay
+NOTE_EVENTS_HEARTBEAT = 25 # saniye
+NOTE_EVENTS_RETRY_MS = 3000 # İstemcinin yeniden bağlanma aralığı
+NOTE_EVENTS_TICKET_TTL = 30 # saniye; tarayıcının akışa bağlanmak için aldığı tek kullanımlık bilet
+
+# Dışa aktarmada bir seferde okunan not sayısı ve içe aktarmada parti
+# (transaction) başına not sayısı (notes/transfer.py)
+EXPORT_CHUNK_SIZE = 500
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_ERRORS = 100 # Yanıtta raporlanan en fazla hatalı satır
+
+# Çöp kutusu: bu kadar günden uzun süredir çöpte olan notlar `manage.py purge_trash`
+# ile kalıcı silinir (0: kapalı). Silme, parça başına bu kadar notla yapılır.
+TRASH_RETENTION_DAYS = int(os.environ.get("TRASH_RETENTION_DAYS", 30))
+TRASH_PURGE_CHUNK_SIZE = 500
+# Kalıcı silinen notların ?since= için tutulan kayıtları (NoteTombstone) bu
+# kadar gün saklanır; daha eski sürümden senkronize olan istemci listeyi baştan çeker
+NOTE_TOMBSTONE_RETENTION_DAYS = int(os.environ.get("NOTE_TOMBSTONE_RETENTION_DAYS", 30))
+# Saklama süresi `manage.py purge_trash` ile (cron veya ayrı bir süreçte
+# `--loop`) işlenir. "Çöpü boşalt" varsayılan olarak istek içinde çalışır;
+# TRASH_PURGE_WORKER=1 işi arka plana (web sürecindeki bir thread'e veya
+# `purge_trash --loop`a) bırakır. Birden çok gunicorn worker'ında her biri
+# kendi thread'ini açacağından tek süreçli kurulumlar dışında kapalı tutun.
+TRASH_PURGE_WORKER = os.environ.get("TRASH_PURGE_WORKER", "0") == "1"
+
+# Not revizyon geçmişi (notes/revisions.py): bu kadar revizyonda bir tam
+# içerik (snapshot), arada farklar saklanır. Eski revizyonlar yaşına göre
+# (en az yaş sn, aralık sn) kurallarıyla aralık başına bire indirilir ve
+# REVISION_RETENTION_DAYS günden eskiler silinir (0: süresiz).
+REVISION_SNAPSHOT_INTERVAL = 20
+REVISION_DIFF_MAX_TOKENS = 20000 # Daha büyük değişikliklerde parça eşleştirme yapılmaz
+REVISION_COALESCE_RULES = [
+    (3600, 600), # 1 saatten eski: 10 dakikada bir
+    (86400, 3600), # 1 günden eski: saatte bir
+    (7 * 86400, 86400), # 1 haftadan eski: günde bir
+]
+REVISION_RETENTION_DAYS = int(os.environ.get("REVISION_RETENTION_DAYS", 180))
+# Seyreltme `manage.py compact_revisions` ile (cron veya ayrı bir süreçte
+# `--loop`) yapılır. REVISION_COMPACT_WORKER=1 ise not başına bu kadar
+# revizyonda bir web sürecindeki thread'e bırakılır (tek süreçli kurulumlar).
+REVISION_COMPACT_EVERY = 50
+REVISION_COMPACT_WORKER = os.environ.get("REVISION_COMPACT_WORKER", "0") == "1"
+
+# Benzer/tekrarlanan notlar (notes/similarity.py): not başına MinHash imza
+# uzunluğu; tekrar adayları imzanın SIMILARITY_BAND_ROWS değerlik bantlarından
+# biri aynı olan notlardır. Son kullanılan bu kadar kullanıcının indeksi bellekte tutulur.
+SIMILARITY_NUM_PERM = 64
+SIMILARITY_BAND_ROWS = 4
+SIMILARITY_RELATED_MIN = 0.1
+SIMILARITY_DUPLICATE_THRESHOLD = 0.8
+# Bundan az kelimeli notlar tekrar gruplarına alınmaz
+SIMILARITY_DUPLICATE_MIN_TOKENS = 3
+SIMILARITY_INDEX_CACHE_SIZE = int(os.environ.get("SIMILARITY_INDEX_CACHE_SIZE", 32))
+# İmzası eksik notlardan istek başına en fazla bu kadarı hesaplanır (~0.5 sn);
+# kalanlar sonraki isteklere kalır. Toplu hesaplama: `manage.py compute_note_signatures`
+SIMILARITY_SIGNATURE_BUDGET = int(os.environ.get("SIMILARITY_SIGNATURE_BUDGET", 2000))
+
+# İstek performans ölçümü (notes/instrumentation.py): Server-Timing başlığı,
+# `notes.performance` logları, /api/metrics/ ve örneklemeli cProfile
+PERF_INSTRUMENTATION = os.environ.get("PERF_INSTRUMENTATION", "0") == "1"
+PERF_SLOW_REQUEST_MS = int(os.environ.get("PERF_SLOW_REQUEST_MS", 500))
+PERF_PROFILE_SAMPLE_RATE = float(os.environ.get("PERF_PROFILE_SAMPLE_RATE", 0)) # 0-1 arası
+PERF_PROFILE_DIR = os.environ.get("PERF_PROFILE_DIR", str(BASE_DIR / "profiles"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "notes.performance": {
+            "handlers": ["console"],
+            "level": os.environ.get("PERF_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+# Paylaşılan notlar: sunucu önbelleği (değişiklikte silinir) ve tarayıcı/CDN
+# (max-age, sonra ETag ile doğrulama) süreleri
+PUBLIC_NOTE_CACHE_TTL = int(os.environ.get("PUBLIC_NOTE_CACHE_TTL", 300))
+PUBLIC_NOTE_MAX_AGE = int(os.environ.get("PUBLIC_NOTE_MAX_AGE", 60))
+
+# google.generativeai burada içe aktarılmaz; ilk AI isteğinde notes/ai.py yükler.
+if not GOOGLE_API_KEY:
     print("UYARI: GOOGLE_API_KEY ortam değişkeni ayarlanmamış. AI özellikleri çalışmayacak.")
\ No newline at end of file
@@ -1,7 +1,8 @@
 
 from django.contrib import admin
-from django.urls import path, include
-from django.views.generic import TemplateView
+from django.urls import path, include, re_path
+
+from notes.spa import spa_shell
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -11,6 +12,8 @@ urlpatterns = [
     
     path("api/", include("notes.urls")),
 
-    path("", TemplateView.as_view(template_name="index.html"))
+    # Arayüz: kök ve uygulama içi bağlantılar (/share/<uuid>) aynı kabuğu alır.
+    # Uzantılı yollar (eksik asset'ler) ve diğer önekler 404 döner.
+    re_path(r"^(?!(?:api|admin|static|assets)/)(?!.*\.\w+/?$)", spa_shell),
 
 ]
@@ -0,0 +1,19 @@
+"""
+Üretim sunucusu ayarları; gunicorn bu dosyayı çalışma dizininden (backend/)
+kendiliğinden okur:
+
+    gunicorn backend.asgi:application
+
+Uygulama ASGI olarak, uvicorn worker'larıyla çalışır: değişiklik bildirimleri
+(GET /api/events/) ve asenkron AI etiket uç noktaları sadece backend.asgi
+altında çalışır; WSGI (backend.wsgi) ile her SSE bağlantısı bir worker'ı
+tutardı. Worker sayısı WEB_CONCURRENCY, adres PORT ortam değişkeninden
+alınır (gunicorn varsayılanı). Çok worker'lı kurulumda olaylar ve akış
+biletleri için REDIS_URL tanımlanmalıdır (bkz. notes/events.py); çöp
+boşaltma ve revizyon seyreltme web süreçlerinde değil `manage.py
+purge_trash --loop` / `compact_revisions --loop` ile ayrı süreçte çalışır.
+"""
+wsgi_app = "backend.asgi:application"
+worker_class = "uvicorn_worker.UvicornWorker"
+# SSE bağlantıları açık kalırken yeniden başlatmada bekleme süresi
+graceful_timeout = 10
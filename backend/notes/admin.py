@@ -1,4 +1,9 @@
 from django.contrib import admin
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+
+from .authentication import forget_user_tokens
 from .models import Note
 
 @admin.register(Note)
@@ -6,3 +11,26 @@ class NoteAdmin(admin.ModelAdmin):
     list_display = ('id','title','created_at')
     search_fields = ('title','content')
     ordering = ('-created_at',)
+
+
+admin.site.unregister(User)
+
+
+@admin.register(User)
+class NotesUserAdmin(UserAdmin):
+    actions = ['deactivate_users', 'revoke_tokens']
+
+    @admin.action(description='Seçili kullanıcıları pasifleştir')
+    def deactivate_users(self, request, queryset):
+        # update() sinyal tetiklemez; önbellekteki token'lar elle silinir
+        user_ids = list(queryset.values_list('pk', flat=True))
+        count = User.objects.filter(pk__in=user_ids).update(is_active=False)
+        forget_user_tokens(user_ids)
+        self.message_user(request, f'{count} kullanıcı pasifleştirildi.')
+
+    @admin.action(description="Seçili kullanıcıların token'larını iptal et")
+    def revoke_tokens(self, request, queryset):
+        user_ids = list(queryset.values_list('pk', flat=True))
+        forget_user_tokens(user_ids)
+        count, _ = Token.objects.filter(user_id__in=user_ids).delete()
+        self.message_user(request, f'{count} token iptal edildi.')
@@ -0,0 +1,84 @@
+"""
+Kullanıcı bazlı etiket ve kategori sayımları.
+
+Sayımlar tek bir GROUP BY sorgusuyla hesaplanır ve kullanıcının koleksiyon
+sürümüyle anahtarlanan önbellekte tutulur; not veya etiket değiştiğinde
+sürüm arttığı için eski kayıt kendiliğinden geçersiz olur. Zaman pencereli
+sayımlar zamanla değiştiğinden kayıtların ayrıca bir ömrü vardır.
+"""
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Note, Category, CollectionVersion
+
+# Trend hesapları için önceden sayılan pencereler (gün)
+TREND_WINDOWS = (1, 7, 30)
+TAG_COUNTS_TTL = 300
+CATEGORY_COUNTS_TTL = 300
+
+
+def current_version(user):
+    return CollectionVersion.objects.filter(user=user).values_list('version', flat=True).first() or 0
+
+
+def compute_tag_counts(user):
+    now = timezone.now()
+    windows = {
+        f'count_{days}d': Count('id', filter=Q(updated_at__gte=now - timedelta(days=days)))
+        for days in TREND_WINDOWS
+    }
+    rows = (
+        Note.objects.filter(owner=user, is_deleted=False, tags__isnull=False)
+        .values('tags__id', 'tags__name', 'tags__slug')
+        .annotate(count=Count('id'), **windows)
+        .order_by('-count', 'tags__name')
+    )
+    return [
+        {
+            'id': row['tags__id'],
+            'name': row['tags__name'],
+            'slug': row['tags__slug'],
+            'count': row['count'],
+            'windows': {days: row[f'count_{days}d'] for days in TREND_WINDOWS},
+        }
+        for row in rows
+    ]
+
+
+def tag_counts(user, version=None):
+    """
+    Aktif (çöpte olmayan) notlardaki etiketler ve kullanım sayıları.
+    """
+    if version is None:
+        version = current_version(user)
+    key = f'notes:tag-counts:{user.pk}:{version}'
+    counts = cache.get(key)
+    if counts is None:
+        counts = compute_tag_counts(user)
+        cache.set(key, counts, TAG_COUNTS_TTL)
+    return counts
+
+
+def annotate_note_counts(categories):
+    # Çöpteki notlar sayılmaz; kategorisi olmayan notlar için bkz. /api/notes/stats/
+    return categories.annotate(note_count=Count('notes', filter=Q(notes__is_deleted=False)))
+
+
+def category_counts(user, version=None):
+    """
+    Kullanıcının kategorileri ve aktif not sayıları; tek LEFT JOIN + GROUP BY sorgusu.
+    """
+    if version is None:
+        version = current_version(user)
+    key = f'notes:category-counts:{user.pk}:{version}'
+    categories = cache.get(key)
+    if categories is None:
+        categories = list(
+            annotate_note_counts(Category.objects.filter(owner=user))
+            .order_by('pk').values('id', 'name', 'color', 'note_count')
+        )
+        cache.set(key, categories, CATEGORY_COUNTS_TTL)
+    return categories
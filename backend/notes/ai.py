@@ -0,0 +1,157 @@
+"""
+AI etiket üretimi.
+
+Sağlayıcılar (Gemini, yerel taslak) `BaseTagProvider` arayüzünü uygular ve
+`AI_TAG_PROVIDER` ayarıyla seçilir. `TagService` sağlayıcının önüne:
+- içerik özetine (hash) göre TTL/LRU önbellek,
+- aynı anda gelen özdeş istekleri tek çağrıda birleştirme,
+- eşzamanlı çağrı sınırı ve zaman aşımı
+ekler. Servis asenkron çalışır; ASGI altında istek sağlayıcıyı beklerken
+worker bloklanmaz. Servis ve sağlayıcı ilk istekte oluşturulur
+(`get_tag_service`), böylece açılışta Google SDK'sı yüklenmez.
+"""
+import asyncio
+import hashlib
+import re
+import threading
+import weakref
+from collections import Counter
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+PROMPT = """
+Aşağıdaki metni analiz et ve Türkçe olarak en uygun 3 ila 5 etiketi bul.
+Sadece etiketleri virgül ile ayırarak yaz. Başka açıklama yapma.
+
+Başlık: {title}
+İçerik: {content}
+"""
+
+
+class TagGenerationError(Exception):
+    pass
+
+
+def parse_tags(text):
+    return [tag.strip() for tag in text.strip().split(',') if tag.strip()]
+
+
+class BaseTagProvider:
+    async def generate(self, title, content):
+        raise NotImplementedError
+
+
+class GeminiTagProvider(BaseTagProvider):
+    model_name = 'gemini-1.5-flash'
+
+    def __init__(self):
+        # Google SDK (gRPC/protobuf) ağır; sadece sağlayıcı ilk kullanıldığında yüklenir
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GOOGLE_API_KEY)
+        self.model = genai.GenerativeModel(self.model_name)
+
+    async def generate(self, title, content):
+        response = await self.model.generate_content_async(PROMPT.format(title=title, content=content))
+        return parse_tags(response.text)
+
+
+class StubTagProvider(BaseTagProvider):
+    """
+    Ağ erişimi olmadan çalışan yerel sağlayıcı: metindeki en sık geçen
+    kelimeleri etiket yapar. Test ve ölçümlerde kullanılır;
+    `AI_TAG_STUB_DELAY` ile model gecikmesi taklit edilebilir.
+    """
+    word_re = re.compile(r"\w{4,}", re.UNICODE)
+
+    async def generate(self, title, content):
+        delay = getattr(settings, 'AI_TAG_STUB_DELAY', 0)
+        if delay:
+            await asyncio.sleep(delay)
+        words = Counter(word.lower() for word in self.word_re.findall(f"{title} {content}"))
+        return [word for word, _ in words.most_common(5)]
+
+
+class TagService:
+    def __init__(self, provider, cache_size=1024, cache_ttl=3600, concurrency=4, timeout=20):
+        self.provider = provider
+        self.cache = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self.cache_lock = threading.Lock()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        # Semafor ve bekleyen istekler event loop'a bağlıdır (WSGI altında
+        # her çağrı ayrı bir loop'ta çalışabilir)
+        self.loop_state = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def key(title, content):
+        return hashlib.sha256(f"{title}\0{content}".encode('utf-8')).hexdigest()
+
+    def state(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self.loop_state:
+            self.loop_state[loop] = (asyncio.Semaphore(self.concurrency), {})
+        return self.loop_state[loop]
+
+    async def call_provider(self, key, title, content):
+        semaphore, _ = self.state()
+        async with semaphore:
+            try:
+                tags = await asyncio.wait_for(self.provider.generate(title, content), self.timeout)
+            except asyncio.TimeoutError:
+                raise TagGenerationError("Etiket üretimi zaman aşımına uğradı.")
+            except TagGenerationError:
+                raise
+            except Exception as e:
+                raise TagGenerationError(str(e)) from e
+        with self.cache_lock:
+            self.cache[key] = tags
+        return tags
+
+    async def generate(self, title, content):
+        key = self.key(title, content)
+        with self.cache_lock:
+            cached = self.cache.get(key)
+        if cached is not None:
+            return list(cached)
+
+        _, inflight = self.state()
+        task = inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self.call_provider(key, title, content))
+            inflight[key] = task
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        # Bekleyenlerden biri iptal edilirse ortak görev iptal olmasın
+        return list(await asyncio.shield(task))
+
+    async def generate_many(self, items):
+        """
+        [(title, content), ...] için sonuçları aynı sırada döner; hatalı
+        öğeler için TagGenerationError nesnesi döner.
+        """
+        return await asyncio.gather(
+            *(self.generate(title, content) for title, content in items),
+            return_exceptions=True,
+        )
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_tag_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                provider = import_string(settings.AI_TAG_PROVIDER)()
+                _service = TagService(
+                    provider,
+                    cache_size=settings.AI_TAG_CACHE_SIZE,
+                    cache_ttl=settings.AI_TAG_CACHE_TTL,
+                    concurrency=settings.AI_TAG_CONCURRENCY,
+                    timeout=settings.AI_TAG_TIMEOUT,
+                )
+    return _service
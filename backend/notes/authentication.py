@@ -0,0 +1,100 @@
+"""
+Önbellekli token doğrulama.
+
+DRF'nin TokenAuthentication'ı her API isteğinde Token + User birleştirmesiyle
+bir sorgu atar; toggle_pin gibi ucuz uç noktalarda bu, sorguların önemli bir
+kısmıdır. `CachedTokenAuthentication` doğrulanmış (kullanıcı, token) çiftini
+süreç içinde sınırlı bir TTL önbelleğinde tutar. AUTH_TOKEN_CACHE_ALIAS
+verilirse (ör. Redis kullanılırken "default") yerel önbellekte olmayanlar
+paylaşımlı önbellekten okunur; böylece worker'lar birbirinin sonucunu kullanır.
+
+Kayıtlar notes/signals.py üzerinden silinir: token silindiğinde (dj_rest_auth
+çıkışı, token yenileme, QuerySet.delete()) ve kullanıcı kaydedildiğinde
+(pasifleştirme, şifre değişikliği). Silme sadece o anki sürecin yerel
+önbelleğine ve paylaşımlı önbelleğe ulaşır; diğer worker'ların yerel
+önbellekleri haberdar olmaz. Bu yüzden çok worker'lı kurulumlarda pasifleştirilen,
+silinen veya token'ı iptal edilen kullanıcı diğer worker'larda en fazla
+AUTH_TOKEN_CACHE_TTL saniye (varsayılan 60) daha doğrulanabilir.
+AUTH_TOKEN_CACHE_TTL=0 yerel katmanı kapatır: paylaşımlı önbellek varsa
+iptal tüm worker'larda hemen geçerli olur, yoksa her istek veritabanına gider.
+
+Sinyal tetiklemeyen yollar (`User.objects.filter(...).update(is_active=False)`,
+ham SQL, loaddata) önbelleği temizlemez; bu yollardan pasifleştirilen
+kullanıcıların token'ları paylaşımlı önbellekte AUTH_TOKEN_SHARED_CACHE_TTL,
+yerel önbellekte AUTH_TOKEN_CACHE_TTL saniyeye kadar çalışmaya devam eder.
+Bu yollar `forget_user_tokens` çağırmalıdır (bkz. notes/admin.py); o da
+yukarıdaki gibi diğer worker'ların yerel önbelleklerini temizleyemez.
+"""
+import copy
+import hashlib
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+_tokens = TTLCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE, ttl=settings.AUTH_TOKEN_CACHE_TTL)
+_tokens_lock = threading.Lock()
+
+
+def shared_cache():
+    alias = settings.AUTH_TOKEN_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def cache_key(key):
+    # Token'ın kendisi paylaşımlı önbellekte anahtar olarak saklanmaz
+    return "notes:auth-token:" + hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def forget_tokens(keys):
+    keys = list(keys)
+    if not keys:
+        return
+    with _tokens_lock:
+        for key in keys:
+            _tokens.pop(key, None)
+    shared = shared_cache()
+    if shared is not None:
+        shared.delete_many([cache_key(key) for key in keys])
+
+
+def forget_user_tokens(user_ids):
+    """
+    Kullanıcıların token'larını işlem (transaction) tamamlanınca önbellekten
+    siler; sinyal tetiklemeyen toplu güncellemelerden sonra çağrılır.
+    """
+    keys = list(Token.objects.filter(user_id__in=list(user_ids)).values_list("key", flat=True))
+    if keys:
+        transaction.on_commit(lambda: forget_tokens(keys))
+
+
+def forget_all_tokens():
+    with _tokens_lock:
+        _tokens.clear()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    def authenticate_credentials(self, key):
+        with _tokens_lock:
+            cached = _tokens.get(key)
+        shared = shared_cache()
+        if cached is None and shared is not None:
+            cached = shared.get(cache_key(key))
+            if cached is not None:
+                with _tokens_lock:
+                    _tokens[key] = cached
+        if cached is None:
+            # Geçersiz/pasif token'lar için hata super()'dan gelir ve önbelleğe girmez
+            cached = super().authenticate_credentials(key)
+            with _tokens_lock:
+                _tokens[key] = cached
+            if shared is not None:
+                shared.set(cache_key(key), cached, settings.AUTH_TOKEN_SHARED_CACHE_TTL)
+        # Thread'ler aynı model örneklerini paylaşmasın
+        user, token = copy.copy(cached[0]), copy.copy(cached[1])
+        token.user = user
+        return user, token
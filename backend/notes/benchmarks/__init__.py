@@ -0,0 +1,66 @@
+"""
+`python manage.py benchmark <suite>` ile çalışan performans ölçümleri.
+
+Her ölçüm geçici bir test veritabanında çalışır; geliştirme veritabanına
+dokunulmaz. Suite modülleri `help`, `add_arguments(parser)` ve
+`run(command, **options)` tanımlar; veritabanı gerektirmeyenler
+`uses_database = False` bildirir.
+"""
+import os
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.db import connections
+
+SUITES = [
+    "search",
+    "queries",
+    "explain",
+    "ai",
+    "startup",
+    "public",
+    "tagging",
+    "load",
+    "auth",
+    "transfer",
+    "events",
+    "revisions",
+    "concurrency",
+    "similarity",
+    "spa",
+]
+
+
+@contextmanager
+def benchmark_database(using="default", shared=False):
+    """
+    Ölçüm süresince geçici bir test veritabanı oluşturur ve sonunda siler.
+    `shared` verilirse SQLite bellek yerine geçici bir dosya kullanır; böylece
+    başka thread'lerdeki bağlantılar (ör. yerel HTTP sunucusu) aynı veriyi görür.
+    """
+    connection = connections[using]
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    old_test_name = test_settings.get("NAME")
+    if shared and connection.vendor == "sqlite":
+        test_settings["NAME"] = os.path.join(tempfile.gettempdir(), f"notes-benchmark-{os.getpid()}.sqlite3")
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = old_test_name
+
+
+def measure(func, repeat=5):
+    """
+    Fonksiyonu `repeat` kez çalıştırır, milisaniye cinsinden medyanı döner.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
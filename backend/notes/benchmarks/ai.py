@@ -0,0 +1,54 @@
+"""
+AI etiket servisinin önbellek, birleştirme ve eşzamanlılık etkisini ölçer.
+
+Yerel taslak sağlayıcı yapay bir gecikmeyle kullanılır; eski davranış
+(her istek için sırayla model çağrısı) ile TagService karşılaştırılır.
+"""
+import asyncio
+import time
+
+from notes.ai import StubTagProvider, TagService
+
+help = "AI etiket servisini taslak sağlayıcıyla ölçer."
+
+
+class CountingProvider(StubTagProvider):
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = 0
+
+    async def generate(self, title, content):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return await super().generate(title, content)
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--unique", type=int, default=20)
+    parser.add_argument("--delay", type=float, default=0.05, help="Sağlayıcı gecikmesi (sn)")
+    parser.add_argument("--concurrency", type=int, default=4)
+
+
+def run(command, requests, unique, delay, concurrency, **options):
+    items = [(f"not {i % unique}", f"içerik {i % unique} kelime kelime") for i in range(requests)]
+
+    async def sequential():
+        provider = CountingProvider(delay)
+        for title, content in items:
+            await provider.generate(title, content)
+        return provider.calls
+
+    async def service():
+        provider = CountingProvider(delay)
+        tag_service = TagService(provider, concurrency=concurrency)
+        await tag_service.generate_many(items)
+        return provider.calls
+
+    for name, scenario in (("sıralı (eski)", sequential), ("TagService", service)):
+        start = time.perf_counter()
+        calls = asyncio.run(scenario())
+        elapsed = time.perf_counter() - start
+        command.stdout.write(
+            f"{name:<16} {elapsed:>8.2f} sn  {requests / elapsed:>8.1f} istek/sn  {calls:>5} model çağrısı"
+        )
@@ -0,0 +1,65 @@
+"""
+Token doğrulamanın istek başına maliyeti: DRF'nin TokenAuthentication'ı ile
+notes/authentication.py'deki önbellekli sınıf aynı uç noktalarda
+karşılaştırılır.
+"""
+import time
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from rest_framework.authentication import SessionAuthentication, TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.views import APIView
+
+from notes.authentication import CachedTokenAuthentication, forget_all_tokens
+from notes.models import Note
+
+from .tagging import QueryCounter
+
+help = "Token doğrulamanın önbellekli/önbelleksiz sorgu sayısı ve istek/sn değerlerini karşılaştırır."
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=1000)
+
+
+def throughput(client, method, url, requests, headers):
+    """
+    (istek başına sorgu, istek/sn) döner.
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        for _ in range(requests):
+            response = getattr(client, method)(url, **headers)
+            assert response.status_code == 200, response.content
+        elapsed = time.perf_counter() - start
+    return counter.count / requests, requests / elapsed
+
+
+def run(command, requests, **options):
+    owner = User.objects.create(username="benchmark")
+    token = Token.objects.create(user=owner)
+    note = Note.objects.create(owner=owner, title="not", content="<p>içerik</p>")
+    headers = {"HTTP_AUTHORIZATION": f"Token {token.key}"}
+    endpoints = (
+        ("POST toggle_pin", "post", f"/api/notes/{note.pk}/toggle_pin/"),
+        ("GET stats", "get", "/api/notes/stats/"),
+    )
+
+    rows = []
+    for name, authentication in (("TokenAuthentication", TokenAuthentication), ("önbellekli", CachedTokenAuthentication)):
+        forget_all_tokens()
+        # Hiçbir view authentication_classes tanımlamıyor; hepsi APIView'dan alır
+        with mock.patch.object(APIView, "authentication_classes", [authentication, SessionAuthentication]):
+            client = Client()
+            for label, method, url in endpoints:
+                # İlk istek önbelleği doldurur
+                getattr(client, method)(url, **headers)
+                rows.append((f"{label} ({name})", *throughput(client, method, url, requests, headers)))
+
+    command.stdout.write(f"{'uç nokta':<42} {'sorgu/istek':>12} {'istek/sn':>9}")
+    for name, queries, rate in rows:
+        command.stdout.write(f"{name:<42} {queries:>12.1f} {rate:>9.0f}")
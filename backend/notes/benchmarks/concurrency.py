@@ -0,0 +1,151 @@
+"""
+SQLite'ta eşzamanlı okuma/yazma kilit çekişmesi.
+
+Birden çok thread, her biri kendi bağlantısıyla, aynı veritabanı dosyası
+üzerinde gerçek kod yollarını çalıştırır: not listesi okuma, otomatik
+kayıt (note.save() ve sinyaller) ve sürükle-bırak sıralama
+(ordering.move_note, okuyup yazan bir transaction). Aynı iş yükü önce
+varsayılan bağlantı ayarlarıyla (rollback journal, DEFERRED
+transaction'lar), sonra SQLITE_OPTIMIZED_OPTIONS ile (WAL, IMMEDIATE,
+busy_timeout, synchronous=NORMAL, mmap) çalıştırılır; "database is
+locked" hataları, iş/sn ve gecikme yüzdelikleri karşılaştırılır.
+"""
+import random
+import statistics
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import OperationalError, connection, connections
+
+from notes.models import Note
+from notes.ordering import move_note
+
+from . import benchmark_database
+from .data import finalize, seed_notes
+
+help = "Eşzamanlı okuma/kayıt/sıralama iş yükünde SQLite kilit hatalarını varsayılan ve optimize ayarlarla karşılaştırır."
+
+uses_database = False
+
+OPERATIONS = ("read", "autosave", "reorder")
+
+
+def add_arguments(parser):
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--operations", type=int, default=150, help="Thread başına işlem sayısı.")
+    parser.add_argument("--users", type=int, default=4)
+    parser.add_argument("--notes-per-user", type=int, default=200)
+    parser.add_argument("--mix", default="read=60,autosave=30,reorder=10", help="İşlem ağırlıkları.")
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise CommandError(f"Bilinmeyen işlem: {name}")
+        weights[name.strip()] = int(weight)
+    return list(weights), list(weights.values())
+
+
+def read(rng, owner, note_ids):
+    notes = Note.objects.filter(owner=owner, is_deleted=False).prefetch_related("tags")
+    list(notes.order_by("-is_pinned", "order", "-updated_at")[:50])
+
+
+def autosave(rng, owner, note_ids):
+    note = Note.objects.get(pk=rng.choice(note_ids))
+    note.content += f" düzenleme{rng.randrange(1000)}"
+    note.save()
+
+
+def reorder(rng, owner, note_ids):
+    note_id, after_id, before_id = rng.sample(note_ids, 3)
+    move_note(owner, note_id, after_id=after_id, before_id=before_id)
+
+
+def worker(index, owners, note_ids, names, weights, operations, results, barrier):
+    rng = random.Random(index)
+    owner = owners[index % len(owners)]
+    actions = {"read": read, "autosave": autosave, "reorder": reorder}
+    try:
+        barrier.wait()
+        for name in rng.choices(names, weights, k=operations):
+            start = time.perf_counter()
+            try:
+                actions[name](rng, owner, note_ids[owner.pk])
+            except OperationalError as e:
+                results["errors"][(name, str(e))] += 1
+                continue
+            results["timings"][name].append((time.perf_counter() - start) * 1000)
+    finally:
+        connections.close_all()
+
+
+def run_workload(threads, operations, names, weights, owners, note_ids):
+    results = {"errors": Counter(), "timings": defaultdict(list)}
+    barrier = threading.Barrier(threads)
+    pool = [
+        threading.Thread(target=worker, args=(index, owners, note_ids, names, weights, operations, results, barrier))
+        for index in range(threads)
+    ]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return results, time.perf_counter() - start
+
+
+def percentile(timings, value):
+    if len(timings) < 2:
+        return timings[0] if timings else 0.0
+    return statistics.quantiles(timings, n=100, method="inclusive")[value - 1]
+
+
+def run(command, threads, operations, users, notes_per_user, mix, **options):
+    names, weights = parse_mix(mix)
+    modes = (
+        ("varsayılan", {}),
+        ("SQLITE_OPTIMIZED", settings.SQLITE_OPTIMIZED_OPTIONS),
+    )
+    rows = []
+    for label, mode_options in modes:
+        if connection.vendor != "sqlite":
+            raise CommandError("Bu ölçüm sadece SQLite içindir.")
+        old_options = connection.settings_dict.get("OPTIONS", {})
+        # Thread'lerin açacağı bağlantılar aynı ayar sözlüğünü kullanır
+        connection.settings_dict["OPTIONS"] = {**old_options, **mode_options}
+        try:
+            with benchmark_database(shared=True):
+                owners = User.objects.bulk_create([User(username=f"concurrency{index}") for index in range(users)])
+                for owner in owners:
+                    seed_notes(owner, notes_per_user, content_words=100, seed=owner.pk)
+                finalize(owners)
+                note_ids = {
+                    owner.pk: list(Note.objects.filter(owner=owner).values_list("pk", flat=True))
+                    for owner in owners
+                }
+                journal = connection.cursor().execute("PRAGMA journal_mode").fetchone()[0]
+                connection.close()
+                results, elapsed = run_workload(threads, operations, names, weights, owners, note_ids)
+        finally:
+            connection.settings_dict["OPTIONS"] = old_options
+        done = sum(len(timings) for timings in results["timings"].values())
+        rows.append((f"{label} ({journal})", done, results, elapsed))
+
+    command.stdout.write(f"{threads} thread x {operations} işlem, karışım: {mix}\n")
+    command.stdout.write(
+        f"{'ayar':<28} {'iş/sn':>7} {'kilit hatası':>13} " + " ".join(f"{name + ' p95':>13}" for name in names)
+    )
+    for label, done, results, elapsed in rows:
+        locked = sum(count for (_, message), count in results["errors"].items() if "locked" in message)
+        latencies = " ".join(f"{percentile(results['timings'][name], 95):>11.1f}ms" for name in names)
+        command.stdout.write(f"{label:<28} {done / elapsed:>7.0f} {locked:>13} {latencies}")
+    for label, _, results, _ in rows:
+        for (name, message), count in sorted(results["errors"].items()):
+            command.stdout.write(f"  {label} / {name}: {count} x {message}")
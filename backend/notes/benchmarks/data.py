@@ -0,0 +1,125 @@
+"""
+Ölçümler için deterministik sentetik veri üretimi.
+"""
+import random
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from taggit.models import Tag, TaggedItem
+
+from notes import stats
+from notes.content import render
+from notes.models import Category, Note
+from notes.search import get_search_backend
+from notes.versioning import bump_version
+
+WORDS = (
+    "django react not etiket kategori arama liste proje toplantı fikir görev "
+    "alışveriş kitap film müzik tarif spor seyahat okul iş kod veritabanı "
+    "performans indeks sorgu önbellek sunucu istemci tasarım rapor plan günlük"
+).split()
+
+# Gerçekçi seçicilik için nadir kelimeler içeren geniş bir kelime havuzu
+SYLLABLES = "ka le mi no ru sa te yo zi ba de fi gu ha ko lu me ne po ra si tu".split()
+
+
+def build_vocabulary(rng, size=5000):
+    return WORDS + [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(size)
+    ]
+
+
+def make_text(rng, vocabulary, words):
+    # Zipf benzeri dağılım: baştaki kelimeler sık, sondakiler nadir geçer
+    last = len(vocabulary) - 1
+    return " ".join(vocabulary[min(int(rng.paretovariate(1.0)) - 1, last)] for _ in range(words))
+
+
+def seed_notes(owner, count, tags_per_note=3, content_words=200, trashed_ratio=0.0,
+               tag_pool=50, seed=0, batch_size=1000, categories=(), shared_ratio=0.0):
+    """
+    `owner` için `count` adet not ve etiket bağlantısı oluşturur.
+    Sinyaller tetiklenmez; gerekiyorsa indeksler ayrıca yeniden kurulmalıdır
+    (bkz. `finalize`).
+    """
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(rng)
+    tags = [Tag.objects.get_or_create(name=f"etiket{i}")[0] for i in range(tag_pool)]
+    note_type = ContentType.objects.get_for_model(Note)
+
+    now = timezone.now()
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        notes = []
+        for i in range(size):
+            content = make_text(rng, vocabulary, content_words)
+            note = Note(
+                owner=owner,
+                title=make_text(rng, vocabulary, 4),
+                content=content,
+                **render(content),
+                is_pinned=rng.random() < 0.05,
+                is_deleted=rng.random() < trashed_ratio,
+                order=created + i,
+            )
+            if note.is_deleted:
+                # Son 60 gün içinde çöpe atılmış gibi
+                note.deleted_at = now - timedelta(days=rng.uniform(0, 60))
+            if categories:
+                note.category = rng.choice(categories)
+            if shared_ratio and rng.random() < shared_ratio:
+                note.is_shared = True
+                note.share_uuid = uuid.UUID(int=rng.getrandbits(128), version=4)
+            notes.append(note)
+        notes = Note.objects.bulk_create(notes)
+        TaggedItem.objects.bulk_create([
+            TaggedItem(tag=tag, content_type=note_type, object_id=note.pk)
+            for note in notes
+            for tag in rng.sample(tags, min(tags_per_note, len(tags)))
+        ])
+        created += size
+    return created
+
+
+def finalize(owners):
+    """
+    Sinyalsiz eklenen veriler için arama indeksini, istatistik sayaçlarını
+    ve koleksiyon sürümlerini günceller.
+    """
+    backend = get_search_backend()
+    backend.create_index()
+    backend.rebuild()
+    for owner in owners:
+        stats.rebuild(owner.pk)
+        bump_version(owner.pk)
+
+
+def seed_dataset(users=10, notes_per_user=1000, tags_per_note=3, tag_pool=50, categories=5,
+                 content_words=200, trashed_ratio=0.1, shared_ratio=0.02, seed=0, prefix="loadtest"):
+    """
+    Deterministik çok kullanıcılı veri seti: `{prefix}{i}` kullanıcıları
+    (parola: kullanıcı adı), her birine kategoriler, notlar ve API token'ı.
+    Aynı parametrelerle her çalıştırmada aynı içerik üretilir.
+    """
+    owners = []
+    for index in range(users):
+        username = f"{prefix}{index}"
+        owner = User.objects.create_user(username, f"{username}@example.com", username)
+        Token.objects.create(user=owner)
+        owner_categories = Category.objects.bulk_create([
+            Category(owner=owner, name=f"Kategori {i}") for i in range(categories)
+        ])
+        seed_notes(
+            owner, notes_per_user, tags_per_note=tags_per_note, content_words=content_words,
+            trashed_ratio=trashed_ratio, tag_pool=tag_pool, seed=seed * 100003 + index,
+            categories=owner_categories, shared_ratio=shared_ratio,
+        )
+        owners.append(owner)
+    finalize(owners)
+    return owners
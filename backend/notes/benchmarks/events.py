@@ -0,0 +1,167 @@
+"""
+Değişiklik bildirimleri: tek süreçte binlerce boştaki SSE bağlantısı.
+
+ASGI uygulaması (backend.asgi) soket açmadan, ASGI protokolüyle doğrudan
+tek bir event loop içinde çağrılır. Bağlantıların açılma süresi, bağlantı
+başına bellek, thread sayısı (boştaki bağlantılar thread tutmamalı), bir
+not kaydedildiğinde olayın o kullanıcının tüm bağlantılarına ulaşma süresi
+ve tüm kullanıcılara yayında dağıtım süresi ölçülür. Sonunda bağlantılar
+kapatılır ve broker'da abonelik kalmadığı doğrulanır.
+"""
+import asyncio
+import json
+import threading
+import time
+import tracemalloc
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from rest_framework.authtoken.models import Token
+
+from notes.events import get_broker
+from notes.models import Note
+
+from . import benchmark_database
+
+help = "Tek süreçte binlerce boştaki SSE bağlantısını tutar; bellek, thread ve olay dağıtım süresini ölçer."
+
+uses_database = False
+
+
+def add_arguments(parser):
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=100)
+
+
+class Connection:
+    """
+    ASGI sunucusunun tek bir HTTP bağlantısı için yaptığını taklit eder.
+    """
+    def __init__(self, application, token):
+        self.application = application
+        self.token = token
+        self.disconnected = asyncio.Event()
+        self.body_sent = False
+        self.status = None
+        self.events = []
+        self.received = asyncio.Event()
+        self.buffer = b""
+
+    def scope(self):
+        return {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "GET", "scheme": "http", "path": "/api/events/", "raw_path": b"/api/events/",
+            "query_string": b"", "root_path": "",
+            "headers": [
+                (b"host", b"testserver"), (b"accept", b"text/event-stream"),
+                (b"authorization", f"Token {self.token}".encode()),
+            ],
+            "client": ("127.0.0.1", 50000), "server": ("testserver", 80),
+        }
+
+    async def receive(self):
+        if not self.body_sent:
+            self.body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body":
+            self.buffer += message.get("body", b"")
+            while b"\n\n" in self.buffer:
+                frame, self.buffer = self.buffer.split(b"\n\n", 1)
+                for line in frame.split(b"\n"):
+                    if line.startswith(b"data: "):
+                        self.events.append(json.loads(line[6:]))
+                        self.received.set()
+
+    async def wait_for(self, predicate, timeout=30):
+        deadline = time.perf_counter() + timeout
+        while not any(predicate(event) for event in self.events):
+            self.received.clear()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise CommandError(f"Olay gelmedi (HTTP {self.status}, {len(self.events)} olay).")
+            try:
+                await asyncio.wait_for(self.received.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        return asyncio.ensure_future(self.application(self.scope(), self.receive, self.send))
+
+
+async def hold(command, connections, tokens, notes):
+    from backend.asgi import application
+
+    broker = get_broker()
+    threads_before = threading.active_count()
+
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    clients = [Connection(application, tokens[index % len(tokens)]) for index in range(connections)]
+    tasks = [client.start() for client in clients]
+    await asyncio.gather(*(client.wait_for(lambda event: event["type"] == "ready") for client in clients))
+    opened = time.perf_counter() - start
+    memory = (tracemalloc.get_traced_memory()[0] - memory_before) / connections / 1024
+    tracemalloc.stop()
+
+    # Boştayken: olay yok, sadece bağlantılar açık
+    await asyncio.sleep(1)
+    rows = [
+        ("açık bağlantı", f"{broker.connection_count()}"),
+        ("açılma süresi", f"{opened:.2f} sn ({connections / opened:.0f} bağlantı/sn)"),
+        ("bağlantı başına bellek", f"{memory:.1f} KB"),
+        ("thread (önce / sonra)", f"{threads_before} / {threading.active_count()}"),
+    ]
+
+    # Gerçek yazma yolu: not kaydı -> sinyal -> commit -> broker -> SSE
+    owner_token, note_id = notes[0]
+    targets = [client for client in clients if client.token == owner_token]
+
+    def toggle_pin():
+        note = Note.objects.get(pk=note_id)
+        note.is_pinned = not note.is_pinned
+        note.save()
+
+    start = time.perf_counter()
+    await sync_to_async(toggle_pin)()
+    await asyncio.gather(*(
+        client.wait_for(lambda event: event["type"] == "note.updated" and event["id"] == note_id)
+        for client in targets
+    ))
+    rows.append((f"not kaydı -> {len(targets)} bağlantı", f"{(time.perf_counter() - start) * 1000:.1f} ms"))
+
+    # Yayın: her kullanıcıya bir olay, başka bir thread'den
+    user_ids = await sync_to_async(lambda: dict(Token.objects.values_list("key", "user_id")))()
+    start = time.perf_counter()
+    await asyncio.to_thread(lambda: [
+        broker.publish(user_id, {"type": "notes.changed", "count": 0, "version": -1})
+        for user_id in set(user_ids.values())
+    ])
+    await asyncio.gather(*(client.wait_for(lambda event: event.get("version") == -1) for client in clients))
+    rows.append((f"yayın -> {connections} bağlantı", f"{(time.perf_counter() - start) * 1000:.1f} ms"))
+
+    for client in clients:
+        client.disconnected.set()
+    await asyncio.wait_for(asyncio.gather(*tasks), 30)
+    rows.append(("kapatma sonrası abonelik", f"{broker.connection_count()}"))
+
+    command.stdout.write(f"{'ölçüm':<28} değer")
+    for name, value in rows:
+        command.stdout.write(f"{name:<28} {value}")
+    if broker.connection_count():
+        raise CommandError("Kapanan bağlantıların aboneliği kalmış.")
+
+
+def run(command, connections, users, **options):
+    with benchmark_database(shared=True):
+        owners = User.objects.bulk_create([User(username=f"events{index}") for index in range(users)])
+        tokens = [Token.objects.create(user=owner).key for owner in owners]
+        note = Note.objects.create(owner=owners[0], title="not", content="<p>içerik</p>")
+        asyncio.run(hold(command, connections, tokens, [(tokens[0], note.pk)]))
@@ -0,0 +1,81 @@
+"""
+Sıcak sorguların indeks kullandığını EXPLAIN çıktısıyla doğrular.
+
+Liste, kategori filtresi, çöp kutusu, saklama süresi ve paylaşım sorguları tablo taraması yerine
+notes.models.Note.Meta içindeki indeksleri kullanmalıdır. Beklenen indeks
+planda yoksa komut hata koduyla biter. Aynı denetim (tam tarama kontrolüyle
+birlikte) notes/tests/test_explain.py ile `manage.py test` içinde de çalışır.
+"""
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+
+from notes.models import Category, Note
+from notes.public import public_queryset
+from notes.purge import exclude_pending
+
+from .data import seed_notes
+
+help = "Liste, çöp kutusu, saklama süresi ve paylaşım sorgularının indeks kullandığını doğrular."
+
+
+def add_arguments(parser):
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=5)
+
+
+def hot_queries(owner):
+    """
+    (ad, sorgu seti, beklenen indeks) üçlüleri; sorgular view'lardakiyle aynıdır.
+    """
+    return [
+        (
+            "not listesi",
+            Note.objects.filter(owner=owner, is_deleted=False).order_by("-is_pinned", "order", "-updated_at"),
+            "note_active_owner_idx",
+        ),
+        (
+            "kategori filtresi",
+            Note.objects.filter(owner=owner, is_deleted=False, category=owner.categories.first())
+            .order_by("-is_pinned", "order", "-updated_at"),
+            "note_active_category_idx",
+        ),
+        (
+            "çöp kutusu",
+            exclude_pending(Note.objects.filter(owner=owner, is_deleted=True)).order_by("-updated_at"),
+            "note_trash_owner_idx",
+        ),
+        (
+            "saklama süresi dolan notlar",
+            Note.objects.filter(is_deleted=True, deleted_at__lt=timezone.now() - timedelta(days=30)),
+            "note_trash_deleted_at_idx",
+        ),
+        (
+            "paylaşılan not",
+            public_queryset().filter(share_uuid="1b4e28ba-2fa1-11d2-883f-0016d3cca427"),
+            "note_share_uuid_unique",
+        ),
+    ]
+
+
+def run(command, notes, users, **options):
+    owners = [User.objects.create(username=f"benchmark{i}") for i in range(users)]
+    for index, owner in enumerate(owners):
+        categories = [Category.objects.create(owner=owner, name=f"kategori{i}") for i in range(5)]
+        seed_notes(owner, notes // users, trashed_ratio=0.2, content_words=20, seed=index, categories=categories)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+    failures = []
+    for name, queryset, index in hot_queries(owners[0]):
+        plan = queryset.explain()
+        command.stdout.write(f"{name}:\n{plan}\n")
+        if index not in plan:
+            failures.append(f"{name} ({index})")
+
+    if failures:
+        raise CommandError("İndeks kullanılmayan sorgular: " + ", ".join(failures))
+    command.stdout.write(command.style.SUCCESS("Tüm sıcak sorgular indeks kullanıyor."))
@@ -0,0 +1,272 @@
+"""
+Not API'si için eşzamanlı yük testi.
+
+Varsayılan olarak geçici bir veritabanına deterministik veri seti
+(`data.seed_dataset`) yüklenir ve gerçek URLconf yerel bir HTTP sunucusu
+(Django'nun LiveServerThread'i) üzerinden eşzamanlı istemcilerle çağrılır.
+`--url` verilirse ayrı çalışan bir sunucu (gunicorn/uvicorn) ölçülür; bu
+durumda veri seti o sunucunun veritabanına `manage.py seed_notes` ile
+yüklenmiş olmalı ve komut aynı DATABASE_URL ile çalıştırılmalıdır.
+
+Her uç nokta için p50/p95/p99 gecikme, istek/sn, hata sayısı ve (yerel
+modda) sorgu sayısı raporlanır. `--output` sonuçları JSON olarak yazar,
+`--baseline` önceki bir JSON ile karşılaştırır ve tolerans aşılırsa
+hata koduyla biter.
+"""
+import json
+import logging
+import random
+import re
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import django
+import requests
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import Client
+from django.test.testcases import LiveServerThread
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from notes.models import Note
+
+from . import benchmark_database
+from .data import WORDS, seed_dataset
+
+help = "Not API'sini eşzamanlı istemcilerle yük altında ölçer (p50/p95/p99, istek/sn, sorgu sayısı)."
+
+uses_database = False
+
+ENDPOINTS = ("list", "summary", "search", "reorder", "public", "stats", "tags", "trash")
+
+
+def add_arguments(parser):
+    parser.add_argument("--url", help="Ölçülecek çalışan sunucu (ör. http://127.0.0.1:8000). Verilmezse yerel sunucu başlatılır.")
+    parser.add_argument("--prefix", default="loadtest", help="Veri setindeki kullanıcı adı öneki.")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help=f"Virgülle ayrılmış: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--requests", type=int, default=500, help="Uç nokta başına istek sayısı.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    # Yerel modda üretilen veri seti
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--notes-per-user", type=int, default=500)
+    parser.add_argument("--content-words", type=int, default=200)
+    parser.add_argument("--trashed-ratio", type=float, default=0.1)
+    # Sonuçlar
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası.")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç JSON dosyası.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2,
+        help="İzin verilen gerileme oranı (p95 artışı / istek/sn düşüşü). Varsayılan: 0.2",
+    )
+
+
+class Workload:
+    """
+    Kullanıcıların token'ları ve not id'leri; her uç nokta için
+    (metot, yol, gövde, token) üreten fonksiyonlar.
+    """
+    def __init__(self, prefix, seed):
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        owners = list(User.objects.filter(username__regex=rf"^{re.escape(prefix)}[0-9]+$").order_by("pk"))
+        if not owners:
+            raise CommandError(f"'{prefix}' önekli kullanıcı yok; önce `manage.py seed_notes` çalıştırın.")
+        self.users = []
+        for owner in owners:
+            token, _ = Token.objects.get_or_create(user=owner)
+            note_ids = list(Note.objects.filter(owner=owner, is_deleted=False).values_list("pk", flat=True))
+            self.users.append((owner, token.key, note_ids))
+        self.share_uuids = [
+            str(share_uuid) for share_uuid in Note.objects.filter(
+                owner__in=owners, is_shared=True, is_deleted=False
+            ).values_list("share_uuid", flat=True)
+        ]
+
+    def pick(self, items):
+        with self.lock:
+            return self.rng.choice(items)
+
+    def request(self, endpoint):
+        owner, token, note_ids = self.pick(self.users)
+        if endpoint == "list":
+            return "GET", "/api/notes/", None, token
+        if endpoint == "summary":
+            return "GET", "/api/notes/?summary=1&page_size=50", None, token
+        if endpoint == "search":
+            return "GET", f"/api/notes/?search={self.pick(WORDS)}", None, token
+        if endpoint == "reorder":
+            note_id, after_id = self.pick(note_ids), self.pick(note_ids)
+            body = {"note_id": note_id, "after_id": after_id if after_id != note_id else None}
+            return "POST", "/api/notes/update-order/", body, token
+        if endpoint == "public":
+            if not self.share_uuids:
+                raise CommandError("Veri setinde paylaşılan not yok (--shared-ratio).")
+            return "GET", f"/api/public-notes/{self.pick(self.share_uuids)}/", None, None
+        if endpoint == "stats":
+            return "GET", "/api/notes/stats/", None, token
+        if endpoint == "tags":
+            return "GET", "/api/tags/", None, token
+        if endpoint == "trash":
+            return "GET", "/api/trashed-notes/?page_size=50", None, token
+        raise CommandError(f"Bilinmeyen uç nokta: {endpoint}")
+
+
+def count_queries(workload, endpoint):
+    """
+    Uç noktayı süreç içinde bir kez çağırıp sorgu sayısını döner.
+    """
+    method, path, body, token = workload.request(endpoint)
+    client = Client()
+    headers = {"HTTP_AUTHORIZATION": f"Token {token}"} if token else {}
+    with CaptureQueriesContext(connection) as context:
+        client.generic(method, path, json.dumps(body) if body else "", content_type="application/json", **headers)
+    return len(context.captured_queries)
+
+
+def send(session, base_url, workload, endpoint):
+    method, path, body, token = workload.request(endpoint)
+    headers = {"Authorization": f"Token {token}"} if token else {}
+    start = time.perf_counter()
+    response = session.request(method, base_url + path, json=body, headers=headers)
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, response.status_code < 400
+
+
+def load(base_url, workload, endpoint, requests_count, concurrency, warmup):
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return send(local.session, base_url, workload, endpoint)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(warmup)))
+        start = time.perf_counter()
+        results = list(pool.map(one, range(requests_count)))
+        elapsed = time.perf_counter() - start
+
+    timings = sorted(duration for duration, _ in results)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "p50_ms": round(percentiles[49], 2),
+        "p95_ms": round(percentiles[94], 2),
+        "p99_ms": round(percentiles[98], 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "rps": round(requests_count / elapsed, 1),
+        "errors": sum(1 for _, ok in results if not ok),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(command, results, baseline, tolerance):
+    """
+    Gerilemeleri listeler: p95 veya istek/sn toleransı aşan ya da hata veya
+    sorgu sayısı artan uç noktalar.
+    """
+    regressions = []
+    command.stdout.write(f"\nKarşılaştırma ({baseline['meta'].get('revision') or 'baseline'}):")
+    for endpoint, current in results["endpoints"].items():
+        previous = baseline["endpoints"].get(endpoint)
+        if not previous:
+            continue
+        p95 = current["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0
+        rps = current["rps"] / previous["rps"] - 1 if previous["rps"] else 0
+        command.stdout.write(f"{endpoint:<10} p95 {p95:+7.1%}   istek/sn {rps:+7.1%}")
+        if p95 > tolerance or rps < -tolerance:
+            regressions.append(endpoint)
+        elif current["errors"] > previous["errors"]:
+            regressions.append(f"{endpoint} (hata {previous['errors']} -> {current['errors']})")
+        elif None not in (current.get("queries"), previous.get("queries")) and current["queries"] > previous["queries"]:
+            regressions.append(f"{endpoint} (sorgu {previous['queries']} -> {current['queries']})")
+    return regressions
+
+
+def run(command, url, prefix, endpoints, requests, concurrency, warmup, seed, users, notes_per_user,
+        content_words, trashed_ratio, output, baseline, tolerance, **options):
+    endpoints = [name.strip() for name in endpoints.split(",") if name.strip()]
+    dataset = None
+    with benchmark_database(shared=True) if not url else nullcontext():
+        if not url:
+            dataset = {
+                "users": users, "notes_per_user": notes_per_user,
+                "content_words": content_words, "trashed_ratio": trashed_ratio, "seed": seed,
+            }
+            command.stdout.write("Veri seti oluşturuluyor...")
+            seed_dataset(
+                users=users, notes_per_user=notes_per_user, content_words=content_words,
+                trashed_ratio=trashed_ratio, seed=seed, prefix=prefix,
+            )
+            # Sunucu thread'leri kendi bağlantılarını açar
+            connection.close()
+
+        workload = Workload(prefix, seed)
+        server = None
+        if not url:
+            server = LiveServerThread("127.0.0.1", static_handler=lambda handler: handler)
+            server.daemon = True
+            server.start()
+            server.is_ready.wait()
+            if server.error:
+                raise server.error
+            url = f"http://127.0.0.1:{server.port}"
+
+        results = {"endpoints": {}}
+        # Hatalı yanıtlar "hata" sütununda sayılır; her biri için traceback basılmasın
+        request_logger = logging.getLogger("django.request")
+        log_level = request_logger.level
+        request_logger.setLevel(logging.CRITICAL)
+        try:
+            command.stdout.write(f"{'uç nokta':<10} {'p50':>8} {'p95':>8} {'p99':>8} {'istek/sn':>9} {'hata':>5} {'sorgu':>6}")
+            for endpoint in endpoints:
+                row = load(url, workload, endpoint, requests, concurrency, warmup)
+                row["queries"] = count_queries(workload, endpoint) if server else None
+                results["endpoints"][endpoint] = row
+                command.stdout.write(
+                    f"{endpoint:<10} {row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+                    f"{row['rps']:>9.1f} {row['errors']:>5} {row['queries'] if row['queries'] is not None else '-':>6}"
+                )
+        finally:
+            request_logger.setLevel(log_level)
+            if server:
+                server.terminate()
+                server.join()
+
+    results["meta"] = {
+        "created_at": timezone.now().isoformat(),
+        "revision": git_revision(),
+        "django": django.get_version(),
+        "database": connection.vendor,
+        "server": "local" if server else url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "dataset": dataset,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        command.stdout.write(f"Sonuçlar yazıldı: {output}")
+
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            regressions = compare(command, results, json.load(f), tolerance)
+        if regressions:
+            raise CommandError("Gerileme: " + ", ".join(regressions))
+        command.stdout.write(command.style.SUCCESS("Baseline'a göre gerileme yok."))
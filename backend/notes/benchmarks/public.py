@@ -0,0 +1,51 @@
+"""
+Paylaşılan not uç noktasının önbellekli ve önbelleksiz istek/sn değerleri.
+"""
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client
+
+from notes.models import Note
+from notes.public import invalidate_public_note
+
+help = "Paylaşılan not uç noktasını önbellekli/önbelleksiz karşılaştırır."
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--content-words", type=int, default=500)
+
+
+def throughput(client, url, requests, before=None, **headers):
+    start = time.perf_counter()
+    for _ in range(requests):
+        if before:
+            before()
+        response = client.get(url, **headers)
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, response.status_code
+
+
+def run(command, requests, content_words, **options):
+    owner = User.objects.create(username="benchmark")
+    share_uuid = uuid.uuid4()
+    note = Note.objects.create(
+        owner=owner, title="Paylaşılan not", content="kelime " * content_words,
+        is_shared=True, share_uuid=share_uuid,
+    )
+    note.tags.add("a", "b", "c")
+    url = f"/api/public-notes/{share_uuid}/"
+    client = Client()
+    cache.clear()
+
+    cold, _ = throughput(client, url, requests, before=lambda: invalidate_public_note(share_uuid))
+    warm, _ = throughput(client, url, requests)
+    etag = client.get(url)["ETag"]
+    revalidated, status = throughput(client, url, requests, HTTP_IF_NONE_MATCH=etag)
+
+    command.stdout.write(f"{'önbelleksiz (eski yol)':<26} {cold:>9.0f} istek/sn")
+    command.stdout.write(f"{'önbellekli':<26} {warm:>9.0f} istek/sn")
+    command.stdout.write(f"{'If-None-Match (304)':<26} {revalidated:>9.0f} istek/sn  HTTP {status}")
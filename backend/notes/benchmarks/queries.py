@@ -0,0 +1,82 @@
+"""
+Not uç noktalarının sorgu sayısı bütçelerini denetler.
+
+Her uç nokta az ve çok notlu iki veri setiyle çağrılır; sorgu sayısı not
+sayısından bağımsız olmalı ve bütçeyi aşmamalıdır. Aşım olursa komut
+hata koduyla biter. Aynı denetim notes/tests/test_queries.py ile
+`manage.py test` içinde de çalışır.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from notes.models import Note
+from notes.search import get_search_backend
+
+from .data import seed_notes
+
+help = "Not uç noktalarının sorgu sayısını bütçelere göre denetler."
+
+# Uç nokta -> izin verilen en fazla sorgu sayısı.
+# Liste uç noktaları ETag için koleksiyon sürümünü de okur (+1).
+BUDGETS = {
+    "/api/notes/": 3,
+    "/api/notes/?summary=1": 3,
+    "/api/notes/?search=kitap": 3,
+    "/api/notes/?page_size=20": 3,
+    "/api/notes/?category=none": 3,
+    "/api/notes/?since=0": 4,
+    "/api/notes/stats/": 3,
+    "/api/notes/{note_id}/": 2,
+    "/api/trashed-notes/": 3,
+    "/api/public-notes/{share_uuid}/": 2,
+    "/api/tags/": 2,
+    "/api/categories/": 2,
+}
+
+
+def add_arguments(parser):
+    parser.add_argument("--small", type=int, default=5)
+    parser.add_argument("--large", type=int, default=50)
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    if response.status_code != 200:
+        raise CommandError(f"{url} -> HTTP {response.status_code}")
+    return len(context.captured_queries)
+
+
+def measure_all(size):
+    Note.objects.all().delete()
+    owner, _ = User.objects.get_or_create(username="benchmark")
+    seed_notes(owner, size, trashed_ratio=0.2, content_words=50)
+    get_search_backend().rebuild()
+
+    shared = Note.objects.filter(owner=owner, is_deleted=False).first()
+    Note.objects.filter(pk=shared.pk).update(is_shared=True, share_uuid="1b4e28ba-2fa1-11d2-883f-0016d3cca427")
+    client = APIClient()
+    client.force_authenticate(owner)
+
+    params = {"note_id": shared.pk, "share_uuid": "1b4e28ba-2fa1-11d2-883f-0016d3cca427"}
+    return {url: count_queries(client, url.format(**params)) for url in BUDGETS}
+
+
+def run(command, small, large, **options):
+    small_counts = measure_all(small)
+    large_counts = measure_all(large)
+
+    failures = []
+    command.stdout.write(f"{'uç nokta':<36} {small:>6} {large:>6} {'bütçe':>6}")
+    for url, budget in BUDGETS.items():
+        few, many = small_counts[url], large_counts[url]
+        command.stdout.write(f"{url:<36} {few:>6} {many:>6} {budget:>6}")
+        if max(few, many) > budget:
+            failures.append(url)
+
+    if failures:
+        raise CommandError("Sorgu bütçesi aşıldı: " + ", ".join(failures))
+    command.stdout.write(command.style.SUCCESS("Tüm uç noktalar bütçe içinde."))
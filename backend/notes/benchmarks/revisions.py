@@ -0,0 +1,173 @@
+"""
+Revizyon geçmişi: binlerce kez düzenlenen notlarda depolama büyümesi,
+kayıt maliyeti ve revizyon kurma süresi.
+
+Notlar gerçek yazma yolundan (note.save() ve sinyaller) küçük
+düzenlemelerle (kelime ekleme, değiştirme, silme, paragraf ekleme)
+güncellenir. Saklanan bayt her revizyonda tam içerik saklamaya göre,
+kayıt süresi revizyon sinyali kapalıyken yapılan kayda göre verilir.
+Ardından revizyonlar geçmişe yayılır, seyreltilir ve ölçümler tekrarlanır;
+her tutulan revizyonun içeriği seyreltme öncesiyle karşılaştırılır.
+"""
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db.models import Sum
+from django.db.models.functions import Length
+from django.db.models.signals import post_save
+from django.test import override_settings
+from django.utils import timezone
+
+from notes.models import Note, NoteRevision
+from notes.revisions import compact_note, reconstruct
+from notes.signals import note_revision_saved
+
+from .data import build_vocabulary, make_text
+
+help = "Sık düzenlenen notlarda revizyon depolama büyümesini, kayıt ve kurma sürelerini ölçer."
+
+
+def add_arguments(parser):
+    parser.add_argument("--notes", type=int, default=3)
+    parser.add_argument("--edits", type=int, default=2000, help="Not başına düzenleme sayısı.")
+    parser.add_argument("--content-words", type=int, default=500)
+    parser.add_argument("--days", type=int, default=120, help="Seyreltme öncesi revizyonların yayılacağı gün sayısı.")
+    parser.add_argument("--samples", type=int, default=200, help="Kurma süresi için not başına örnek revizyon.")
+
+
+def edit(rng, vocabulary, paragraphs):
+    """
+    Paragraf listesinde tek bir küçük düzenleme yapar.
+    """
+    index = rng.randrange(len(paragraphs))
+    words = paragraphs[index].split(" ")
+    kind = rng.random()
+    position = rng.randrange(len(words))
+    if kind < 0.4:
+        words.insert(position, rng.choice(vocabulary))
+    elif kind < 0.8:
+        words[position] = rng.choice(vocabulary)
+    elif kind < 0.97 and len(words) > 1:
+        del words[position]
+    else:
+        paragraphs.append(make_text(rng, vocabulary, 40))
+        return
+    paragraphs[index] = " ".join(words)
+
+
+def html(paragraphs):
+    return "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+
+
+def storage(note_ids):
+    """
+    (revizyon sayısı, saklanan bayt, tam içerik saklansaydı bayt)
+    """
+    revisions = NoteRevision.objects.filter(note_id__in=note_ids)
+    stored = revisions.aggregate(size=Sum(Length("data")))["size"] or 0
+    # length karakter sayısıdır; içerik ASCII'ye yakın olduğu için bayta yakındır
+    naive = revisions.aggregate(size=Sum("length"))["size"] or 0
+    return revisions.count(), stored, naive
+
+
+def reconstruction(rng, note_ids, samples):
+    """
+    Rastgele revizyonların kurulma süreleri (ms): (p50, p95, en yüksek).
+    """
+    timings = []
+    for note_id in note_ids:
+        numbers = list(NoteRevision.objects.filter(note_id=note_id).values_list("number", flat=True))
+        for number in rng.sample(numbers, min(samples, len(numbers))):
+            start = time.perf_counter()
+            reconstruct(note_id, number)
+            timings.append((time.perf_counter() - start) * 1000)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return percentiles[49], percentiles[94], max(timings)
+
+
+def save_all(rng, vocabulary, notes, documents, edits):
+    """
+    Her nota `edits` düzenleme uygular; kayıt başına ortalama ms döner.
+    """
+    elapsed = 0.0
+    for _ in range(edits):
+        for note, paragraphs in zip(notes, documents):
+            edit(rng, vocabulary, paragraphs)
+            note.content = html(paragraphs)
+            start = time.perf_counter()
+            note.save()
+            elapsed += time.perf_counter() - start
+    return elapsed * 1000 / (edits * len(notes))
+
+
+@override_settings(REVISION_COMPACT_WORKER=False)
+def run(command, notes, edits, content_words, days, samples, **options):
+    rng = random.Random(0)
+    vocabulary = build_vocabulary(rng)
+    owner = User.objects.create(username="benchmark-revisions")
+
+    def create():
+        documents = [[make_text(rng, vocabulary, 50) for _ in range(max(1, content_words // 50))] for _ in range(notes)]
+        created = [Note.objects.create(owner=owner, title=f"not {index}", content=html(paragraphs))
+                   for index, paragraphs in enumerate(documents)]
+        return created, documents
+
+    # Karşılaştırma: revizyon sinyali kapalıyken kayıt süresi
+    baseline_edits = min(edits, 200)
+    post_save.disconnect(note_revision_saved, sender=Note)
+    try:
+        baseline = save_all(rng, vocabulary, *create(), baseline_edits)
+    finally:
+        post_save.connect(note_revision_saved, sender=Note)
+
+    tracked, documents = create()
+    note_ids = [note.pk for note in tracked]
+    saving = save_all(rng, vocabulary, tracked, documents, edits)
+
+    rows = []
+
+    def measure(label):
+        count, stored, naive = storage(note_ids)
+        p50, p95, slowest = reconstruction(rng, note_ids, samples)
+        rows.append((label, count, stored / 1024, naive / 1024, naive / stored, p50, p95, slowest))
+
+    measure("düzenlemelerden sonra")
+
+    # Revizyonları son `days` güne eşit aralıklarla yay, sonra seyrelt
+    now = timezone.now()
+    contents = {}
+    for note_id in note_ids:
+        revisions = list(NoteRevision.objects.filter(note_id=note_id).order_by("number").defer("data"))
+        step = timedelta(days=days) / len(revisions)
+        for index, revision in enumerate(revisions):
+            revision.created_at = now - step * (len(revisions) - index)
+        NoteRevision.objects.bulk_update(revisions, ["created_at"], batch_size=500)
+        contents[note_id] = {revision.number: reconstruct(note_id, revision.number).content for revision in revisions}
+
+    start = time.perf_counter()
+    removed = sum(compact_note(note_id, now) for note_id in note_ids)
+    compaction = (time.perf_counter() - start) * 1000 / len(note_ids)
+    for note_id in note_ids:
+        for number in NoteRevision.objects.filter(note_id=note_id).values_list("number", flat=True):
+            if reconstruct(note_id, number).content != contents[note_id][number]:
+                raise CommandError(f"Seyreltme sonrası revizyon {note_id}/{number} farklı kuruldu.")
+    measure(f"seyreltmeden sonra ({days} gün)")
+
+    command.stdout.write(
+        f"{notes} not x {edits} düzenleme, ~{content_words} kelime; "
+        f"kayıt {saving:.2f} ms (revizyonsuz {baseline:.2f} ms)"
+    )
+    command.stdout.write(
+        f"\n{'durum':<28} {'revizyon':>9} {'saklanan KB':>12} {'tam kopya KB':>13} {'oran':>6} "
+        f"{'kurma p50':>10} {'p95':>6} {'en yüksek':>10}"
+    )
+    for label, count, stored, naive, ratio, p50, p95, slowest in rows:
+        command.stdout.write(
+            f"{label:<28} {count:>9} {stored:>12.0f} {naive:>13.0f} {ratio:>5.0f}x "
+            f"{p50:>8.2f}ms {p95:>6.2f} {slowest:>8.2f}ms"
+        )
+    command.stdout.write(f"\nseyreltme: {removed} revizyon silindi, not başına {compaction:.0f} ms")
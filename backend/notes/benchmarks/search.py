@@ -0,0 +1,41 @@
+"""
+FTS indeksli arama ile eski icontains taramasını karşılaştırır.
+"""
+from django.contrib.auth.models import User
+
+from notes.models import Note
+from notes.search import IcontainsSearchBackend, get_search_backend
+
+from . import measure
+from .data import seed_notes
+
+help = "Tam metin arama indeksi ile icontains aramasını karşılaştırır."
+
+
+def add_arguments(parser):
+    parser.add_argument("--notes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--terms", nargs="+", default=["performans", "kitap film", "veri"])
+    parser.add_argument("--repeat", type=int, default=5)
+
+
+def run(command, notes, terms, repeat, **options):
+    backend = get_search_backend()
+    fallback = IcontainsSearchBackend(backend.connection)
+    command.stdout.write(f"Arama motoru: {type(backend).__name__}")
+    command.stdout.write(f"{'notlar':>8} {'terim':<14} {'icontains ms':>13} {'indeks ms':>10} {'sonuç':>7}")
+
+    for count in notes:
+        Note.objects.all().delete()
+        owner, _ = User.objects.get_or_create(username="benchmark")
+        seed_notes(owner, count)
+        backend.rebuild()
+        queryset = Note.objects.filter(owner=owner, is_deleted=False)
+
+        for term in terms:
+            indexed = backend.filter_queryset(queryset, term).order_by("search_rank")
+            scanned = fallback.filter_queryset(queryset, term)
+            scan_ms = measure(lambda: list(scanned.values_list("id", flat=True)), repeat)
+            index_ms = measure(lambda: list(indexed.values_list("id", flat=True)), repeat)
+            command.stdout.write(
+                f"{count:>8} {term:<14} {scan_ms:>13.1f} {index_ms:>10.1f} {indexed.count():>7}"
+            )
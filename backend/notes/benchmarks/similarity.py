@@ -0,0 +1,145 @@
+"""
+Benzerlik indeksi: tek kullanıcının çok sayıda notunda indeks kurma süresi,
+bellek ve related/duplicates sorgu gecikmesi.
+
+Notların bir kısmının küçük düzenlemelerle kopyaları eklenir;
+duplicates bu çiftlerin ne kadarını aynı grupta bulduğunu da raporlar.
+İmzasız notlarla ilk isteğin süresi (istek başına sınırlı hesaplama),
+toplu imza hesaplama (`compute_note_signatures`) ve NoteSignature
+tablosundan yükleme (yeni süreç) ayrı ölçülür; ardından birkaç not gerçek kayıt
+yolundan düzenlenip çöpe atılarak artımlı güncelleme ölçülür.
+"""
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import TaggedItem
+
+from notes.content import render
+from notes.models import Note
+from notes.similarity import backfill_signatures, forget_indexes, get_index, related_notes
+from notes.versioning import bump_version
+
+from .data import build_vocabulary, seed_notes
+
+help = "Benzerlik indeksinin kurma süresini, belleğini ve related/duplicates gecikmesini ölçer."
+
+
+def add_arguments(parser):
+    parser.add_argument("--notes", type=int, default=100000)
+    parser.add_argument("--content-words", type=int, default=60)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.002, help="Kopyası eklenecek not oranı.")
+    parser.add_argument("--queries", type=int, default=200, help="related için örnek not sayısı.")
+    parser.add_argument("--edits", type=int, default=20, help="Artımlı güncellemede düzenlenen not sayısı.")
+
+
+def plant_duplicates(rng, owner, count):
+    """
+    Rastgele notların bir kelimesi değişmiş ve sonuna bir kelime eklenmiş
+    kopyalarını oluşturur (seed_notes metinleri ~15 farklı kelime içerdiğinden
+    bu bile Jaccard benzerliğini ~0.85'e düşürür);
+    [(asıl id, kopya id), ...] döner.
+    """
+    vocabulary = build_vocabulary(rng)
+    note_ids = list(Note.objects.filter(owner=owner).values_list("pk", flat=True))
+    originals = Note.objects.filter(pk__in=rng.sample(note_ids, count)).prefetch_related("tags")
+    pairs, copies, tags = [], [], []
+    for note in originals:
+        words = note.content.split(" ")
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        words.append(rng.choice(vocabulary))
+        content = " ".join(words)
+        copies.append(Note(owner=owner, title=note.title, content=content, **render(content), order=len(note_ids)))
+        tags.append(list(note.tags.all()))
+        pairs.append(note.pk)
+    copies = Note.objects.bulk_create(copies)
+    note_type = ContentType.objects.get_for_model(Note)
+    TaggedItem.objects.bulk_create([
+        TaggedItem(tag=tag, content_type=note_type, object_id=copy.pk)
+        for copy, note_tags in zip(copies, tags)
+        for tag in note_tags
+    ])
+    return list(zip(pairs, [copy.pk for copy in copies]))
+
+
+def timed(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def timed_load(user_id):
+    forget_indexes()
+    return timed(lambda: get_index(user_id))
+
+
+def percentiles(timings):
+    values = statistics.quantiles(timings, n=100, method="inclusive")
+    return values[49], values[94]
+
+
+def run(command, notes, content_words, duplicate_ratio, queries, edits, **options):
+    rng = random.Random(0)
+    owner = User.objects.create(username="benchmark-similarity")
+    seed_notes(owner, notes, content_words=content_words, seed=0)
+    pairs = plant_duplicates(rng, owner, max(1, int(notes * duplicate_ratio)))
+    bump_version(owner.pk)
+
+    # --- Kurulum ---
+    index, first, first_peak = timed_load(owner.pk)
+    first_pending = len(index.pending)
+    _, build, build_peak = timed(backfill_signatures)
+    index, load, load_peak = timed_load(owner.pk)
+
+    # --- Sorgular ---
+    related = []
+    for note_id in rng.sample(list(index.ids), min(queries, len(index.ids))):
+        start = time.perf_counter()
+        related_notes(owner.pk, int(note_id), 10)
+        related.append((time.perf_counter() - start) * 1000)
+
+    # Sonuç indeks değişene kadar önbellekte; ölçüm hesaplamanın kendisi
+    duplicate_timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        groups = index.find_duplicates(0.8)
+        duplicate_timings.append((time.perf_counter() - start) * 1000)
+    cluster = {note_id: number for number, (note_ids, _) in enumerate(groups) for note_id in note_ids}
+    found = sum(1 for original, copy in pairs if original in cluster and cluster.get(copy) == cluster[original])
+
+    # --- Artımlı güncelleme: gerçek kayıt yolu (sinyaller sürümü artırır) ---
+    vocabulary = build_vocabulary(rng)
+    edited = Note.objects.filter(pk__in=[int(note_id) for note_id in rng.sample(list(index.ids), edits * 2)])
+    for number, note in enumerate(edited):
+        if number % 2:
+            note.is_deleted = True
+        else:
+            note.content += " " + " ".join(rng.choice(vocabulary) for _ in range(20))
+        note.save()
+    start = time.perf_counter()
+    index = get_index(owner.pk)
+    incremental = (time.perf_counter() - start) * 1000
+
+    related_p50, related_p95 = percentiles(related)
+    command.stdout.write(f"{len(index.ids)} not, ~{content_words} kelime, imza {index.matrix.shape[1]} x uint32")
+    command.stdout.write(f"\n{'adım':<34} {'süre':>10} {'bellek (tepe)':>14}")
+    command.stdout.write(
+        f"{'ilk istek (imzasız)':<34} {first:>9.2f}s {first_peak / 2**20:>11.1f} MB"
+        f"  ({first_pending} not bekliyor)"
+    )
+    command.stdout.write(f"{'compute_note_signatures':<34} {build:>9.2f}s {build_peak / 2**20:>11.1f} MB")
+    command.stdout.write(f"{'yükleme (NoteSignature)':<34} {load:>9.2f}s {load_peak / 2**20:>11.1f} MB")
+    command.stdout.write(f"{f'artımlı ({edits} düzenleme + {edits} çöp)':<34} {incremental:>8.1f}ms")
+    command.stdout.write(f"\nindeks belleği: {index.nbytes / 2**20:.1f} MB")
+    command.stdout.write(f"related: p50 {related_p50:.2f} ms, p95 {related_p95:.2f} ms ({len(related)} sorgu)")
+    command.stdout.write(
+        f"duplicates: {statistics.median(duplicate_timings):.0f} ms, {len(groups)} grup; "
+        f"eklenen {len(pairs)} kopyanın {found} tanesi bulundu"
+    )
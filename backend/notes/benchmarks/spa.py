@@ -0,0 +1,131 @@
+"""
+Arayüz kabuğu (index.html) ve asset'ler için ilk bayta kadar geçen süre.
+
+Yerel bir HTTP sunucusu (LiveServerThread) üzerinden, her istek yeni bir
+bağlantıyla gönderilir; süre istek gönderildiğinden durum satırı ve
+başlıklar okunana kadar ölçülür. Karşılaştırma için eski yol (index.html'i
+her istekte şablon motoruyla işleyen TemplateView) da aynı sunucuda
+/template/ altında çalışır. Soğuk: şablon motoru / kabuk önbelleği
+sıfırlandıktan sonraki ilk istek; sıcak: sonraki istekler.
+"""
+import http.client
+import re
+import statistics
+import time
+
+from django.conf import settings
+from django.test import RequestFactory, override_settings
+from django.test.signals import reset_template_engines
+from django.test.testcases import LiveServerThread
+from django.urls import include, path
+from django.views.generic import TemplateView
+
+from notes import spa
+
+from . import measure as median_ms
+
+help = "Arayüz kabuğu ve asset'ler için soğuk/sıcak ilk bayt süresini (TTFB) ölçer."
+
+uses_database = False
+
+urlpatterns = [
+    path("template/", TemplateView.as_view(template_name="index.html")),
+    path("", include(settings.ROOT_URLCONF)),
+]
+
+
+def add_arguments(parser):
+    parser.add_argument("--requests", type=int, default=300, help="Sıcak ölçüm için istek sayısı.")
+    parser.add_argument("--cold", type=int, default=5, help="Soğuk ölçüm tekrar sayısı.")
+
+
+def fetch(port, path, headers):
+    """
+    (ilk bayt ms, durum, gövde bayt, başlıklar)
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    try:
+        start = time.perf_counter()
+        connection.request("GET", path, headers=headers)
+        response = connection.getresponse()
+        ttfb = (time.perf_counter() - start) * 1000
+        body = response.read()
+        return ttfb, response.status, len(body), response
+    finally:
+        connection.close()
+
+
+def reset_caches():
+    reset_template_engines(setting="TEMPLATES")
+    spa._shell = None
+
+
+def measure(port, path, headers, requests, cold):
+    colds = []
+    for _ in range(cold):
+        reset_caches()
+        colds.append(fetch(port, path, headers)[0])
+    timings = []
+    for _ in range(requests):
+        ttfb, status, size, response = fetch(port, path, headers)
+        timings.append(ttfb)
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "cold": statistics.median(colds), "p50": percentiles[49], "p95": percentiles[94],
+        "status": status, "size": size, "cache": response.getheader("Cache-Control") or "-",
+        "encoding": response.getheader("Content-Encoding") or "-",
+    }
+
+
+def run(command, requests, cold, **options):
+    templates = [{**settings.TEMPLATES[0], "DIRS": [settings.WHITENOISE_ROOT]}]
+    with override_settings(ROOT_URLCONF=__name__, TEMPLATES=templates):
+        server = LiveServerThread("127.0.0.1", static_handler=lambda handler: handler)
+        server.daemon = True
+        server.start()
+        server.is_ready.wait()
+        if server.error:
+            raise server.error
+        try:
+            port = server.port
+            _, _, _, response = fetch(port, "/", {})
+            etag = response.getheader("ETag")
+            gzip_etag = fetch(port, "/", {"Accept-Encoding": "gzip"})[3].getheader("ETag")
+            with open(settings.SPA_INDEX_FILE) as f:
+                asset = re.search(r'"(/assets/[^"]+\.js)"', f.read()).group(1)
+            cases = [
+                ("TemplateView (eski)", "/template/", {}),
+                ("kabuk", "/", {}),
+                ("kabuk, gzip", "/", {"Accept-Encoding": "gzip"}),
+                ("kabuk, br", "/", {"Accept-Encoding": "br, gzip"}),
+                ("kabuk, 304", "/", {"Accept-Encoding": "gzip", "If-None-Match": gzip_etag}),
+                ("derin bağlantı", "/share/00000000-0000-0000-0000-000000000000", {"Accept-Encoding": "gzip"}),
+                ("asset, gzip", asset, {"Accept-Encoding": "gzip"}),
+            ]
+            rows = [(label, path, measure(port, path, headers, requests, cold)) for label, path, headers in cases]
+
+            # HTTP'siz, sadece görünümün kendisi (sıcak)
+            factory = RequestFactory()
+            template_view = TemplateView.as_view(template_name="index.html")
+            views = {
+                "TemplateView": median_ms(lambda: template_view(factory.get("/")).render(), repeat=requests),
+                "kabuk (gzip)": median_ms(lambda: spa.spa_shell(factory.get("/", HTTP_ACCEPT_ENCODING="gzip")), repeat=requests),
+            }
+        finally:
+            server.terminate()
+            server.join()
+
+    command.stdout.write(f"DEBUG={settings.DEBUG}, {requests} sıcak istek, {cold} soğuk tekrar; kabuk ETag {etag}")
+    command.stdout.write(
+        f"{'durum':<22} {'soğuk':>9} {'sıcak p50':>10} {'p95':>8} {'kod':>4} {'bayt':>8} {'kodlama':>8}  Cache-Control"
+    )
+    for label, _, row in rows:
+        command.stdout.write(
+            f"{label:<22} {row['cold']:>7.2f}ms {row['p50']:>8.2f}ms {row['p95']:>6.2f}ms "
+            f"{row['status']:>4} {row['size']:>8} {row['encoding']:>8}  {row['cache']}"
+        )
+    if rows[-1][2]["encoding"] == "-":
+        command.stdout.write("Asset sıkıştırılmamış sunuldu; `manage.py compress_frontend` çalıştırın.")
+    command.stdout.write("\nGörünüm süresi (HTTP'siz, sıcak medyan): " + ", ".join(
+        f"{label} {elapsed * 1000:.0f} µs" for label, elapsed in views.items()
+    ))
@@ -0,0 +1,66 @@
+"""
+Soğuk açılış süresini ölçer: `python -X importtime -c "import backend.wsgi"`.
+
+Otomatik ölçeklenen örnekler sık soğuk açıldığından açılış bütçesi aşılırsa
+veya açılışta ağır bir modül (ör. Google SDK'sı) yüklenirse komut hata
+koduyla biter.
+"""
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+help = "backend.wsgi için soğuk açılış ve içe aktarma süresini ölçer."
+uses_database = False
+
+# Açılışta yüklenmemesi gereken modüller
+FORBIDDEN_MODULES = ("google.generativeai", "grpc")
+
+
+def add_arguments(parser):
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="En yavaş N modülü göster")
+
+
+def import_once():
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get("DJANGO_SETTINGS_MODULE", "backend.settings"))
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import backend.wsgi"],
+        cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise CommandError(result.stderr.strip().splitlines()[-1])
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = [part.strip() for part in line.split(":", 1)[1].split("|")]
+        modules.append((name, int(self_us), int(cumulative_us)))
+    return elapsed, modules
+
+
+def run(command, budget_ms, repeat, top, **options):
+    runs = [import_once() for _ in range(repeat)]
+    elapsed, modules = min(runs, key=lambda item: item[0])
+    import_ms = sum(self_us for _, self_us, _ in modules) / 1000
+
+    command.stdout.write(f"Süreç süresi: {elapsed:.0f} ms, içe aktarma: {import_ms:.0f} ms, {len(modules)} modül")
+    for name, _, cumulative in sorted(modules, key=lambda item: -item[2])[:top]:
+        command.stdout.write(f"  {cumulative / 1000:>8.1f} ms  {name}")
+
+    loaded = sorted(
+        name for name, _, _ in modules
+        if any(name == forbidden or name.startswith(forbidden + ".") for forbidden in FORBIDDEN_MODULES)
+    )
+    if loaded:
+        raise CommandError("Açılışta yüklenmemesi gereken modüller: " + ", ".join(loaded))
+    if elapsed > budget_ms:
+        raise CommandError(f"Açılış bütçesi aşıldı: {elapsed:.0f} ms > {budget_ms:.0f} ms")
+    command.stdout.write(command.style.SUCCESS("Açılış bütçe içinde."))
@@ -0,0 +1,96 @@
+"""
+Etiketli not oluşturma/güncelleme maliyeti: taggit'in TaggitSerializer yolu
+ile notes/tagging.py üzerinden toplu etiket yazımı karşılaştırılır.
+"""
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from taggit.serializers import TaggitSerializer
+
+from notes.bulk import NoteBatch
+from notes.serializers import NoteSerializer
+from notes.tagging import forget_tag_ids
+
+help = "Etiketli not oluşturma ve etiket güncellemenin sorgu sayısı ve hızını ölçer."
+
+
+class LegacyNoteSerializer(TaggitSerializer, NoteSerializer):
+    """
+    Eski yol: etiketler taggit yöneticisinin set() metoduyla tek tek yazılır.
+    """
+
+
+def add_arguments(parser):
+    parser.add_argument("--notes", type=int, default=200)
+    parser.add_argument("--tags", type=int, default=10, help="Not başına etiket sayısı.")
+    parser.add_argument("--tag-pool", type=int, default=100)
+
+
+class QueryCounter:
+    # CaptureQueriesContext'in kayıt sınırına (9000 sorgu) takılmadan sayar
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def timed(func, count):
+    """
+    (not başına sorgu, not/sn) döner.
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+    return counter.count / count, count / elapsed
+
+
+def run(command, notes, tags, tag_pool, **options):
+    rng = random.Random(0)
+    pool = [f"etiket{i}" for i in range(tag_pool)]
+    payloads = [
+        {"title": f"not {i}", "content": "<p>içerik</p>", "tags": rng.sample(pool, tags)}
+        for i in range(notes)
+    ]
+
+    def create_with(serializer_class, owner):
+        created = []
+
+        def create():
+            for payload in payloads:
+                serializer = serializer_class(data=payload)
+                serializer.is_valid(raise_exception=True)
+                created.append(serializer.save(owner=owner))
+        return create, created
+
+    def retag_with(serializer_class, created):
+        def retag():
+            for note, payload in zip(created, payloads):
+                # 10 etiketten 2'si değişir
+                new_tags = payload["tags"][2:] + rng.sample(pool, 2)
+                serializer = serializer_class(note, data={"tags": new_tags}, partial=True)
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+        return retag
+
+    rows = []
+    for name, serializer_class in (("taggit (eski yol)", LegacyNoteSerializer), ("toplu yazım", NoteSerializer)):
+        owner = User.objects.create(username=f"benchmark-{serializer_class.__name__}")
+        forget_tag_ids()
+        create, created = create_with(serializer_class, owner)
+        rows.append((f"{name}: oluşturma", *timed(create, notes)))
+        rows.append((f"{name}: etiket güncelleme", *timed(retag_with(serializer_class, created), notes)))
+
+    owner = User.objects.create(username="benchmark-batch")
+    batch = NoteBatch(owner)
+    operations = [{"op": "create", **payload} for payload in payloads]
+    rows.append(("POST /api/notes/batch/", *timed(lambda: batch.run(operations), notes)))
+
+    command.stdout.write(f"{'yol':<34} {'sorgu/not':>10} {'not/sn':>9}")
+    for name, queries, rate in rows:
+        command.stdout.write(f"{name:<34} {queries:>10.1f} {rate:>9.0f}")
@@ -0,0 +1,72 @@
+"""
+Toplu dışa/içe aktarma: dışa aktarmanın not sayısına göre bellek tepe
+değeri (akış sayesinde sabit kalmalı) ve içe aktarmanın not başına sorgu
+sayısı ile hızı, NoteSerializer ile tek tek oluşturmaya karşı ölçülür.
+"""
+import io
+import json
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+
+from notes.serializers import NoteSerializer
+from notes.transfer import NoteImporter, export_markdown_zip, export_ndjson
+
+from .data import seed_notes
+from .tagging import timed
+
+help = "Dışa aktarmanın bellek kullanımını ve içe aktarmanın not başına sorgu sayısı/hızını ölçer."
+
+
+def add_arguments(parser):
+    parser.add_argument("--sizes", default="1000,5000", help="Virgülle ayrılmış not sayıları.")
+    parser.add_argument("--content-words", type=int, default=200)
+
+
+def consume(chunks):
+    """
+    Akışı tüketir; (toplam bayt, bellek tepe değeri MB, süre sn) döner.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = sum(len(chunk) for chunk in chunks)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, peak / 1024 / 1024, elapsed
+
+
+def run(command, sizes, content_words, **options):
+    sizes = [int(size) for size in sizes.split(",")]
+    command.stdout.write(f"{'dışa aktarma':<22} {'not':>6} {'boyut MB':>9} {'bellek MB':>10} {'not/sn':>8}")
+    exported = None
+    for count in sizes:
+        owner = User.objects.create(username=f"benchmark-export-{count}")
+        seed_notes(owner, count, content_words=content_words, categories=[])
+        for name, export in (("NDJSON", export_ndjson), ("Markdown zip", export_markdown_zip)):
+            size, peak, elapsed = consume(export(owner))
+            command.stdout.write(
+                f"{name:<22} {count:>6} {size / 1024 / 1024:>9.1f} {peak:>10.1f} {count / elapsed:>8.0f}"
+            )
+        exported = (count, b"".join(export_ndjson(owner)))
+
+    count, body = exported
+    legacy_owner = User.objects.create(username="benchmark-import-legacy")
+    records = [json.loads(line) for line in body.splitlines()]
+    fields = ("title", "content", "is_pinned", "is_private", "tags")
+
+    def create_one_by_one():
+        for record in records:
+            serializer = NoteSerializer(data={key: record[key] for key in fields})
+            serializer.is_valid(raise_exception=True)
+            serializer.save(owner=legacy_owner)
+
+    importer = NoteImporter(User.objects.create(username="benchmark-import"))
+    rows = [
+        ("NoteSerializer (tek tek)", *timed(create_one_by_one, count)),
+        ("NoteImporter (partiler)", *timed(lambda: importer.run(io.BytesIO(body)), count)),
+    ]
+    command.stdout.write(f"\n{'içe aktarma':<26} {'sorgu/not':>10} {'not/sn':>9}")
+    for name, queries, rate in rows:
+        command.stdout.write(f"{name:<26} {queries:>10.2f} {rate:>9.0f}")
@@ -0,0 +1,328 @@
+"""
+Notlar üzerinde toplu (batch) işlemler.
+
+İşlemler türlerine göre gruplanır ve tek bir transaction içinde küme
+tabanlı sorgularla uygulanır: her alan için tek bir CASE WHEN UPDATE,
+oluşturmalar için tek bulk_create, etiketler için notes/tagging.py.
+Böylece sorgu sayısı işlem sayısından bağımsızdır. Sinyaller
+tetiklenmediği için arama indeksi, istatistik sayaçları, koleksiyon
+sürümü, paylaşım önbelleği ve revizyon geçmişi burada toplu olarak
+güncellenir.
+
+İşlemler şu sırayla uygulanır: create, alan güncellemeleri (update, pin,
+unpin, trash, restore, set_category), etiketler, delete.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, When, Value
+from django.utils import timezone
+
+from . import stats
+from .content import render
+from .events import emit
+from .models import Note, Category, NoteRevision, NoteSignature
+from .public import cache_key
+from .revisions import record_snapshots
+from .search import get_search_backend
+from .serializers import NoteSerializer
+from .tagging import add_tags, remove_tags, set_tags, clear_tags, clean_tags, tag_names
+from .versioning import bump_version, record_tombstones
+
+OPERATIONS = (
+    'create', 'update', 'pin', 'unpin', 'trash', 'restore', 'delete',
+    'set_category', 'add_tags', 'remove_tags',
+)
+
+# create/update işlemlerinde yazılabilen alanlar; bunlara ek olarak 'tags' ve
+# (set_category gibi toplu doğrulanan) 'category' kabul edilir, diğer
+# alanlar işlem hatası olarak reddedilir
+UPDATE_FIELDS = ('title', 'content', 'is_private', 'is_pinned', 'is_shared')
+
+# Tek alan değiştiren işlemler: işlem -> (alan, değer)
+FLAG_OPERATIONS = {
+    'pin': ('is_pinned', True),
+    'unpin': ('is_pinned', False),
+    'trash': ('is_deleted', True),
+    'restore': ('is_deleted', False),
+}
+
+
+class OperationError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def purge_notes(note_ids, trashed_only=False):
+    """
+    Notları sinyal tetiklemeden kalıcı olarak siler; etiket bağlantıları,
+    revizyonlar, benzerlik imzaları, arama indeksi, istatistikler, sürüm,
+    silme kayıtları (?since=) ve paylaşım önbelleği de güncellenir.
+    `trashed_only` ile bu arada geri yüklenen notlar atlanır.
+    Silinen not sayısını döner.
+    """
+    note_ids = list(note_ids)
+    if not note_ids:
+        return 0
+    with transaction.atomic():
+        notes = Note.objects.select_for_update().filter(pk__in=note_ids)
+        if trashed_only:
+            notes = notes.filter(is_deleted=True)
+        rows = list(notes.values_list('pk', 'owner_id', 'share_uuid'))
+        note_ids = [pk for pk, _, _ in rows]
+        before = stats.states(note_ids)
+        clear_tags(note_ids)
+        get_search_backend().remove_notes(note_ids)
+        NoteRevision.objects.filter(note_id__in=note_ids)._raw_delete(NoteRevision.objects.db)
+        NoteSignature.objects.filter(note_id__in=note_ids)._raw_delete(NoteSignature.objects.db)
+        # Note'a bağlı sinyaller collector'ın hızlı silmesini engeller; bağımlı
+        # satırlar yukarıda temizlendiği için doğrudan DELETE yeterli
+        deleted = Note.objects.filter(pk__in=note_ids)._raw_delete(Note.objects.db)
+        stats.apply_state_changes(before, {})
+        owners = {}
+        for pk, owner_id, _ in rows:
+            owners.setdefault(owner_id, []).append(pk)
+        for owner_id, owner_note_ids in owners.items():
+            version = bump_version(owner_id)
+            record_tombstones(owner_id, owner_note_ids, version)
+            emit(owner_id, 'notes.deleted', count=len(owner_note_ids), version=version)
+    cache.delete_many([cache_key(share_uuid) for _, _, share_uuid in rows if share_uuid])
+    return deleted
+
+
+@transaction.atomic
+def restore_all(owner):
+    """
+    Çöpteki tüm notları tek UPDATE ile geri yükler; geri yüklenen sayıyı döner.
+    """
+    from .purge import exclude_pending
+
+    trashed = exclude_pending(Note.objects.filter(owner=owner, is_deleted=True))
+    share_uuids = list(trashed.filter(share_uuid__isnull=False).values_list('share_uuid', flat=True))
+    version = bump_version(owner.pk)
+    restored = trashed.update(
+        is_deleted=False, deleted_at=None, version=version, updated_at=timezone.now()
+    )
+    if restored:
+        stats.rebuild(owner.pk)
+        emit(owner.pk, 'notes.restored', count=restored, version=version)
+    cache.delete_many([cache_key(share_uuid) for share_uuid in share_uuids])
+    return restored
+
+
+class NoteBatch:
+    """
+    Kullanıcının notları üzerinde bir işlem listesini uygular ve her işlem
+    için sonuç döner.
+    """
+    def __init__(self, owner, context=None):
+        self.owner = owner
+        self.context = context or {}
+
+    # --- Doğrulama (sorgusuz) ---
+    def parse(self, index, operation):
+        if not isinstance(operation, dict):
+            raise OperationError("İşlem bir nesne olmalı.")
+        op = operation.get('op')
+        if op not in OPERATIONS:
+            raise OperationError(f"Bilinmeyen işlem: {op}")
+
+        parsed = {'index': index, 'op': op}
+        if op != 'create':
+            try:
+                parsed['id'] = int(operation.get('id'))
+            except (TypeError, ValueError):
+                raise OperationError("Geçerli bir 'id' gerekli.")
+
+        if op in ('create', 'update'):
+            payload = {key: value for key, value in operation.items() if key not in ('op', 'id', 'category')}
+            unsupported = set(payload) - set(UPDATE_FIELDS) - {'tags'}
+            if unsupported:
+                raise OperationError({name: "Toplu işlemde değiştirilemez." for name in sorted(unsupported)})
+            serializer = NoteSerializer(data=payload, partial=op == 'update', context=self.context)
+            if not serializer.is_valid():
+                raise OperationError(serializer.errors)
+            data = serializer.validated_data
+            parsed['fields'] = {name: data[name] for name in UPDATE_FIELDS if name in data}
+            parsed['tags'] = data.get('tags')
+            if 'category' in operation:
+                parsed['category'] = self.parse_category(operation['category'])
+        elif op == 'set_category':
+            parsed['category'] = self.parse_category(operation.get('category'))
+        elif op in ('add_tags', 'remove_tags'):
+            tags = operation.get('tags')
+            if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+                raise OperationError("'tags' bir metin listesi olmalı.")
+            parsed['tags'] = clean_tags(tags)
+        return parsed
+
+    @staticmethod
+    def parse_category(category):
+        # Sahiplik `run` içinde tüm işlemler için tek sorguyla denetlenir
+        try:
+            return None if category is None else int(category)
+        except (TypeError, ValueError):
+            raise OperationError("Geçersiz kategori.")
+
+    # --- Uygulama ---
+    def run(self, operations):
+        results = [None] * len(operations)
+        parsed = []
+        for index, operation in enumerate(operations):
+            try:
+                parsed.append(self.parse(index, operation))
+            except OperationError as e:
+                results[index] = self.error(index, operation, e.errors)
+
+        # Sahiplik ve kategori kontrolleri: tek sorgu ile
+        ids = {item['id'] for item in parsed if 'id' in item}
+        owned = {
+            pk: share_uuid for pk, share_uuid in
+            Note.objects.filter(owner=self.owner, pk__in=ids).values_list('pk', 'share_uuid')
+        }
+        category_ids = {item['category'] for item in parsed if item.get('category') is not None}
+        categories = set(
+            Category.objects.filter(owner=self.owner, pk__in=category_ids).values_list('pk', flat=True)
+        ) if category_ids else set()
+
+        valid = []
+        for item in parsed:
+            if 'id' in item and item['id'] not in owned:
+                results[item['index']] = self.error(item['index'], item, "Not bulunamadı.")
+            elif item.get('category') is not None and item['category'] not in categories:
+                results[item['index']] = self.error(item['index'], item, "Kategori bulunamadı.")
+            else:
+                valid.append(item)
+
+        created = self.apply(valid, owned)
+        for item in valid:
+            note_id = created.get(item['index'], item.get('id'))
+            results[item['index']] = {'index': item['index'], 'op': item['op'], 'id': note_id, 'status': 'ok'}
+        return results
+
+    @staticmethod
+    def error(index, operation, errors):
+        op = operation.get('op') if isinstance(operation, dict) else None
+        return {'index': index, 'op': op, 'status': 'error', 'errors': errors}
+
+    @transaction.atomic
+    def apply(self, items, owned):
+        """
+        Doğrulanmış işlemleri uygular; {işlem sırası: yeni not id} döner.
+        """
+        if not items:
+            return {}
+        now = timezone.now()
+        field_values = {}
+        tags_to_add, tags_to_remove, tags_to_replace = {}, {}, {}
+        deleted = set()
+        creates = []
+
+        for item in items:
+            op, note_id = item['op'], item.get('id')
+            if op == 'create':
+                creates.append(item)
+            elif op == 'update':
+                for name, value in item['fields'].items():
+                    field_values.setdefault(name, {})[note_id] = value
+                if 'category' in item:
+                    field_values.setdefault('category_id', {})[note_id] = item['category']
+                if item['fields'].get('is_shared') and not owned[note_id]:
+                    # İlk kez paylaşılan nota link (bkz. NoteViewSet.share)
+                    field_values.setdefault('share_uuid', {})[note_id] = uuid.uuid4()
+                if item['tags'] is not None:
+                    tags_to_replace[note_id] = item['tags']
+            elif op in FLAG_OPERATIONS:
+                name, value = FLAG_OPERATIONS[op]
+                field_values.setdefault(name, {})[note_id] = value
+                if name == 'is_deleted':
+                    field_values.setdefault('deleted_at', {})[note_id] = now if value else None
+            elif op == 'set_category':
+                field_values.setdefault('category_id', {})[note_id] = item['category']
+            elif op == 'add_tags':
+                tags_to_add.setdefault(note_id, []).extend(item['tags'])
+            elif op == 'remove_tags':
+                tags_to_remove.setdefault(note_id, []).extend(item['tags'])
+            elif op == 'delete':
+                deleted.add(note_id)
+
+        changed = (
+            {pk for values in field_values.values() for pk in values}
+            | set(tags_to_add) | set(tags_to_remove) | set(tags_to_replace)
+        ) - deleted
+        reindex = (
+            set(field_values.get('title', {})) | set(field_values.get('content', {}))
+            | set(tags_to_add) | set(tags_to_remove) | set(tags_to_replace)
+        ) - deleted
+        before = stats.states(changed)
+        version = bump_version(self.owner.pk)
+
+        # 1. Oluşturma
+        notes = Note.objects.bulk_create([
+            Note(
+                owner=self.owner, version=version, **item['fields'], **render(item['fields'].get('content')),
+                category_id=item.get('category'),
+                share_uuid=uuid.uuid4() if item['fields'].get('is_shared') else None,
+            )
+            for item in creates
+        ])
+        created = {item['index']: note.pk for item, note in zip(creates, notes)}
+        for item, note in zip(creates, notes):
+            if item['tags']:
+                tags_to_add[note.pk] = item['tags']
+            reindex.add(note.pk)
+
+        # İçeriği değişen notların türetilmiş alanları
+        for note_id, content in field_values.get('content', {}).items():
+            for name, value in render(content).items():
+                field_values.setdefault(name, {})[note_id] = value
+
+        # 2. Alan güncellemeleri: alan başına tek UPDATE
+        for name, values in field_values.items():
+            values = {pk: value for pk, value in values.items() if pk not in deleted}
+            if not values:
+                continue
+            distinct = set(values.values())
+            if len(distinct) == 1:
+                # Hepsine aynı değer (pin, trash...) yazılıyorsa CASE gerekmez
+                Note.objects.filter(pk__in=list(values)).update(**{name: distinct.pop()})
+                continue
+            field = Note._meta.get_field(name.removesuffix('_id'))
+            Note.objects.filter(pk__in=list(values)).update(**{name: Case(
+                *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+                output_field=field.target_field if field.is_relation else field,
+            )})
+        if changed:
+            Note.objects.filter(pk__in=list(changed)).update(version=version, updated_at=now)
+
+        # 3. Etiketler
+        if tags_to_replace:
+            set_tags(tags_to_replace)
+        if tags_to_remove:
+            remove_tags(tags_to_remove)
+        if tags_to_add:
+            add_tags(tags_to_add)
+
+        # 4. Kalıcı silme
+        purge_notes(deleted)
+
+        # Yan etkiler: arama indeksi, istatistikler, paylaşım önbelleği
+        if reindex:
+            names = tag_names(reindex)
+            rows = Note.objects.filter(pk__in=list(reindex)).values_list('pk', 'title', 'content')
+            get_search_backend().index_notes(
+                (pk, title, content, names[pk]) for pk, title, content in rows
+            )
+        revised = (set(field_values.get('title', {})) | set(field_values.get('content', {}))) - deleted
+        revised |= set(created.values())
+        if revised:
+            record_snapshots(
+                Note.objects.filter(pk__in=list(revised)).values_list('pk', 'title', 'content', 'updated_at')
+            )
+        stats.apply_state_changes(before, stats.states(changed | set(created.values())))
+        cache.delete_many([cache_key(owned[pk]) for pk in changed if owned.get(pk)])
+        if changed or created:
+            emit(self.owner.pk, 'notes.changed', count=len(changed) + len(created), version=version)
+        return created
@@ -0,0 +1,245 @@
+"""
+Not içeriğinin yazma anında işlenmesi.
+
+Editörden (Quill) gelen HTML kaydedilirken bir kez temizlenir ve türetilen
+değerler Note üzerinde saklanır:
+- content_html: izin verilen etiket/özniteliklerle temizlenmiş HTML,
+- excerpt: kartlarda ve özet listelerde gösterilen düz metin özet,
+- word_count / char_count: düz metnin kelime ve karakter sayısı.
+Böylece istemci her kartı çizerken temizlik yapmaz, özet listeler de
+büyük `content` alanını hiç okumaz. Mevcut satırlar için
+`manage.py render_note_content` kullanılır.
+"""
+import html
+import re
+from html.parser import HTMLParser
+
+from bleach.sanitizer import Cleaner
+
+# Kartlarda/özet listelerde gösterilen düz metin uzunluğu
+EXCERPT_LENGTH = 200
+
+ALLOWED_TAGS = [
+    "p", "strong", "em", "ul", "ol", "li", "br", "h1", "h2",
+    "a", "img",
+]
+ALLOWED_ATTRIBUTES = {
+    "*": ["class"],
+    "a": ["href", "title"],
+    "img": ["src", "alt", "style"],
+}
+# data: sadece gömülü resimler (Quill base64) için, bkz. allow_attribute
+ALLOWED_PROTOCOLS = ["http", "https", "mailto", "data"]
+
+# Tamamı escape edilmiş içeriğin başı: "&lt;p&gt;", "&lt;h1 class=..."
+ESCAPED_TAG_RE = re.compile(r"\s*&lt;/?[a-zA-Z][a-zA-Z0-9]*(\s|/?&gt;)")
+
+# Metin akışında ayrı satır sayılan etiketler
+BLOCK_TAGS = {"p", "br", "li", "ul", "ol", "h1", "h2", "h3", "div", "blockquote", "pre"}
+
+try:
+    # style özniteliği sadece CSS temizleyici (tinycss2) kuruluysa korunur
+    from bleach.css_sanitizer import CSSSanitizer
+    css_sanitizer = CSSSanitizer(allowed_css_properties=["width", "height", "float"])
+except ImportError:
+    css_sanitizer = None
+
+
+def allow_attribute(tag, name, value):
+    allowed = ALLOWED_ATTRIBUTES.get(tag, []) + ALLOWED_ATTRIBUTES["*"]
+    if name not in allowed or (name == "style" and css_sanitizer is None):
+        return False
+    if name in ("href", "src"):
+        # bleach'in protokol kontrolüyle aynı normalleştirme
+        uri = re.sub(r"[`\000-\040\177-\240\s]+", "", html.unescape(value)).lower()
+        if uri.startswith("data:"):
+            return tag == "img" and uri.startswith("data:image/")
+    return True
+
+
+# Derlenmiş temizleyici: etiket/öznitelik kuralları ve html5lib ayarları
+# her kayıtta yeniden kurulmaz
+cleaner = Cleaner(
+    tags=ALLOWED_TAGS,
+    attributes=allow_attribute,
+    protocols=ALLOWED_PROTOCOLS,
+    strip=True,
+    css_sanitizer=css_sanitizer,
+)
+
+
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+class MarkdownConverter(HTMLParser):
+    """
+    Temizlenmiş HTML'i (ALLOWED_TAGS) Markdown'a çevirir; dışa aktarma için.
+    """
+    INLINE = {"strong": "**", "em": "*"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks = []
+        self.line = []
+        self.lists = []
+        self.prefix = "" # Liste öğesinin girinti ve işareti
+        self.href = None
+
+    def flush(self):
+        text = "".join(self.line).strip()
+        self.line = []
+        if text:
+            # (metin, liste öğesi mi)
+            self.blocks.append((self.prefix + text, bool(self.prefix)))
+        self.prefix = ""
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag in ("p", "h1", "h2"):
+            self.flush()
+            if tag != "p":
+                self.line.append("#" * int(tag[1]) + " ")
+        elif tag in ("ul", "ol"):
+            self.flush()
+            self.lists.append([tag, 0])
+        elif tag == "li":
+            self.flush()
+            if self.lists:
+                self.lists[-1][1] += 1
+            kind, number = self.lists[-1] if self.lists else ("ul", 1)
+            indent = "  " * (len(self.lists) - 1)
+            self.prefix = indent + (f"{number}. " if kind == "ol" else "- ")
+        elif tag == "br":
+            self.line.append("  \n")
+        elif tag in self.INLINE:
+            self.line.append(self.INLINE[tag])
+        elif tag == "a":
+            self.href = attrs.get("href")
+            self.line.append("[")
+        elif tag == "img":
+            self.line.append(f"![{attrs.get('alt') or ''}]({attrs.get('src') or ''})")
+
+    def handle_endtag(self, tag):
+        if tag in ("p", "h1", "h2", "li"):
+            self.flush()
+        elif tag in ("ul", "ol") and self.lists:
+            self.flush()
+            self.lists.pop()
+        elif tag in self.INLINE:
+            self.line.append(self.INLINE[tag])
+        elif tag == "a":
+            self.line.append(f"]({self.href or ''})")
+            self.href = None
+
+    def handle_data(self, data):
+        self.line.append(data.replace("\n", " "))
+
+    def markdown(self):
+        self.flush()
+        parts = []
+        previous_item = False
+        for text, is_item in self.blocks:
+            if parts:
+                # Ardışık liste öğeleri arasında boş satır bırakılmaz
+                parts.append("\n" if is_item and previous_item else "\n\n")
+            parts.append(text)
+            previous_item = is_item
+        return "".join(parts) + "\n" if parts else ""
+
+
+def is_escaped(content):
+    """
+    Eski istemcilerin kaydettiği, tamamı HTML-escape edilmiş içerik mi
+    (ör. "&lt;p&gt;metin&lt;/p&gt;", bkz. NotKarti.jsx). Editörün (Quill)
+    ürettiği içerik her zaman gerçek etiketlerle başladığından, metin olarak
+    yazılmış "&lt;b&gt;" ("<p>&lt;b&gt;</p>") bu kapsama girmez.
+    """
+    return "<" not in content and ESCAPED_TAG_RE.match(content) is not None
+
+
+def sanitize(content):
+    content = content or ""
+    if is_escaped(content):
+        content = html.unescape(content)
+    return cleaner.clean(content)
+
+
+def plain_text(content_html):
+    parser = TextExtractor()
+    parser.feed(content_html)
+    parser.close()
+    return " ".join("".join(parser.parts).split())
+
+
+def markdown(content_html):
+    parser = MarkdownConverter()
+    parser.feed(content_html)
+    parser.close()
+    return parser.markdown()
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    if len(text) <= length:
+        return text
+    cut = text[:length - 1]
+    # Kelimenin ortasından kesme
+    if " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.rstrip() + "…"
+
+
+def render(content):
+    """
+    İçerikten türetilen alanlar: {content_html, excerpt, word_count, char_count}.
+    """
+    content_html = sanitize(content)
+    text = plain_text(content_html)
+    return {
+        "content_html": content_html,
+        "excerpt": make_excerpt(text),
+        "word_count": len(text.split()),
+        "char_count": len(text),
+    }
+
+
+RENDERED_FIELDS = ("content_html", "excerpt", "word_count", "char_count")
+
+
+def render_note(note):
+    for name, value in render(note.content).items():
+        setattr(note, name, value)
+    note._rendered_content = note.content
+
+
+def render_all(note_model, batch_size=500, only_missing=False):
+    """
+    Mevcut notların türetilmiş alanlarını id sırasıyla parça parça hesaplar;
+    güncellenen not sayısını döner.
+    """
+    notes = note_model.objects.order_by("pk").only("pk", "content")
+    if only_missing:
+        notes = notes.filter(content_html="").exclude(content="")
+    last_pk, total = 0, 0
+    while True:
+        batch = list(notes.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            return total
+        for note in batch:
+            for name, value in render(note.content).items():
+                setattr(note, name, value)
+        note_model.objects.bulk_update(batch, RENDERED_FIELDS)
+        last_pk = batch[-1].pk
+        total += len(batch)
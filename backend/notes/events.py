@@ -0,0 +1,379 @@
+"""
+Kullanıcı bazlı değişiklik bildirimleri (server-sent events).
+
+Not ve kategori yazmaları (notes/signals.py ve toplu işlemler) `emit` ile
+kısa bir olay üretir; olay transaction commit edildikten sonra broker
+üzerinden kullanıcının açık bağlantılarına iletilir. İstemci listenin
+tamamını yeniden çekmek yerine `?since=<version>` ile sadece değişenleri
+alır. Olaylar:
+- note.created / note.updated / note.trashed / note.restored / note.tags:
+  {"id", "version"}; note.deleted: {"id"},
+- notes.changed / notes.reordered / notes.restored / notes.deleted: toplu
+  işlemler, {"count", "version"},
+- category.created / category.updated / category.deleted: {"id"}.
+
+`GET /api/events/` backend/asgi.py'deki `EventStreamApplication` tarafından
+Django'nun istek döngüsüne girmeden servis edilir: Django her ASGI isteği
+için yanıt bitene kadar ayrı bir thread ayırır, burada ise kimlik doğrulama
+ve sürüm sorgusu ortak thread havuzunda kısa sürede biter ve boştaki
+bağlantı sadece bir coroutine olarak bekler. EventSource başlık
+gönderemediğinden tarayıcı önce `POST /api/events/ticket/` ile kısa ömürlü,
+tek kullanımlık bir bilet alır ve `?ticket=` ile bağlanır; API token'ı
+adrese (dolayısıyla erişim loglarına) hiç yazılmaz. Bilet önbellekte
+tutulur; çok worker'lı kurulumda paylaşımlı önbellek (REDIS_URL) gerekir.
+Django middleware'leri çalışmadığından CORS başlıkları da burada,
+django-cors-headers ayarlarına göre eklenir. Varsayılan `LocalBroker` sadece bu
+süreçteki bağlantılara iletir; çok worker'lı kurulumlarda `RedisBroker`
+(redis paketi ve REDIS_URL) olaylar Redis pub/sub üzerinden dağıtılır.
+"""
+import asyncio
+import json
+import logging
+import re
+import secrets
+import threading
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Tek bir SSE bağlantısının olay kuyruğu. Olaylar herhangi bir thread'den
+    gelebilir; kuyruğa bağlantının event loop'unda eklenir. Kuyruk dolarsa
+    (istemci okumuyorsa) olaylar atılır ve istemciye bir kez `resync`
+    gönderilir; istemci tam senkronizasyon yapar.
+    """
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=settings.NOTE_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def push(self, event):
+        self.loop.call_soon_threadsafe(self.put, event)
+
+    def put(self, event):
+        if self.overflowed:
+            return
+        if self.queue.qsize() >= self.queue.maxsize - 1:
+            self.overflowed = True
+            event = {"type": "resync"}
+        self.queue.put_nowait(event)
+
+    async def get(self):
+        event = await self.queue.get()
+        if event["type"] == "resync":
+            self.overflowed = False
+        return event
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """
+    Süreç içi broker: {user_id: {Subscription, ...}}.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id)
+        with self.lock:
+            self.subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.subscriptions[subscription.user_id]
+
+    def connection_count(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.subscriptions.values())
+
+    def publish(self, user_id, event):
+        self.deliver(user_id, event)
+
+    def deliver(self, user_id, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.push(event)
+            except RuntimeError:
+                # Event loop kapanmış (sunucu duruyor)
+                self.unsubscribe(subscription)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Olayları Redis pub/sub kanalına yayınlar; her süreçteki dinleyici thread
+    kanaldan gelenleri kendi bağlantılarına iletir. Dinleyici ilk abonelikte
+    başlatılır.
+    """
+    channel_prefix = "notes:events:"
+
+    def __init__(self):
+        super().__init__()
+        import redis
+
+        self.client = redis.Redis.from_url(settings.NOTE_EVENTS_REDIS_URL)
+        self.listener = None
+
+    def subscribe(self, user_id):
+        if self.listener is None:
+            with self.lock:
+                if self.listener is None:
+                    self.listener = threading.Thread(target=self.listen, name="note-events", daemon=True)
+                    self.listener.start()
+        return super().subscribe(user_id)
+
+    def publish(self, user_id, event):
+        self.client.publish(f"{self.channel_prefix}{user_id}", json.dumps(event))
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{self.channel_prefix}*")
+                for message in pubsub.listen():
+                    user_id = int(message["channel"].decode().removeprefix(self.channel_prefix))
+                    self.deliver(user_id, json.loads(message["data"]))
+            except Exception:
+                # Bağlantı koptu: kısa bir süre sonra yeniden abone ol
+                logger.exception("Olay dinleyicisi durdu, yeniden bağlanılıyor.")
+                threading.Event().wait(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = import_string(settings.NOTE_EVENTS_BACKEND)()
+    return _broker
+
+
+def emit(user_id, type, **data):
+    """
+    Olayı transaction commit edildikten sonra yayınlar; geri alınırsa gönderilmez.
+    """
+    event = {"type": type, **data}
+    transaction.on_commit(lambda: get_broker().publish(user_id, event))
+
+
+def format_event(event):
+    # `event:` alanı kullanılmaz; istemci tüm olayları onmessage ile alır, tür veride
+    return f"data: {json.dumps(event, separators=(',', ':'))}\n\n".encode()
+
+
+async def event_stream(user_id, current_version):
+    """
+    SSE gövdesi. Bağlantı açılınca `ready` (güncel sürüm), sonra olaylar ve
+    boşta kalınırsa proxy'lerin bağlantıyı kapatmaması için yorum satırı
+    (heartbeat) gönderilir. İstemci koptuğunda Django akışı iptal eder ve
+    abonelik kapanır.
+    """
+    subscription = get_broker().subscribe(user_id)
+    try:
+        # Abonelikten sonra okunur: arada olan değişiklikler kaçmaz
+        version = await current_version()
+        yield f"retry: {settings.NOTE_EVENTS_RETRY_MS}\n".encode()
+        yield format_event({"type": "ready", "version": version})
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), settings.NOTE_EVENTS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield b": ping\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        subscription.close()
+
+
+TICKET_PREFIX = "notes:events:ticket:"
+
+
+def issue_ticket(user_id):
+    """
+    Olay akışına bağlanmak için NOTE_EVENTS_TICKET_TTL saniye geçerli bilet.
+    """
+    ticket = secrets.token_urlsafe(24)
+    cache.set(f"{TICKET_PREFIX}{ticket}", user_id, settings.NOTE_EVENTS_TICKET_TTL)
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """
+    Bileti harcar ve kullanıcı id'sini döner; geçersiz, süresi dolmuş veya
+    kullanılmışsa None. Aynı bileti iki bağlantı yarışırsa sadece silmeyi
+    başaran geçer.
+    """
+    key = f"{TICKET_PREFIX}{ticket}"
+    user_id = cache.get(key)
+    if user_id is None or not cache.delete(key):
+        return None
+    return user_id
+
+
+def authenticate(key):
+    """
+    Token'dan kullanıcı id'si döner; geçersizse AuthenticationFailed.
+    """
+    from .authentication import CachedTokenAuthentication
+
+    close_old_connections()
+    try:
+        user, _ = CachedTokenAuthentication().authenticate_credentials(key)
+        return user.pk
+    finally:
+        close_old_connections()
+
+
+def read_version(user_id):
+    from .models import CollectionVersion
+
+    close_old_connections()
+    try:
+        return CollectionVersion.objects.filter(user_id=user_id).values_list('version', flat=True).first() or 0
+    finally:
+        close_old_connections()
+
+
+class EventStreamApplication:
+    """
+    `path` için SSE akışını servis eden, diğer istekleri Django'ya bırakan
+    ASGI uygulaması. Kimlik `Authorization: Token ...` başlığıyla veya
+    (tarayıcıda EventSource) tek kullanımlık ?ticket= ile verilir.
+    """
+    def __init__(self, application, path="/api/events/"):
+        self.application = application
+        self.path = path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != self.path:
+            return await self.application(scope, receive, send)
+        headers = dict(scope["headers"])
+        cors = self.cors_headers(headers.get(b"origin"))
+        if scope["method"] == "OPTIONS":
+            return await self.preflight(send, cors)
+        if scope["method"] != "GET":
+            return await self.respond(send, 405, {"error": "Sadece GET."}, cors)
+
+        key, ticket = self.credentials(scope, headers)
+        from rest_framework.exceptions import AuthenticationFailed
+        try:
+            # thread_sensitive=False: istek başına thread açılmaz, ortak havuz kullanılır
+            if key:
+                user_id = await sync_to_async(authenticate, thread_sensitive=False)(key)
+            elif ticket:
+                user_id = await sync_to_async(redeem_ticket, thread_sensitive=False)(ticket)
+                if user_id is None:
+                    raise AuthenticationFailed("Geçersiz veya süresi dolmuş bilet.")
+            else:
+                return await self.respond(send, 401, {"error": "Kimlik doğrulama bilgileri sağlanmadı."}, cors)
+        except AuthenticationFailed as e:
+            return await self.respond(send, 401, {"error": str(e.detail)}, cors)
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                # nginx gibi proxy'ler olayları tamponlamasın
+                (b"x-accel-buffering", b"no"),
+                *cors,
+            ],
+        })
+
+        async def current_version():
+            return await sync_to_async(read_version, thread_sensitive=False)(user_id)
+
+        async def stream():
+            async for chunk in event_stream(user_id, current_version):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+
+        async def disconnected():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        tasks = {asyncio.ensure_future(stream()), asyncio.ensure_future(disconnected())}
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def credentials(scope, headers):
+        """
+        (API token, bilet); token sadece başlıktan okunur.
+        """
+        authorization = headers.get(b"authorization", b"").decode("latin-1").split()
+        if len(authorization) == 2 and authorization[0].lower() == "token":
+            return authorization[1], None
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return None, query.get("ticket", [None])[0]
+
+    @staticmethod
+    def cors_headers(origin):
+        """
+        İzin verilen bir kaynaktan gelen istek için CORS başlıkları
+        (CORS_ALLOWED_ORIGINS, CORS_ALLOWED_ORIGIN_REGEXES, CORS_ALLOW_ALL_ORIGINS).
+        """
+        if not origin:
+            return []
+        value = origin.decode("latin-1")
+        allowed = (
+            getattr(settings, "CORS_ALLOW_ALL_ORIGINS", False)
+            or value in getattr(settings, "CORS_ALLOWED_ORIGINS", ())
+            or any(re.match(pattern, value) for pattern in getattr(settings, "CORS_ALLOWED_ORIGIN_REGEXES", ()))
+        )
+        if not allowed:
+            return []
+        headers = [(b"access-control-allow-origin", origin), (b"vary", b"origin")]
+        if getattr(settings, "CORS_ALLOW_CREDENTIALS", False):
+            headers.append((b"access-control-allow-credentials", b"true"))
+        return headers
+
+    @staticmethod
+    async def preflight(send, cors):
+        headers = [(b"content-length", b"0")]
+        if cors:
+            headers += [
+                *cors,
+                (b"access-control-allow-methods", b"GET, OPTIONS"),
+                (b"access-control-allow-headers", b"authorization"),
+                (b"access-control-max-age", b"86400"),
+            ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    @staticmethod
+    async def respond(send, status, body, cors=()):
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *cors],
+        })
+        await send({"type": "http.response.body", "body": json.dumps(body, ensure_ascii=False).encode()})
@@ -1,6 +1,9 @@
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
 from .models import Note
 
+UNCATEGORIZED = ('none', 'uncategorized', 'null')
+
 class CharInFilter(filters.BaseInFilter, filters.CharFilter):
     """
     Virgülle ayrılmış değerleri kabul eden bir filtre.
@@ -14,9 +17,19 @@ class NoteFilter(filters.FilterSet):
     """
     tags = CharInFilter(field_name='tags__name', lookup_expr='in')
     is_public = filters.BooleanFilter(field_name='is_shared') # Modeldeki alan adı is_shared
+    # ?category=3 veya kategorisiz notlar için ?category=none
+    category = filters.CharFilter(method='filter_category')
 
     class Meta:
         model = Note
         # 'is_public' alanını yukarıda özel olarak tanımladığımız için
         # Meta.fields içinde sadece 'tags' bırakmak yeterlidir.
         fields = ['tags']
+
+    def filter_category(self, queryset, name, value):
+        if value.lower() in UNCATEGORIZED:
+            return queryset.filter(category__isnull=True)
+        try:
+            return queryset.filter(category_id=int(value))
+        except ValueError:
+            raise ValidationError({'category': "Kategori id'si veya 'none' olmalı."})
@@ -0,0 +1,277 @@
+"""
+İstek başına performans ölçümü.
+
+`PerformanceMiddleware` her istek için sorgu sayısı, veritabanı süresi,
+view süresi, serileştirici süresi (DRF `serializer.data`) ve yanıtın
+render süresini ölçer; serileştirici view içinde çalışsa da süresi view'dan
+düşülüp ayrı raporlanır:
+- `Server-Timing` başlığı olarak döner (tarayıcı geliştirici araçlarında görünür),
+- `notes.performance` logger'ına yapılandırılmış (JSON) kayıt yazar,
+- uç nokta bazlı histogramlara ekler (`GET /api/metrics/`, sadece admin),
+- `PERF_PROFILE_SAMPLE_RATE` oranında örneklenen isteklerde cProfile açar ve
+  `PERF_SLOW_REQUEST_MS`'den yavaş olanların profilini `PERF_PROFILE_DIR`'e yazar.
+
+`PERF_INSTRUMENTATION` kapalıyken middleware yüklenmez (MiddlewareNotUsed),
+yani ek maliyeti yoktur. Histogramlar süreç içidir; çok worker'lı
+kurulumlarda her worker kendi değerlerini raporlar.
+"""
+import cProfile
+import contextvars
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger("notes.performance")
+
+# Histogram üst sınırları (ms)
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float("inf"))
+
+
+class QueryTimer:
+    """
+    connection.execute_wrapper ile her sorgunun süresini toplar.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+
+
+class SerializerTimer:
+    """
+    Serileştiricilerin `.data` erişimlerinde geçen süreyi toplar; iç içe
+    erişimler (ör. ListSerializer -> Serializer) bir kez sayılır.
+    """
+    def __init__(self):
+        self.duration = 0.0
+        self.depth = 0
+
+
+_serializer_timer = contextvars.ContextVar("notes_serializer_timer", default=None)
+
+
+def install_serializer_timer():
+    """
+    BaseSerializer.data'yı ölçen bir sarmalayıcıyla değiştirir (bir kez).
+    Middleware yüklenmediyse hiç çağrılmaz; etkin bir ölçüm yokken
+    sarmalayıcı doğrudan asıl özelliğe geçer.
+    """
+    original = BaseSerializer.data.fget
+    if getattr(original, "timed", False):
+        return
+
+    def data(self):
+        timer = _serializer_timer.get()
+        if timer is None or timer.depth:
+            return original(self)
+        timer.depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            timer.depth -= 1
+            timer.duration += time.perf_counter() - start
+
+    data.timed = True
+    BaseSerializer.data = property(data)
+
+
+class EndpointMetrics:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.buckets = [0] * len(BUCKETS)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.queries = 0
+
+    def add(self, sample):
+        self.count += 1
+        self.errors += sample["status"] >= 500
+        self.total_ms += sample["total_ms"]
+        self.max_ms = max(self.max_ms, sample["total_ms"])
+        self.db_ms += sample["db_ms"]
+        self.serializer_ms += sample["serializer_ms"]
+        self.queries += sample["queries"]
+        for index, bound in enumerate(BUCKETS):
+            if sample["total_ms"] <= bound:
+                self.buckets[index] += 1
+                break
+
+    def percentile(self, fraction):
+        """
+        Histogramdan yaklaşık yüzdelik: hedef sıranın düştüğü kovanın üst sınırı.
+        """
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound if bound != float("inf") else self.max_ms
+        return self.max_ms
+
+    def as_dict(self):
+        count = self.count or 1
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / count, 2),
+            "max_ms": round(self.max_ms, 2),
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "db_mean_ms": round(self.db_ms / count, 2),
+            "serializer_mean_ms": round(self.serializer_ms / count, 2),
+            "queries_mean": round(self.queries / count, 2),
+            "histogram": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(BUCKETS, self.buckets)
+            },
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started_at = timezone.now()
+        self.endpoints = {}
+
+    def record(self, endpoint, sample):
+        with self.lock:
+            metrics = self.endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self.endpoints[endpoint] = EndpointMetrics()
+            metrics.add(sample)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "since": self.started_at.isoformat(),
+                "pid": os.getpid(),
+                "endpoints": {name: metrics.as_dict() for name, metrics in sorted(self.endpoints.items())},
+            }
+
+    def reset(self):
+        with self.lock:
+            self.started_at = timezone.now()
+            self.endpoints = {}
+
+
+registry = MetricsRegistry()
+
+
+def endpoint_name(request):
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} {match.view_name if match else 'unresolved'}"
+
+
+def server_timing(sample):
+    return ", ".join([
+        f'db;dur={sample["db_ms"]:.1f};desc="{sample["queries"]} sorgu"',
+        f'view;dur={sample["view_ms"]:.1f}',
+        f'serializer;dur={sample["serializer_ms"]:.1f}',
+        f'render;dur={sample["render_ms"]:.1f}',
+        f'total;dur={sample["total_ms"]:.1f}',
+    ])
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        if not settings.PERF_INSTRUMENTATION:
+            raise MiddlewareNotUsed()
+        install_serializer_timer()
+        self.get_response = get_response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._perf_view_start = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # DRF Response'ları burada henüz render edilmemiştir: view bitti,
+        # serileştirme (render) başlıyor
+        request._perf_view_end = time.perf_counter()
+        return response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        serializer_timer = SerializerTimer()
+        profiler = None
+        if settings.PERF_PROFILE_SAMPLE_RATE and random.random() < settings.PERF_PROFILE_SAMPLE_RATE:
+            profiler = cProfile.Profile()
+
+        start = time.perf_counter()
+        token = _serializer_timer.set(serializer_timer)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            if profiler:
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Başka bir profiler zaten etkin
+                    profiler = None
+            try:
+                response = self.get_response(request)
+            finally:
+                if profiler:
+                    profiler.disable()
+                _serializer_timer.reset(token)
+        end = time.perf_counter()
+
+        view_start = getattr(request, "_perf_view_start", start)
+        view_end = getattr(request, "_perf_view_end", end)
+        view = view_end - view_start
+        # serializer.data view içinde (Response(serializer.data)) çalışır
+        serializer = min(serializer_timer.duration, view)
+        sample = {
+            "endpoint": endpoint_name(request),
+            "path": request.path,
+            "status": response.status_code,
+            "queries": timer.count,
+            "db_ms": timer.duration * 1000,
+            "view_ms": (view - serializer) * 1000,
+            "serializer_ms": serializer * 1000,
+            "render_ms": (end - view_end) * 1000,
+            "total_ms": (end - start) * 1000,
+        }
+        response["Server-Timing"] = server_timing(sample)
+        registry.record(sample["endpoint"], sample)
+
+        slow = sample["total_ms"] >= settings.PERF_SLOW_REQUEST_MS
+        if profiler and slow:
+            sample["profile"] = self.save_profile(profiler, sample)
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            json.dumps({key: round(value, 2) if isinstance(value, float) else value for key, value in sample.items()}),
+        )
+        return response
+
+    @staticmethod
+    def save_profile(profiler, sample):
+        os.makedirs(settings.PERF_PROFILE_DIR, exist_ok=True)
+        name = "{}-{}-{:.0f}ms.prof".format(
+            timezone.now().strftime("%Y%m%dT%H%M%S%f"),
+            sample["endpoint"].replace(" ", "-").replace("/", "_"),
+            sample["total_ms"],
+        )
+        path = os.path.join(settings.PERF_PROFILE_DIR, name)
+        profiler.dump_stats(path)
+        return path
@@ -0,0 +1,22 @@
+from importlib import import_module
+
+from django.core.management.base import BaseCommand
+
+from notes.benchmarks import SUITES, benchmark_database
+
+
+class Command(BaseCommand):
+    help = "Performans ölçümlerini geçici bir test veritabanında çalıştırır."
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="suite", required=True)
+        for name in SUITES:
+            suite = import_module(f"notes.benchmarks.{name}")
+            suite.add_arguments(subparsers.add_parser(name, help=suite.help))
+
+    def handle(self, *args, suite, **options):
+        module = import_module(f"notes.benchmarks.{suite}")
+        if not getattr(module, "uses_database", True):
+            return module.run(self, **options)
+        with benchmark_database():
+            module.run(self, **options)
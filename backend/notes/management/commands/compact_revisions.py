@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from notes.revisions import compact_all
+
+
+class Command(BaseCommand):
+    help = (
+        "Eski not revizyonlarını REVISION_COALESCE_RULES kurallarına göre seyreltir "
+        "ve saklama süresi dolanları siler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", type=int, metavar="SANIYE",
+            help="Tek seferlik çalışmak yerine bu aralıkla sürekli çalış (worker olarak).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            removed = compact_all()
+            if removed or not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(f"{removed} revizyon silindi."))
+            if not options["loop"]:
+                return
+            connections.close_all()
+            time.sleep(options["loop"])
@@ -0,0 +1,22 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from whitenoise.compress import Compressor
+
+
+class Command(BaseCommand):
+    help = (
+        "Derlenmiş arayüz dosyalarının (WHITENOISE_ROOT) .gz ve brotli kuruluysa .br "
+        "kopyalarını üretir; WhiteNoise bunları Accept-Encoding'e göre doğrudan sunar. "
+        "`npm run build` sonrasında çalıştırılmalı."
+    )
+
+    def handle(self, *args, **options):
+        compressor = Compressor(quiet=True)
+        count = 0
+        for directory, _, files in os.walk(settings.WHITENOISE_ROOT):
+            for name in files:
+                if compressor.should_compress(name):
+                    count += len(list(compressor.compress(os.path.join(directory, name))))
+        self.stdout.write(self.style.SUCCESS(f"{count} sıkıştırılmış dosya yazıldı."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notes.similarity import backfill_signatures
+
+
+class Command(BaseCommand):
+    help = "Benzerlik indeksi için imzası eksik veya eski olan notların MinHash imzalarını hesaplar."
+
+    def handle(self, *args, **options):
+        count = backfill_signatures()
+        self.stdout.write(self.style.SUCCESS(f"{count} notun imzası hesaplandı."))
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from notes.purge import purge_expired, run_pending_purges
+from notes.versioning import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Bekleyen 'çöpü boşalt' işlerini çalıştırır ve saklama süresi dolan "
+        "notları parça parça kalıcı olarak siler; eski silme kayıtlarını temizler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int,
+            help=f"Saklama süresi (gün). Varsayılan: TRASH_RETENTION_DAYS ({settings.TRASH_RETENTION_DAYS}).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int,
+            help=f"Parça başına not sayısı. Varsayılan: {settings.TRASH_PURGE_CHUNK_SIZE}.",
+        )
+        parser.add_argument(
+            "--loop", type=int, metavar="SANIYE",
+            help="Tek seferlik çalışmak yerine bu aralıkla sürekli çalış (worker olarak).",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            jobs = run_pending_purges(options["chunk_size"])
+            expired = purge_expired(options["days"], options["chunk_size"])
+            tombstones = prune_tombstones()
+            if jobs or expired or tombstones or not options["loop"]:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{jobs} not boşaltma işleriyle, {expired} not saklama süresi dolduğu için silindi; "
+                    f"{tombstones} eski silme kaydı temizlendi."
+                ))
+            if not options["loop"]:
+                return
+            connections.close_all()
+            time.sleep(options["loop"])
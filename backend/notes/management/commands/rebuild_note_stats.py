@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.models import Note
+from notes.stats import rebuild
+
+
+class Command(BaseCommand):
+    help = "Not istatistik sayaçlarını notlardan sıfırdan hesaplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Sadece bu kullanıcı adı için hesapla.")
+
+    def handle(self, *args, **options):
+        if options["user"]:
+            try:
+                owner_ids = [User.objects.get(username=options["user"]).pk]
+            except User.DoesNotExist:
+                raise CommandError(f"Kullanıcı bulunamadı: {options['user']}")
+        else:
+            owner_ids = Note.objects.values_list("owner_id", flat=True).distinct()
+
+        count = 0
+        for owner_id in owner_ids:
+            rebuild(owner_id)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"{count} kullanıcının istatistikleri yeniden hesaplandı."))
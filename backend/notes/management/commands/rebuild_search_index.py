@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from notes.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Not arama indeksini (SQLite FTS5 / PostgreSQL tsvector) sıfırdan oluşturur."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options["database"])
+        backend.create_index()
+        backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Arama indeksi yeniden oluşturuldu ({type(backend).__name__})."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from notes.content import render_all
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = "Notların temizlenmiş HTML, özet ve kelime/karakter sayısı alanlarını parça parça yeniden hesaplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--only-missing", action="store_true",
+            help="Sadece henüz hesaplanmamış (content_html boş) notları işle.",
+        )
+
+    def handle(self, *args, **options):
+        count = render_all(Note, batch_size=options["batch_size"], only_missing=options["only_missing"])
+        self.stdout.write(self.style.SUCCESS(f"{count} notun içeriği işlendi."))
@@ -0,0 +1,53 @@
+import re
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from notes.benchmarks.data import seed_dataset
+from notes.bulk import purge_notes
+from notes.models import Note
+
+
+class Command(BaseCommand):
+    help = (
+        "Yük testleri için deterministik sentetik veri üretir: `{prefix}{i}` "
+        "kullanıcıları (parola: kullanıcı adı), kategoriler, etiketli notlar ve API token'ları."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--notes-per-user", type=int, default=1000)
+        parser.add_argument("--tags-per-note", type=int, default=3)
+        parser.add_argument("--tag-pool", type=int, default=50)
+        parser.add_argument("--categories", type=int, default=5, help="Kullanıcı başına kategori sayısı.")
+        parser.add_argument("--content-words", type=int, default=200)
+        parser.add_argument("--trashed-ratio", type=float, default=0.1)
+        parser.add_argument("--shared-ratio", type=float, default=0.02)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="loadtest")
+        parser.add_argument(
+            "--replace", action="store_true",
+            help="Aynı önekle oluşturulmuş kullanıcıları ve notlarını önce sil.",
+        )
+
+    def handle(self, *args, prefix, replace, **options):
+        existing = User.objects.filter(username__regex=rf"^{re.escape(prefix)}[0-9]+$")
+        if existing.exists():
+            if not replace:
+                raise CommandError(f"'{prefix}' önekli kullanıcılar zaten var; --replace ile yeniden oluşturun.")
+            # Notlar collector yerine parça parça silinir (bkz. notes/purge.py)
+            note_ids = list(Note.objects.filter(owner__in=existing).values_list("pk", flat=True))
+            for start in range(0, len(note_ids), 1000):
+                purge_notes(note_ids[start:start + 1000])
+            existing.delete()
+
+        options = {key: options[key] for key in (
+            "users", "notes_per_user", "tags_per_note", "tag_pool", "categories",
+            "content_words", "trashed_ratio", "shared_ratio", "seed",
+        )}
+        with transaction.atomic():
+            owners = seed_dataset(prefix=prefix, **options)
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(owners)} kullanıcı için {len(owners) * options['notes_per_user']} not oluşturuldu."
+        ))
@@ -0,0 +1,71 @@
+from django.db import migrations
+
+# notes/search.py'deki indeksin bu migration anındaki hali; uygulama kodu
+# değişse de migration aynı tabloyu kurar.
+SQLITE_TABLE = "notes_note_fts"
+POSTGRES_TABLE = "notes_note_search"
+
+TAGGED_NAMES_SQL = """
+    FROM taggit_taggeditem ti
+    JOIN taggit_tag t ON t.id = ti.tag_id
+    JOIN django_content_type ct ON ct.id = ti.content_type_id
+    WHERE ct.app_label = 'notes' AND ct.model = 'note' AND ti.object_id = n.id
+"""
+
+POSTGRES_DOCUMENT_SQL = (
+    "setweight(to_tsvector('simple', n.title), 'A') || "
+    f"setweight(to_tsvector('simple', COALESCE((SELECT string_agg(t.name, ' ') {TAGGED_NAMES_SQL}), '')), 'B') || "
+    "setweight(to_tsvector('simple', COALESCE(n.content, '')), 'C')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    with schema_editor.connection.cursor() as cursor:
+        if vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} "
+                "USING fts5(title, content, tags, tokenize='unicode61 remove_diacritics 2')"
+            )
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, title, content, tags) "
+                "SELECT n.id, n.title, COALESCE(n.content, ''), "
+                f"COALESCE((SELECT group_concat(t.name, ' ') {TAGGED_NAMES_SQL}), '') "
+                "FROM notes_note n"
+            )
+        elif vendor == "postgresql":
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+                "note_id bigint PRIMARY KEY REFERENCES notes_note (id) ON DELETE CASCADE "
+                "DEFERRABLE INITIALLY DEFERRED, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {POSTGRES_TABLE}_document_gin "
+                f"ON {POSTGRES_TABLE} USING gin (document)"
+            )
+            cursor.execute(f"DELETE FROM {POSTGRES_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_TABLE} (note_id, document) "
+                f"SELECT n.id, {POSTGRES_DOCUMENT_SQL} FROM notes_note n"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    table = {"sqlite": SQLITE_TABLE, "postgresql": POSTGRES_TABLE}.get(schema_editor.connection.vendor)
+    if table:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('notes', '0002_alter_note_options_rename_is_public_note_is_private_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
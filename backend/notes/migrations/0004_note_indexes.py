@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-18 07:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0003_note_search_index'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['owner', '-is_pinned', 'order', '-updated_at'], name='note_active_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['owner', '-updated_at'], name='note_trash_owner_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='note',
+            constraint=models.UniqueConstraint(condition=models.Q(('share_uuid__isnull', False)), fields=('share_uuid',), name='note_share_uuid_unique'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:00
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def contribution(row):
+    """
+    notes/stats.py'deki `contribution`ın bu migration anındaki hali.
+    """
+    if row['is_deleted']:
+        return Counter({'trashed': 1})
+    counts = Counter({
+        'total': 1,
+        'pinned': int(row['is_pinned']),
+        'shared': int(row['is_shared']),
+        'private': int(row['is_private']),
+        'chars': len(row['content'] or ''),
+        f"category:{row['category_id'] or 'none'}": 1,
+    })
+    if row['created_at']:
+        counts[f"day:{timezone.localdate(row['created_at']).isoformat()}"] = 1
+    return counts
+
+
+def backfill_counters(apps, schema_editor):
+    Note = apps.get_model('notes', 'Note')
+    NoteStatCounter = apps.get_model('notes', 'NoteStatCounter')
+    totals = {}
+    rows = Note.objects.values(
+        'owner_id', 'is_deleted', 'is_pinned', 'is_shared', 'is_private', 'category_id', 'content', 'created_at',
+    )
+    for row in rows.iterator(chunk_size=2000):
+        totals.setdefault(row['owner_id'], Counter()).update(contribution(row))
+    NoteStatCounter.objects.bulk_create([
+        NoteStatCounter(owner_id=owner_id, key=key, value=value)
+        for owner_id, counts in totals.items()
+        for key, value in counts.items() if value
+    ], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0005_collection_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteStatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('value', models.BigIntegerField(default=0)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='note_stat_counters', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('owner', 'key'), name='note_stat_counter_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
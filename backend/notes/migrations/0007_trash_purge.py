@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:09
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_deleted_at(apps, schema_editor):
+    # Çöpe atılma zamanı bilinmiyor; son güncellenme zamanı kullanılırsa eski
+    # notlar ilk `purge_trash`'te hiç bekleme süresi olmadan silinir. Saklama
+    # süresi bu migration'ın çalıştığı andan başlar.
+    Note = apps.get_model('notes', 'Note')
+    Note.objects.filter(is_deleted=True, deleted_at__isnull=True).update(deleted_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0006_note_stat_counter'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrashPurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cutoff', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('purged', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['deleted_at'], name='note_trash_deleted_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='trashpurge',
+            name='owner',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trash_purges', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
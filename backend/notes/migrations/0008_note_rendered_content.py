@@ -0,0 +1,128 @@
+# Generated by Django 5.2.7 on 2026-10-18 08:12
+
+import html
+import re
+from html.parser import HTMLParser
+
+from bleach.sanitizer import Cleaner
+from django.db import migrations, models
+
+# notes/content.py'deki işlemenin bu migration anındaki hali; uygulama kodu
+# değişse de migration aynı değerleri üretir. Sonraki değişiklikler için
+# `manage.py render_note_content` kullanılır.
+EXCERPT_LENGTH = 200
+ALLOWED_TAGS = ['p', 'strong', 'em', 'ul', 'ol', 'li', 'br', 'h1', 'h2', 'a', 'img']
+ALLOWED_ATTRIBUTES = {'*': ['class'], 'a': ['href', 'title'], 'img': ['src', 'alt', 'style']}
+ALLOWED_PROTOCOLS = ['http', 'https', 'mailto', 'data']
+ESCAPED_TAG_RE = re.compile(r'\s*&lt;/?[a-zA-Z][a-zA-Z0-9]*(\s|/?&gt;)')
+BLOCK_TAGS = {'p', 'br', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'div', 'blockquote', 'pre'}
+
+try:
+    from bleach.css_sanitizer import CSSSanitizer
+    css_sanitizer = CSSSanitizer(allowed_css_properties=['width', 'height', 'float'])
+except ImportError:
+    css_sanitizer = None
+
+
+def allow_attribute(tag, name, value):
+    allowed = ALLOWED_ATTRIBUTES.get(tag, []) + ALLOWED_ATTRIBUTES['*']
+    if name not in allowed or (name == 'style' and css_sanitizer is None):
+        return False
+    if name in ('href', 'src'):
+        uri = re.sub(r'[`\000-\040\177-\240\s]+', '', html.unescape(value)).lower()
+        if uri.startswith('data:'):
+            return tag == 'img' and uri.startswith('data:image/')
+    return True
+
+
+class TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append(' ')
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def render(cleaner, content):
+    content = content or ''
+    # Sadece tamamı escape edilmiş eski içerik çözülür; metindeki "&lt;b&gt;" kalır
+    if '<' not in content and ESCAPED_TAG_RE.match(content):
+        content = html.unescape(content)
+    content_html = cleaner.clean(content)
+    parser = TextExtractor()
+    parser.feed(content_html)
+    parser.close()
+    text = ' '.join(''.join(parser.parts).split())
+    excerpt = text
+    if len(text) > EXCERPT_LENGTH:
+        cut = text[:EXCERPT_LENGTH - 1]
+        if ' ' in cut:
+            cut = cut.rsplit(' ', 1)[0]
+        excerpt = cut.rstrip() + '…'
+    return {
+        'content_html': content_html,
+        'excerpt': excerpt,
+        'word_count': len(text.split()),
+        'char_count': len(text),
+    }
+
+
+def backfill_rendered_content(apps, schema_editor):
+    Note = apps.get_model('notes', 'Note')
+    cleaner = Cleaner(
+        tags=ALLOWED_TAGS,
+        attributes=allow_attribute,
+        protocols=ALLOWED_PROTOCOLS,
+        strip=True,
+        css_sanitizer=css_sanitizer,
+    )
+    notes = Note.objects.order_by('pk').only('pk', 'content')
+    last_pk = 0
+    while True:
+        batch = list(notes.filter(pk__gt=last_pk)[:500])
+        if not batch:
+            return
+        for note in batch:
+            for name, value in render(cleaner, note.content).items():
+                setattr(note, name, value)
+        Note.objects.bulk_update(batch, ['content_html', 'excerpt', 'word_count', 'char_count'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0007_trash_purge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='note',
+            name='char_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_rendered_content, migrations.RunPython.noop),
+    ]
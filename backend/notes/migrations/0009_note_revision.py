@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:05
+
+import hashlib
+import zlib
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_revisions(apps, schema_editor):
+    """
+    Her not için ilk snapshot; kodlama notes/revisions.py'deki
+    `checksum` / `encode_snapshot`ın bu migration anındaki hali.
+    """
+    Note = apps.get_model('notes', 'Note')
+    NoteRevision = apps.get_model('notes', 'NoteRevision')
+    notes = Note.objects.order_by('pk').values_list('pk', 'title', 'content', 'updated_at')
+    last_pk = 0
+    while True:
+        batch = list(notes.filter(pk__gt=last_pk)[:500])
+        if not batch:
+            return
+        NoteRevision.objects.bulk_create([
+            NoteRevision(
+                note_id=note_id, number=1, created_at=updated_at, title=title, is_snapshot=True, depth=0,
+                data=zlib.compress(content.encode('utf-8')),
+                checksum=hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest(),
+                length=len(content),
+            )
+            for note_id, title, content, updated_at in batch
+        ])
+        last_pk = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0008_note_rendered_content'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('title', models.CharField(max_length=200)),
+                ('is_snapshot', models.BooleanField(default=False)),
+                ('depth', models.PositiveSmallIntegerField(default=0)),
+                ('data', models.BinaryField()),
+                ('checksum', models.CharField(max_length=16)),
+                ('length', models.PositiveIntegerField(default=0)),
+                ('note', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='notes.note')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('note', 'number'), name='note_revision_number_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_revisions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0010_note_category_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NoteSignature',
+            fields=[
+                ('note', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='notes.note')),
+                ('version', models.BigIntegerField()),
+                ('data', models.BinaryField()),
+                ('tokens', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
+from django.utils import timezone
 from taggit.managers import TaggableManager
 
 class Category(models.Model):
@@ -13,18 +15,175 @@ class Category(models.Model):
 class Note(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField(blank=True)
+    # content'ten kayıt anında türetilen alanlar (bkz. notes/content.py)
+    content_html = models.TextField(blank=True, editable=False) # Temizlenmiş HTML
+    excerpt = models.CharField(max_length=200, blank=True, editable=False) # Düz metin özet
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    char_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_pinned = models.BooleanField(default=False)
     is_private = models.BooleanField(default=False)
     is_deleted = models.BooleanField(default=False) # Çöp kutusu için
+    deleted_at = models.DateTimeField(null=True, blank=True) # Çöpe atılma zamanı (saklama süresi için)
     is_shared = models.BooleanField(default=False) # Paylaşım için
     share_uuid = models.UUIDField(null=True, blank=True) # Paylaşım linki için
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notes')
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='notes')
     order = models.PositiveIntegerField(default=0) # Sürükle bırak için sıralama
+    version = models.BigIntegerField(default=0) # Son değişiklikteki koleksiyon sürümü (bkz. CollectionVersion)
     
     tags = TaggableManager(blank=True) # Etiketler
 
+    class Meta:
+        indexes = [
+            # Not listesi: owner + is_deleted=False, sıralama -is_pinned, order, -updated_at
+            models.Index(
+                fields=['owner', '-is_pinned', 'order', '-updated_at'],
+                condition=Q(is_deleted=False),
+                name='note_active_owner_idx',
+            ),
+            # Kategoriye göre liste: ?category=<id|none>, aynı sıralama
+            models.Index(
+                fields=['owner', 'category', '-is_pinned', 'order', '-updated_at'],
+                condition=Q(is_deleted=False),
+                name='note_active_category_idx',
+            ),
+            # Artımlı senkronizasyon: ?since=<version>
+            models.Index(fields=['owner', 'version'], name='note_owner_version_idx'),
+            # Çöp kutusu: owner + is_deleted=True, sıralama -updated_at
+            models.Index(
+                fields=['owner', '-updated_at'],
+                condition=Q(is_deleted=True),
+                name='note_trash_owner_idx',
+            ),
+            # Saklama süresi dolan notlar: is_deleted=True, deleted_at < sınır
+            models.Index(
+                fields=['deleted_at'],
+                condition=Q(is_deleted=True),
+                name='note_trash_deleted_at_idx',
+            ),
+        ]
+        constraints = [
+            # Paylaşım linki araması; her paylaşım UUID'si tekil olmalı
+            models.UniqueConstraint(
+                fields=['share_uuid'],
+                condition=Q(share_uuid__isnull=False),
+                name='note_share_uuid_unique',
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class CollectionVersion(models.Model):
+    """
+    Kullanıcının not/kategori/etiket koleksiyonu için artan sürüm sayacı.
+    Her yazma işleminde artırılır; ETag ve ?since= senkronizasyonu buna dayanır.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='collection_version')
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Bu sürüme kadarki silme kayıtları (NoteTombstone) temizlendi; daha eski
+    # bir ?since= ile gelen istemci listeyi baştan çekmelidir
+    tombstones_pruned = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user} v{self.version}"
+
+
+class NoteTombstone(models.Model):
+    """
+    Kalıcı olarak silinen notun kaydı. Satırı kalmayan notlar ?since=
+    yanıtında `deleted` olarak döner; NOTE_TOMBSTONE_RETENTION_DAYS günden
+    eskiler `manage.py purge_trash` ile silinir (bkz. notes/versioning.py).
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='note_tombstones')
+    note_id = models.BigIntegerField()
+    version = models.BigIntegerField() # Silmenin yapıldığı koleksiyon sürümü
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['owner', 'version'], name='note_tombstone_owner_version'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} #{self.note_id} v{self.version}"
+
+
+
+class NoteStatCounter(models.Model):
+    """
+    Kullanıcı bazlı not istatistik sayaçları (toplam, sabitlenen, kategori,
+    gün vb.). notes/stats.py içinde sinyallerle artımlı olarak güncellenir.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='note_stat_counters')
+    key = models.CharField(max_length=64) # Örn: "total", "category:3", "day:2025-12-27"
+    value = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'key'], name='note_stat_counter_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner} {self.key}={self.value}"
+
+
+class TrashPurge(models.Model):
+    """
+    "Çöpü boşalt" isteği. Notlar istek içinde silinmez; cutoff anına kadar
+    çöpe atılmış notlar arka planda parça parça silinir (notes/purge.py).
+    İş bitene kadar bu notlar çöp kutusunda gösterilmez.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='trash_purges')
+    cutoff = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    purged = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.owner} çöp boşaltma #{self.pk}"
+
+
+class NoteRevision(models.Model):
+    """
+    Notun başlık/içerik geçmişi. Her SNAPSHOT_INTERVAL revizyonda bir tam
+    içerik (snapshot), arada bir önceki revizyona göre sıkıştırılmış fark
+    (delta) saklanır; bir revizyon en yakın snapshot'tan başlanarak
+    kurulur (bkz. notes/revisions.py).
+    """
+    note = models.ForeignKey(Note, on_delete=models.CASCADE, related_name='revisions')
+    number = models.PositiveIntegerField() # Not içinde artan revizyon numarası
+    created_at = models.DateTimeField(default=timezone.now)
+    title = models.CharField(max_length=200)
+    is_snapshot = models.BooleanField(default=False)
+    depth = models.PositiveSmallIntegerField(default=0) # Son snapshot'tan bu yana delta sayısı
+    data = models.BinaryField() # zlib: snapshot ise içerik, delta ise işlem listesi (JSON)
+    checksum = models.CharField(max_length=16) # Kurulan içeriğin özeti
+    length = models.PositiveIntegerField(default=0) # İçeriğin karakter sayısı
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['note', 'number'], name='note_revision_number_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.note_id} r{self.number}"
+
+
+class NoteSignature(models.Model):
+    """
+    Notun benzerlik imzası (MinHash, bkz. notes/similarity.py). İmza
+    notun `version` değerinde hesaplanmıştır; not sonradan değiştiyse
+    benzerlik indeksi yenilenirken tekrar hesaplanır.
+    """
+    note = models.OneToOneField(Note, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    version = models.BigIntegerField()
+    data = models.BinaryField() # SIMILARITY_NUM_PERM adet uint32
+    tokens = models.PositiveIntegerField(default=0) # imzalanan kelime kümesinin boyu
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.note_id} v{self.version}"
@@ -0,0 +1,117 @@
+"""
+Sürükle-bırak sıralaması için toplu güncelleme yardımcıları.
+
+Sıra değerleri aralıklı (ORDER_GAP) tutulur; böylece bir notu iki not
+arasına taşımak çoğu zaman sadece o notun `order` alanını değiştirir.
+Aralık kalmadığında kullanıcının notları tek bir UPDATE ile yeniden
+numaralandırılır. Güncellemeler sadece `order` sütununa dokunur,
+`updated_at` değişmez; koleksiyon sürümü artırılır.
+"""
+from django.db import transaction
+from django.db.models import Case, Max, Min, When, Value, PositiveIntegerField
+
+from .events import emit
+from .models import Note
+from .versioning import bump_version
+
+ORDER_GAP = 1024
+
+# Notların ekranda görünen sıralaması
+DISPLAY_ORDERING = ('-is_pinned', 'order', '-updated_at', 'id')
+
+
+class OrderingError(Exception):
+    """
+    Taşıma konumu geçersiz (bilinmeyen veya taşınan notun kendisi olan komşu).
+    """
+
+
+def set_orders(owner, orders):
+    """
+    {note_id: order} eşlemesini tek bir CASE WHEN UPDATE ile uygular.
+    """
+    if not orders:
+        return 0
+    whens = [When(id=note_id, then=Value(order)) for note_id, order in orders.items()]
+    version = bump_version(owner.pk)
+    updated = Note.objects.filter(owner=owner, id__in=list(orders)).update(
+        order=Case(*whens, output_field=PositiveIntegerField()),
+        version=version,
+    )
+    emit(owner.pk, 'notes.reordered', count=updated, version=version)
+    return updated
+
+
+def spaced(ids):
+    return {note_id: (index + 1) * ORDER_GAP for index, note_id in enumerate(ids)}
+
+
+@transaction.atomic
+def apply_full_order(owner, ordered_ids):
+    """
+    Verilen id listesini baştan sona sıralar. Kullanıcıya ait olmayan ve
+    çöpteki id'ler yok sayılır, sadece değeri değişen notlar güncellenir.
+    """
+    current = dict(
+        Note.objects.filter(owner=owner, is_deleted=False, id__in=ordered_ids).values_list('id', 'order')
+    )
+    owned = [note_id for note_id in dict.fromkeys(ordered_ids) if note_id in current]
+    changed = {
+        note_id: order for note_id, order in spaced(owned).items()
+        if current[note_id] != order
+    }
+    set_orders(owner, changed)
+    return changed
+
+
+@transaction.atomic
+def move_note(owner, note_id, after_id=None, before_id=None):
+    """
+    Notu `after_id` ile `before_id` arasına taşır ve yeni sıra
+    değerlerini döner. Taşınan not kullanıcıya ait değilse
+    Note.DoesNotExist, komşulardan biri bulunamazsa OrderingError
+    fırlatılır. Komşulardan sadece biri verilirse diğeri o notun sıradaki
+    (veya önceki) komşusudur.
+    """
+    if note_id in (after_id, before_id):
+        raise OrderingError("Not kendisine göre taşınamaz.")
+    wanted = {i for i in (note_id, after_id, before_id) if i is not None}
+    notes = Note.objects.filter(owner=owner, is_deleted=False)
+    rows = dict(notes.select_for_update().filter(id__in=wanted).values_list('id', 'order'))
+    if note_id not in rows:
+        raise Note.DoesNotExist
+    if set(rows) != wanted:
+        raise OrderingError("Komşu not bulunamadı.")
+
+    low = rows.get(after_id)
+    high = rows.get(before_id)
+    others = notes.exclude(id=note_id)
+    if low is not None and high is None:
+        high = others.filter(order__gt=low).aggregate(order=Min('order'))['order']
+    elif high is not None and low is None:
+        low = others.filter(order__lt=high).aggregate(order=Max('order'))['order']
+    if low is not None and high is not None:
+        new_order = (low + high) // 2 if high - low > 1 else None
+    elif low is not None:
+        new_order = low + ORDER_GAP
+    elif high is not None:
+        new_order = high // 2 if high > 0 else None
+    else:
+        new_order = rows[note_id]
+
+    if new_order is not None:
+        if new_order != rows[note_id]:
+            set_orders(owner, {note_id: new_order})
+        return {note_id: new_order}
+
+    # Aralık kalmadı: görünen sırayı koruyarak herkesi yeniden aralıklandır
+    current = dict(
+        Note.objects.filter(owner=owner, is_deleted=False)
+        .order_by(*DISPLAY_ORDERING).values_list('id', 'order')
+    )
+    ids = [i for i in current if i != note_id]
+    position = ids.index(after_id) + 1 if after_id is not None else ids.index(before_id)
+    ids.insert(position, note_id)
+    changed = {i: order for i, order in spaced(ids).items() if current[i] != order}
+    set_orders(owner, changed)
+    return changed
@@ -0,0 +1,147 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Sorgu setinin kendi sıralamasına göre çalışan imleç (keyset) sayfalama.
+
+    İmleç, son satırın sıralama alanlarındaki değerlerini ve id'sini taşır;
+    sonraki sayfa bu değerlerden "sonra gelen" satırlar filtrelenerek alınır.
+    Böylece sayfa ne kadar ileride olursa olsun OFFSET taraması yapılmaz ve
+    araya yeni not eklense bile sayfalar kaymaz.
+
+    Sayfalama isteğe bağlıdır: `cursor` veya `page_size` verilmezse liste
+    eskisi gibi tek seferde döner (mevcut istemciler dizi bekliyor).
+    Sıralamada model alanı olmayan bir ifade varsa (ör. arama `search_rank`)
+    imleç, ofset tabanlı konuma düşer.
+    """
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 50
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound("Geçersiz imleç.")
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, separators=(",", ":"), default=str)
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+    def get_ordering(self, queryset):
+        """
+        Sıralamayı (alan, azalan mı) çiftlerine çevirir; sona id eklenir ki
+        sıralama her zaman tekil olsun.
+        """
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        pairs = [(name.lstrip("-"), name.startswith("-")) for name in ordering]
+        if not any(name in ("id", "pk") for name, _ in pairs):
+            pairs.append(("id", False))
+        return pairs
+
+    def is_keyset_ordering(self, queryset, ordering):
+        for name, _ in ordering:
+            if name == "pk":
+                continue
+            try:
+                queryset.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return False
+        return True
+
+    def keyset_filter(self, queryset, ordering, values):
+        """
+        (a, b, c) > (va, vb, vc) karşılaştırmasını Q ifadelerine açar.
+        """
+        condition = Q()
+        equal = Q()
+        for (name, descending), value in zip(ordering, values):
+            field = queryset.model._meta.get_field("id" if name == "pk" else name)
+            try:
+                value = field.to_python(value)
+            except ValidationError:
+                raise NotFound("Geçersiz imleç.")
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return queryset.filter(condition)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        self.keyset = self.is_keyset_ordering(queryset, self.ordering)
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        if not self.keyset:
+            try:
+                offset = max(0, int(position.get("o", 0) if isinstance(position, dict) else 0))
+            except (TypeError, ValueError):
+                raise NotFound("Geçersiz imleç.")
+            rows = list(queryset[offset:offset + page_size + 1])
+            self.next_position = {"o": offset + page_size} if len(rows) > page_size else None
+            return rows[:page_size]
+
+        if position is not None:
+            values = position.get("v") if isinstance(position, dict) else None
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise NotFound("Geçersiz imleç.")
+            queryset = self.keyset_filter(queryset, self.ordering, values)
+
+        rows = list(queryset[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_position = None
+        if has_next:
+            last = rows[-1]
+            self.next_position = {"v": [getattr(last, name) for name, _ in self.ordering]}
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ("next", self.get_next_link()),
+            ("results", data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
@@ -0,0 +1,76 @@
+"""
+Paylaşılan (public) notlar için önbellek.
+
+Herkese açık linkler yoğun trafik alabildiğinden serializer çıktısı
+share_uuid anahtarıyla önbellekte tutulur. Not düzenlendiğinde, paylaşımı
+kapatıldığında, çöpe atıldığında veya etiketleri değiştiğinde kayıt
+notes/signals.py üzerinden silinir.
+
+Silme sadece bu sürecin önbelleğine ulaşabilir (CACHES yerel bellekteyse
+diğer worker'lar haberdar olmaz). Bu yüzden önbellekteki kayıt notun
+`version` değeriyle birlikte tutulur ve her istekte tek bir indeksli
+sorguyla notun hâlâ paylaşımda olduğu ve sürümünün aynı olduğu doğrulanır;
+paylaşımı kapatılan, gizlenen veya çöpe atılan not hiçbir worker'da
+sunulmaz. Kazanç serileştirme, etiket ve sahip sorgularından gelir.
+"""
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Note
+from .serializers import PublicNoteSerializer
+
+def cache_key(share_uuid):
+    return f"notes:public:{share_uuid}"
+
+
+def public_queryset():
+    return Note.objects.filter(
+        is_shared=True, is_deleted=False, share_uuid__isnull=False
+    ).select_related('owner').prefetch_related('tags')
+
+
+def render_public_note(share_uuid):
+    note = public_queryset().filter(share_uuid=share_uuid).first()
+    if note is None:
+        return None
+    body = json.dumps(PublicNoteSerializer(note).data, cls=DjangoJSONEncoder, sort_keys=True)
+    # Önbellekte serializer'a özgü tipler (ör. TagList) değil düz JSON verisi tutulur
+    return {
+        'data': json.loads(body),
+        'etag': '"%s"' % hashlib.sha1(body.encode('utf-8')).hexdigest(),
+        'version': note.version,
+    }
+
+
+def get_public_note(share_uuid):
+    """
+    {'data': ..., 'etag': ..., 'version': ...} veya not yoksa None döner.
+    """
+    try:
+        share_uuid = uuid.UUID(str(share_uuid))
+    except ValueError:
+        return None
+    key = cache_key(share_uuid)
+    payload = cache.get(key)
+    if payload is not None:
+        version = Note.objects.filter(
+            share_uuid=share_uuid, is_shared=True, is_deleted=False,
+        ).values_list('version', flat=True).first()
+        if version is None:
+            return None
+        if payload.get('version') == version:
+            return payload
+    payload = render_public_note(share_uuid)
+    if payload is not None:
+        cache.set(key, payload, settings.PUBLIC_NOTE_CACHE_TTL)
+    return payload
+
+
+def invalidate_public_note(share_uuid):
+    if share_uuid:
+        cache.delete(cache_key(share_uuid))
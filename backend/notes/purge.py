@@ -0,0 +1,110 @@
+"""
+Çöp kutusunun kalıcı olarak temizlenmesi.
+
+Django'nun collector'ı tüm notları ve etiket bağlantılarını belleğe
+yükleyerek sildiği için büyük bir çöp kutusu tek seferde silinirse worker
+zaman aşımına uğrayabilir ve SQLite uzun süre kilitlenebilir. Bunun yerine:
+
+- "Çöpü boşalt" bir TrashPurge kaydı oluşturur. TRASH_PURGE_WORKER açıksa
+  iş süreç içi worker'da (veya `manage.py purge_trash` ile) arka planda,
+  kapalıysa (varsayılan) istek içinde çalıştırılır. Kapsanan notlar
+  (`covered_by_purge`) iş bitene kadar çöp kutusunda gösterilmez.
+- Notlar `TRASH_PURGE_CHUNK_SIZE`'lık parçalar halinde, her parça kendi
+  kısa transaction'ında `bulk.purge_notes` ile silinir.
+- `TRASH_RETENTION_DAYS` günden uzun süredir çöpte olan notlar
+  `manage.py purge_trash` ile (cron veya `--loop`) otomatik silinir.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, Exists, F, OuterRef, Q, Value
+from django.db.models.lookups import IsNull, LessThanOrEqual
+from django.utils import timezone
+
+from .bulk import purge_notes
+from .models import Note, TrashPurge
+from .workers import BackgroundWorker
+
+
+def pending_purges():
+    return TrashPurge.objects.filter(finished_at__isnull=True)
+
+
+def covered_by_purge(cutoff, deleted_at):
+    """
+    Bir boşaltma işinin kapsadığı notlar: cutoff anına kadar çöpe atılanlar
+    ve çöpe atılma zamanı bilinmeyenler (deleted_at alanından önce atılanlar).
+    Hem gösterimde hem silmede aynı koşul kullanılır.
+    """
+    return Q(LessThanOrEqual(deleted_at, cutoff)) | Q(IsNull(deleted_at, True))
+
+
+def exclude_pending(queryset):
+    """
+    Boşaltılmayı bekleyen notları sorgu setinden çıkarır (tek sorgu, EXISTS).
+    """
+    return queryset.exclude(Exists(pending_purges().filter(
+        covered_by_purge(F('cutoff'), OuterRef('deleted_at')), owner=OuterRef('owner'),
+    )))
+
+
+def purge_queryset(queryset, chunk_size=None):
+    """
+    Sorgu setindeki çöpteki notları parça parça siler; silinen sayıyı döner.
+    Her parça ayrı bir transaction olduğundan kilitler kısa sürer.
+    """
+    chunk_size = chunk_size or settings.TRASH_PURGE_CHUNK_SIZE
+    queryset = queryset.filter(is_deleted=True).order_by('pk')
+    total = 0
+    while True:
+        note_ids = list(queryset.values_list('pk', flat=True)[:chunk_size])
+        if not note_ids:
+            return total
+        total += purge_notes(note_ids, trashed_only=True)
+
+
+def request_purge(owner):
+    """
+    Kullanıcının şu ana kadar çöpe attığı notlar için boşaltma işi oluşturur;
+    worker kapalıysa işi hemen çalıştırır (`finished_at` dolu döner).
+    """
+    job = TrashPurge.objects.create(owner=owner, cutoff=timezone.now())
+    if settings.TRASH_PURGE_WORKER:
+        transaction.on_commit(worker.wake)
+    else:
+        run_purge(job)
+    return job
+
+
+def run_purge(job, chunk_size=None):
+    notes = Note.objects.filter(owner_id=job.owner_id).filter(
+        covered_by_purge(Value(job.cutoff, output_field=DateTimeField()), F('deleted_at'))
+    )
+    job.purged = purge_queryset(notes, chunk_size)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['purged', 'finished_at'])
+    return job.purged
+
+
+def run_pending_purges(chunk_size=None):
+    total = 0
+    for job in pending_purges().order_by('pk'):
+        total += run_purge(job, chunk_size)
+    return total
+
+
+def purge_expired(days=None, chunk_size=None):
+    """
+    Saklama süresini aşan notları siler. Süre 0/None ise hiçbir şey yapılmaz.
+    """
+    days = settings.TRASH_RETENTION_DAYS if days is None else days
+    if not days:
+        return 0
+    cutoff = timezone.now() - timedelta(days=days)
+    return purge_queryset(Note.objects.filter(deleted_at__lt=cutoff), chunk_size)
+
+
+# Süreç kapanırsa yarım kalan işler bir sonraki `wake` ya da
+# `manage.py purge_trash` ile tamamlanır
+worker = BackgroundWorker('trash-purge', run_pending_purges)
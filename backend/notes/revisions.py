@@ -0,0 +1,382 @@
+"""
+Not revizyon geçmişi.
+
+Başlık veya içerik her değiştiğinde bir NoteRevision kaydı eklenir. İçerik
+her seferinde tam olarak saklanmaz:
+- snapshot: içeriğin zlib ile sıkıştırılmış hali,
+- delta: bir önceki saklanan revizyona göre fark; işlem listesi
+  ([a, b] = önceki içerikten base[a:b] kopyala, metin = olduğu gibi ekle)
+  JSON olarak zlib ile sıkıştırılır.
+
+Fark, önce ortak baş/son kısım atılıp kalan bölümde HTML etiketi, kelime
+ve boşluk parçaları üzerinde SequenceMatcher ile hesaplanır. En fazla
+REVISION_SNAPSHOT_INTERVAL revizyonda bir (veya delta snapshot'tan büyükse)
+snapshot yazılır; böylece herhangi bir revizyon en fazla o kadar delta
+uygulanarak kurulur ve kurma süresi geçmişin uzunluğundan bağımsızdır.
+
+Eski revizyonlar `manage.py compact_revisions` ile (REVISION_COMPACT_WORKER
+açıksa süreç içi worker'da) seyreltilir (`compact_note`): yaşına göre
+REVISION_COALESCE_RULES aralığı başına bir revizyon tutulur,
+REVISION_RETENTION_DAYS günden eskiler silinir; en son revizyon her zaman
+kalır. Arası silinen revizyonların deltası yeniden hesaplanır.
+
+Toplu yollar (notes/bulk.py, notes/transfer.py) sinyal tetiklemediği için
+değişen notlara `record_snapshots` ile doğrudan snapshot ekler.
+"""
+import difflib
+import hashlib
+import json
+import re
+import threading
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from .content import plain_text, sanitize
+from .models import Note, NoteRevision
+from .workers import BackgroundWorker
+
+# HTML etiketi, kelime, boşluk veya tek noktalama işareti; her karakter
+# tam olarak bir parçaya düşer
+TOKEN_PATTERN = re.compile(r'<[^>]*>|\w+|\s+|[^\w\s]')
+
+# Bu uzunluktan kısa kopyalar ayrı işlem yerine metin olarak eklenir
+MIN_COPY_LENGTH = 8
+
+
+class RevisionError(Exception):
+    pass
+
+
+# --- KODLAMA ---
+def checksum(content):
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def encode_snapshot(content):
+    return zlib.compress(content.encode('utf-8'))
+
+
+def decode_snapshot(data):
+    return zlib.decompress(data).decode('utf-8')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text)
+
+
+def common_affix(base, target):
+    """
+    Ortak baş ve son kısmın uzunluklarını döner (üst üste binmeden).
+    """
+    limit = min(len(base), len(target))
+    prefix = 0
+    while prefix < limit and base[prefix] == target[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and base[-suffix - 1] == target[-suffix - 1]:
+        suffix += 1
+    return prefix, suffix
+
+
+def diff_ops(base, target):
+    """
+    base'den target'ı kuran işlem listesi.
+    """
+    prefix, suffix = common_affix(base, target)
+    ops = []
+
+    def copy(start, end):
+        if end - start < MIN_COPY_LENGTH:
+            insert(base[start:end])
+        elif ops and isinstance(ops[-1], list) and ops[-1][1] == start:
+            ops[-1][1] = end
+        else:
+            ops.append([start, end])
+
+    def insert(text):
+        if not text:
+            return
+        if ops and isinstance(ops[-1], str):
+            ops[-1] += text
+        else:
+            ops.append(text)
+
+    copy(0, prefix)
+    base_middle = base[prefix:len(base) - suffix]
+    target_middle = target[prefix:len(target) - suffix]
+    base_tokens, target_tokens = tokenize(base_middle), tokenize(target_middle)
+    if len(base_tokens) + len(target_tokens) > settings.REVISION_DIFF_MAX_TOKENS:
+        # Çok büyük değişiklik: eşleştirme yerine değişen bölümün tamamı yazılır
+        insert(target_middle)
+    else:
+        # Parçaların base içindeki karakter konumları
+        offsets = [prefix]
+        for token in base_tokens:
+            offsets.append(offsets[-1] + len(token))
+        # autojunk: çok sık geçen parçalar (boşluk, <p>) eşleşme başlatmaz;
+        # aksi halde uzun notlarda eşleştirme karesel süre alır
+        matcher = difflib.SequenceMatcher(None, base_tokens, target_tokens)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                copy(offsets[i1], offsets[i2])
+            else:
+                insert(''.join(target_tokens[j1:j2]))
+    copy(len(base) - suffix, len(base))
+    return ops
+
+
+def apply_ops(base, ops):
+    return ''.join(base[op[0]:op[1]] if isinstance(op, list) else op for op in ops)
+
+
+def encode_delta(base, target):
+    ops = diff_ops(base, target)
+    return zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def decode_delta(base, data):
+    return apply_ops(base, json.loads(zlib.decompress(data)))
+
+
+def encode(base, content, depth):
+    """
+    İçeriği önceki revizyona göre kodlar; (is_snapshot, depth, data) döner.
+    Önceki yoksa, zincir sınıra ulaştıysa veya delta daha büyükse snapshot.
+    """
+    snapshot = encode_snapshot(content)
+    if base is None or depth + 1 >= settings.REVISION_SNAPSHOT_INTERVAL:
+        return True, 0, snapshot
+    delta = encode_delta(base, content)
+    if len(delta) >= len(snapshot):
+        return True, 0, snapshot
+    return False, depth + 1, delta
+
+
+# --- OKUMA ---
+def reconstruct(note_id, number):
+    """
+    Revizyonu en yakın snapshot'tan başlayarak kurar; içerik `content`
+    özelliğine yazılır. Yoksa NoteRevision.DoesNotExist.
+    """
+    revisions = NoteRevision.objects.filter(note_id=note_id)
+    start = revisions.filter(number__lte=number, is_snapshot=True).order_by('-number').values('number')[:1]
+    chain = list(revisions.filter(number__lte=number, number__gte=Subquery(start)).order_by('number'))
+    if not chain or chain[-1].number != number:
+        raise NoteRevision.DoesNotExist
+    content = None
+    for revision in chain:
+        data = bytes(revision.data)
+        content = decode_snapshot(data) if revision.is_snapshot else decode_delta(content, data)
+    revision = chain[-1]
+    if checksum(content) != revision.checksum:
+        raise RevisionError(f"Revizyon {note_id}/{number} kurulamadı: özet uyuşmuyor.")
+    revision.content = content
+    return revision
+
+
+def word_diff(old, new):
+    """
+    İki içeriğin düz metni arasında kelime düzeyinde fark:
+    [{"op": "equal" | "insert" | "delete", "text": "..."}].
+    """
+    # Kelimeler ardından gelen boşlukla birlikte; bkz. diff_ops'taki autojunk notu
+    old_words = re.findall(r'\s+|\S+\s*', plain_text(sanitize(old)))
+    new_words = re.findall(r'\s+|\S+\s*', plain_text(sanitize(new)))
+    chunks = []
+    matcher = difflib.SequenceMatcher(None, old_words, new_words)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('delete', 'replace'):
+            chunks.append({'op': 'delete', 'text': ''.join(old_words[i1:i2])})
+        if tag in ('insert', 'replace'):
+            chunks.append({'op': 'insert', 'text': ''.join(new_words[j1:j2])})
+        if tag == 'equal':
+            chunks.append({'op': 'equal', 'text': ''.join(old_words[i1:i2])})
+    return chunks
+
+
+# --- YAZMA ---
+def latest_revision(note_id):
+    return NoteRevision.objects.filter(note_id=note_id).order_by('-number').first()
+
+
+def record_revision(note, previous_content=None, attempts=3):
+    """
+    Notun güncel başlık/içeriğini yeni revizyon olarak ekler; değişiklik
+    yoksa None döner. `previous_content` notun yüklendiği andaki içerik
+    ise son revizyonu kurmaya gerek kalmaz. Aynı notun eşzamanlı kaydı
+    aynı numarayı aldıysa son revizyon yeniden okunarak tekrar denenir.
+    """
+    content = note.content
+    digest = checksum(content)
+    for attempt in range(attempts):
+        latest = latest_revision(note.pk)
+        if latest is not None and latest.checksum == digest and latest.title == note.title:
+            return None
+
+        base = None
+        if latest is not None:
+            if latest.checksum == digest:
+                base = content
+            elif previous_content is not None and checksum(previous_content) == latest.checksum:
+                base = previous_content
+            elif latest.is_snapshot:
+                base = decode_snapshot(bytes(latest.data))
+            else:
+                base = reconstruct(note.pk, latest.number).content
+        is_snapshot, depth, data = encode(base, content, latest.depth if latest else 0)
+        try:
+            # Sadece INSERT transaction içinde: okuyup sonra yazan bir
+            # transaction SQLite'ta (DEFERRED) kilit yükseltirken düşebilir
+            with transaction.atomic():
+                revision = NoteRevision.objects.create(
+                    note_id=note.pk, number=latest.number + 1 if latest else 1,
+                    title=note.title, is_snapshot=is_snapshot, depth=depth, data=data,
+                    checksum=digest, length=len(content),
+                )
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+            continue
+        if revision.number % settings.REVISION_COMPACT_EVERY == 0:
+            schedule_compaction(note.pk)
+        return revision
+
+
+def record_snapshots(rows):
+    """
+    (note_id, title, content, created_at) satırları için toplu snapshot
+    ekler; son revizyonla aynı olanlar atlanır. Eklenen sayıyı döner.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    latest_number = NoteRevision.objects.filter(note_id=OuterRef('note_id')).order_by('-number').values('number')[:1]
+    latest = {
+        note_id: (number, title, digest)
+        for note_id, number, title, digest in NoteRevision.objects.filter(
+            note_id__in=[row[0] for row in rows], number=Subquery(latest_number),
+        ).values_list('note_id', 'number', 'title', 'checksum')
+    }
+    revisions = []
+    for note_id, title, content, created_at in rows:
+        number, latest_title, latest_checksum = latest.get(note_id, (0, None, None))
+        digest = checksum(content)
+        if digest == latest_checksum and title == latest_title:
+            continue
+        revisions.append(NoteRevision(
+            note_id=note_id, number=number + 1, created_at=created_at, title=title,
+            is_snapshot=True, depth=0, data=encode_snapshot(content), checksum=digest, length=len(content),
+        ))
+    NoteRevision.objects.bulk_create(revisions)
+    return len(revisions)
+
+
+# --- SEYRELTME ---
+def kept_revisions(revisions, now):
+    """
+    Tutulacak revizyonların id kümesi. Kurallar yaşa göre en uzundan
+    başlanarak uygulanır; her aralıkta en son revizyon kalır.
+    """
+    rules = sorted(settings.REVISION_COALESCE_RULES, reverse=True)
+    retention = settings.REVISION_RETENTION_DAYS
+    cutoff = now - timedelta(days=retention) if retention else None
+    buckets = {}
+    for revision in revisions:
+        if cutoff is not None and revision.created_at < cutoff:
+            continue
+        age = (now - revision.created_at).total_seconds()
+        rule = next(((min_age, interval) for min_age, interval in rules if age >= min_age), None)
+        key = revision.pk if rule is None else (rule, int(revision.created_at.timestamp()) // rule[1])
+        # Numara sırasıyla gezildiği için aralıktaki son revizyon kazanır
+        buckets[key] = revision.pk
+    kept = set(buckets.values())
+    kept.add(revisions[-1].pk)
+    return kept
+
+
+@transaction.atomic
+def compact_note(note_id, now=None):
+    """
+    Notun eski revizyonlarını seyreltir; silinen revizyon sayısını döner.
+    """
+    now = now or timezone.now()
+    revisions = list(NoteRevision.objects.select_for_update().filter(note_id=note_id).order_by('number'))
+    if not revisions:
+        return 0
+    kept = kept_revisions(revisions, now)
+    if len(kept) == len(revisions):
+        return 0
+
+    changed, removed = [], []
+    content = previous = None # zincirdeki bir önceki revizyonun ve tutulan son revizyonun içeriği
+    previous_depth = 0
+    predecessor_kept = False
+    for revision in revisions:
+        data = bytes(revision.data)
+        content = decode_snapshot(data) if revision.is_snapshot else decode_delta(content, data)
+        if revision.pk not in kept:
+            removed.append(revision.pk)
+            predecessor_kept = False
+            continue
+        if revision.is_snapshot:
+            depth = 0
+        elif predecessor_kept and previous_depth + 1 < settings.REVISION_SNAPSHOT_INTERVAL:
+            # Delta hâlâ bir önceki revizyona göre; sadece derinlik değişebilir
+            depth = previous_depth + 1
+        else:
+            revision.is_snapshot, depth, revision.data = encode(previous, content, previous_depth)
+            changed.append(revision)
+        if depth != revision.depth:
+            revision.depth = depth
+            if revision not in changed:
+                changed.append(revision)
+        previous, previous_depth, predecessor_kept = content, depth, True
+
+    NoteRevision.objects.filter(pk__in=removed).delete()
+    NoteRevision.objects.bulk_update(changed, ['is_snapshot', 'depth', 'data'])
+    return len(removed)
+
+
+def compactable_notes(now=None):
+    """
+    En kısa seyreltme yaşından eski revizyonu olan notların id'leri.
+    """
+    now = now or timezone.now()
+    min_age = min(min_age for min_age, _ in settings.REVISION_COALESCE_RULES)
+    return (
+        NoteRevision.objects.filter(created_at__lt=now - timedelta(seconds=min_age))
+        .values_list('note_id', flat=True).distinct().order_by('note_id')
+    )
+
+
+def compact_all(now=None):
+    return sum(compact_note(note_id, now) for note_id in compactable_notes(now).iterator())
+
+
+_pending = set()
+_pending_lock = threading.Lock()
+
+
+def schedule_compaction(note_id):
+    # Worker kapalıyken bekleyenler süreçte birikmesin; komut tüm notları tarar
+    if not settings.REVISION_COMPACT_WORKER:
+        return
+    with _pending_lock:
+        _pending.add(note_id)
+    transaction.on_commit(worker.wake)
+
+
+def compact_pending():
+    with _pending_lock:
+        note_ids = sorted(_pending)
+        _pending.clear()
+    return sum(compact_note(note_id) for note_id in note_ids if Note.objects.filter(pk=note_id).exists())
+
+
+# Süreç kapanırsa bekleyenler `manage.py compact_revisions` ile seyreltilir
+worker = BackgroundWorker('note-revisions', compact_pending)
@@ -0,0 +1,91 @@
+"""
+Okuma replikalarına yönlendirme.
+
+DATABASE_REPLICAS tanımlıysa güvenli (GET/HEAD/OPTIONS) isteklerdeki
+okumalar rastgele bir replikaya gider; diğer her şey (yazmalar,
+transaction içindeki okumalar, arka plan işleri, yönetim komutları)
+birincil veritabanını kullanır. Replikaya okuma izni istek bazında
+`ReplicaRoutingMiddleware` tarafından verilir.
+
+Read-your-writes: bir istemci yazma isteği yaptıktan sonra
+DATABASE_STICKY_SECONDS boyunca okumaları da birincilden yapılır; böylece
+replikalar geriden gelse bile kaydettiği notu listede görür. İstemci,
+kimlik doğrulama view'da yapıldığı için Authorization başlığı veya
+oturum çerezinin özetiyle tanınır; işaret önbellekte (çok worker'lı
+kurulumlarda REDIS_URL ile paylaşımlı) tutulur.
+"""
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Girişten hemen sonra yeni token replikada henüz olmayabilir; doğrulama
+# zaten önbellekli olduğu için (notes/authentication.py) birincilden okunur
+PRIMARY_MODELS = {'authtoken.token', 'authtoken.tokenproxy'}
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+@contextmanager
+def replica_reads(allowed=True):
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not settings.DATABASE_REPLICAS or not _replica_reads.get():
+            return None
+        if model._meta.label_lower in PRIMARY_MODELS:
+            return None
+        # Transaction içindeki okumalar yazmalarla aynı bağlantıyı görmeli
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replikalar birincilin kopyası; hepsi aynı veri
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+def client_key(request):
+    credential = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credential:
+        return None
+    return 'db-sticky:' + hashlib.sha256(credential.encode()).hexdigest()
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = client_key(request)
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if key and response.status_code < 400:
+                cache.set(key, True, settings.DATABASE_STICKY_SECONDS)
+            return response
+
+        # Yakın zamanda yazan istemci birincilden okur
+        sticky = key is not None and cache.get(key, False)
+        with replica_reads(not sticky):
+            return self.get_response(request)
@@ -0,0 +1,278 @@
+"""
+Not araması için tam metin indeksi.
+
+SQLite'ta FTS5 sanal tablosu, PostgreSQL'de tsvector + GIN indeksli yardımcı
+bir tablo kullanılır. İndeks, notes/signals.py içindeki sinyallerle Note
+kaydı/silinmesi ve etiket değişikliklerinde güncel tutulur. Diğer veritabanı
+motorlarında eski icontains araması kullanılır.
+"""
+import re
+
+from django.db import connections, transaction
+from django.db.models import Q, Value, FloatField
+
+SQLITE_TABLE = "notes_note_fts"
+POSTGRES_TABLE = "notes_note_search"
+
+# Aramada kullanılacak kelimeler (harf, rakam ve alt çizgi)
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Etiket adlarını not bazında toplayan ortak alt sorgu parçası
+TAGGED_NAMES_SQL = """
+    FROM taggit_taggeditem ti
+    JOIN taggit_tag t ON t.id = ti.tag_id
+    JOIN django_content_type ct ON ct.id = ti.content_type_id
+    WHERE ct.app_label = 'notes' AND ct.model = 'note' AND ti.object_id = n.id
+"""
+
+
+def tokenize(query):
+    return TOKEN_RE.findall(query or "")
+
+
+class BaseSearchBackend:
+    """
+    Arama motoru arayüzü. Alt sınıflar indeks tablosunu oluşturur,
+    günceller ve sorgu setini filtreler.
+    """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def create_index(self):
+        pass
+
+    def drop_index(self):
+        pass
+
+    def rebuild(self):
+        pass
+
+    def index_note(self, note_id, title, content, tags):
+        pass
+
+    def remove_note(self, note_id):
+        pass
+
+    def index_notes(self, entries):
+        """
+        [(note_id, title, content, tags), ...] için toplu indeksleme.
+        """
+        for entry in entries:
+            self.index_note(*entry)
+
+    def remove_notes(self, note_ids):
+        for note_id in note_ids:
+            self.remove_note(note_id)
+
+    def filter_queryset(self, queryset, query):
+        """
+        Sorgu setini aramaya göre filtreler ve `search_rank` ile işaretler.
+        Küçük `search_rank` daha alakalı sonuç demektir.
+        """
+        raise NotImplementedError
+
+
+class IcontainsSearchBackend(BaseSearchBackend):
+    """
+    İndeks desteği olmayan motorlar için eski substring araması.
+    """
+    def filter_queryset(self, queryset, query):
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(content__icontains=query) |
+            Q(tags__name__icontains=query)
+        ).distinct().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    FTS5 sanal tablosu. rowid olarak not id'si kullanılır.
+    """
+    # bm25 ağırlıkları: başlık, içerik, etiketler
+    RANK_SQL = f"bm25({SQLITE_TABLE}, 10.0, 1.0, 5.0)"
+
+    def create_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} "
+                "USING fts5(title, content, tags, tokenize='unicode61 remove_diacritics 2')"
+            )
+
+    def drop_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SQLITE_TABLE}")
+
+    def rebuild(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, title, content, tags) "
+                "SELECT n.id, n.title, COALESCE(n.content, ''), "
+                f"COALESCE((SELECT group_concat(t.name, ' ') {TAGGED_NAMES_SQL}), '') "
+                "FROM notes_note n"
+            )
+
+    def index_note(self, note_id, title, content, tags):
+        # Aynı notun eşzamanlı iki kaydı DELETE/INSERT'leri araya sokup aynı
+        # rowid'yi iki kez eklemesin
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = %s", [note_id])
+            cursor.execute(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)",
+                [note_id, title, content or "", " ".join(tags)],
+            )
+
+    def remove_note(self, note_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {SQLITE_TABLE} WHERE rowid = %s", [note_id])
+
+    def index_notes(self, entries):
+        entries = list(entries)
+        if not entries:
+            return
+        self.remove_notes([entry[0] for entry in entries])
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {SQLITE_TABLE} (rowid, title, content, tags) VALUES (%s, %s, %s, %s)",
+                [(note_id, title, content or "", " ".join(tags)) for note_id, title, content, tags in entries],
+            )
+
+    def remove_notes(self, note_ids):
+        note_ids = list(note_ids)
+        if not note_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {SQLITE_TABLE} WHERE rowid IN ({', '.join(['%s'] * len(note_ids))})",
+                note_ids,
+            )
+
+    @staticmethod
+    def build_match(tokens):
+        # Her kelime tırnak içinde önek araması olarak aranır: "kel"* "ime"*
+        return " ".join('"%s"*' % token.replace('"', '""') for token in tokens)
+
+    def filter_queryset(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        match = self.build_match(tokens)
+        # FTS tablosu sorgunun sürücü tablosu olsun diye doğrudan join ediliyor;
+        # ilişkili alt sorgu her satır için MATCH'i yeniden değerlendirirdi.
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[SQLITE_TABLE],
+            where=[f'{SQLITE_TABLE}.rowid = "{table}"."id"', f"{SQLITE_TABLE} MATCH %s"],
+            params=[match],
+            select={"search_rank": self.RANK_SQL},
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Ağırlıklandırılmış tsvector tutan yardımcı tablo ve GIN indeksi.
+    """
+    DOCUMENT_SQL = (
+        "setweight(to_tsvector('simple', %s), 'A') || "
+        "setweight(to_tsvector('simple', %s), 'B') || "
+        "setweight(to_tsvector('simple', %s), 'C')"
+    )
+
+    def create_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+                "note_id bigint PRIMARY KEY REFERENCES notes_note (id) ON DELETE CASCADE "
+                "DEFERRABLE INITIALLY DEFERRED, "
+                "document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {POSTGRES_TABLE}_document_gin "
+                f"ON {POSTGRES_TABLE} USING gin (document)"
+            )
+
+    def drop_index(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {POSTGRES_TABLE}")
+
+    def rebuild(self):
+        document = self.DOCUMENT_SQL % (
+            "n.title",
+            f"COALESCE((SELECT string_agg(t.name, ' ') {TAGGED_NAMES_SQL}), '')",
+            "COALESCE(n.content, '')",
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {POSTGRES_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_TABLE} (note_id, document) "
+                f"SELECT n.id, {document} FROM notes_note n"
+            )
+
+    def index_note(self, note_id, title, content, tags):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {POSTGRES_TABLE} (note_id, document) "
+                f"VALUES (%s, {self.DOCUMENT_SQL}) "
+                "ON CONFLICT (note_id) DO UPDATE SET document = EXCLUDED.document",
+                [note_id, title, " ".join(tags), content or ""],
+            )
+
+    def remove_note(self, note_id):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {POSTGRES_TABLE} WHERE note_id = %s", [note_id])
+
+    def index_notes(self, entries):
+        entries = list(entries)
+        if not entries:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {POSTGRES_TABLE} (note_id, document) "
+                f"VALUES (%s, {self.DOCUMENT_SQL}) "
+                "ON CONFLICT (note_id) DO UPDATE SET document = EXCLUDED.document",
+                [(note_id, title, " ".join(tags), content or "") for note_id, title, content, tags in entries],
+            )
+
+    def remove_notes(self, note_ids):
+        note_ids = list(note_ids)
+        if not note_ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {POSTGRES_TABLE} WHERE note_id = ANY(%s)", [note_ids])
+
+    @staticmethod
+    def build_tsquery(tokens):
+        # to_tsquery sözdizimine girmemesi için kelimeler zaten \w+ ile ayıklandı
+        return " & ".join(f"{token}:*" for token in tokens)
+
+    def filter_queryset(self, queryset, query):
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset.none()
+        tsquery = self.build_tsquery(tokens)
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            tables=[POSTGRES_TABLE],
+            where=[
+                f'{POSTGRES_TABLE}.note_id = "{table}"."id"',
+                f"{POSTGRES_TABLE}.document @@ to_tsquery('simple', %s)",
+            ],
+            params=[tsquery],
+            select={"search_rank": f"-ts_rank({POSTGRES_TABLE}.document, to_tsquery('simple', %s))"},
+            select_params=[tsquery],
+        )
+
+
+BACKENDS = {
+    "sqlite": SQLiteSearchBackend,
+    "postgresql": PostgresSearchBackend,
+}
+
+
+def get_search_backend(using="default", connection=None):
+    connection = connection or connections[using]
+    return BACKENDS.get(connection.vendor, IcontainsSearchBackend)(connection)
+
+
+def search_notes(queryset, query):
+    return get_search_backend(queryset.db).filter_queryset(queryset, query)
@@ -1,26 +1,57 @@
+from django.db import transaction
 from rest_framework import serializers
-from taggit.serializers import TagListSerializerField, TaggitSerializer
+from taggit.serializers import TagListSerializerField
 from taggit.models import Tag
 from .models import Note
 from .models import Category
+from .models import NoteRevision
+from .search import get_search_backend
+from .tagging import clean_tags, set_tags
+
+class DynamicFieldsMixin:
+    """
+    `?fields=id,title` ile sadece istenen alanları döndürür.
+    `?summary=1` verilirse tam içerik (`content`, `content_html`) yerine
+    sadece kayıt anında hesaplanan `excerpt` döner.
+    """
+    full_content_fields = ("content", "content_html")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        reading = request is not None and request.method == "GET"
+
+        if reading and is_summary_request(request):
+            for name in self.full_content_fields:
+                self.fields.pop(name, None)
+
+        if not reading:
+            return
+        requested = request.query_params.get("fields")
+        if requested:
+            allowed = {name.strip() for name in requested.split(",") if name.strip()}
+            for name in set(self.fields) - allowed:
+                self.fields.pop(name)
+
+
+def is_summary_request(request):
+    return request.query_params.get("summary", "").lower() in ("1", "true", "yes")
+
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ("id", "name", "slug")
 
-class NoteSerializer(TaggitSerializer, serializers.ModelSerializer):
+class NoteSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author_username = serializers.CharField(source="owner.username", read_only=True)
     tags = TagListSerializerField()
-    
-    ALLOWED_TAGS = [
-        "p", "strong", "em", "ul", "ol", "li", "br", "h1", "h2",
-        "a", "img",
-    ]
-    ALLOWED_ATTRIBUTES = {
-        "*": ["class"], 
-        "a": ["href", "title"],
-        "img": ["src", "alt", "style"],
-    }
+    # Kategori id'si; liste sayıları için bkz. /api/categories/ (note_count)
+    category = serializers.PrimaryKeyRelatedField(
+        queryset=Category.objects.all(), required=False, allow_null=True
+    )
+    # content_html, excerpt, word_count ve char_count kayıt anında
+    # notes/content.py ile hesaplanır
 
     class Meta:
         model = Note
@@ -28,6 +59,10 @@ class NoteSerializer(TaggitSerializer, serializers.ModelSerializer):
             "id",
             "title",
             "content",
+            "content_html",
+            "excerpt",
+            "word_count",
+            "char_count",
             "created_at",
             "updated_at",
             "author_username",
@@ -35,6 +70,7 @@ class NoteSerializer(TaggitSerializer, serializers.ModelSerializer):
             "is_private",
             "share_uuid",
             "tags",
+            "category",
             "is_pinned",
             "order"
         ]
@@ -51,13 +87,42 @@ class NoteSerializer(TaggitSerializer, serializers.ModelSerializer):
         """
         # Gelen her etiketi temizleyip, sadece harf ve rakamlardan oluşanları alalım.
         # Bu, '##' gibi sorunları ve boş etiketleri engeller.
-        clean_tags = [tag.strip().lstrip('#') for tag in value if tag.strip()]
-        return clean_tags
+        return clean_tags(value)
+
+    def validate_category(self, value):
+        request = self.context.get("request")
+        if value is not None and request is not None and value.owner_id != request.user.pk:
+            raise serializers.ValidationError("Kategori bulunamadı.")
+        return value
+
+    # taggit'in TaggitSerializer'ı yerine: etiketler notes/tagging.py ile
+    # tek IN sorgusuyla çözülür ve sadece değişen TaggedItem satırları yazılır
+    @transaction.atomic
+    def create(self, validated_data):
+        tags = validated_data.pop("tags", None)
+        note = super().create(validated_data)
+        if tags:
+            set_tags({note.pk: tags})
+            # post_save sinyali notu etiketler yazılmadan indeksledi
+            get_search_backend().index_note(note.pk, note.title, note.content, tags)
+        return note
+
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        tags = validated_data.pop("tags", None)
+        if tags is not None and set_tags({instance.pk: tags}):
+            # Etiketler kayıttan önce yazılır; böylece post_save sinyalleri
+            # (arama indeksi, sürüm, paylaşım önbelleği) yeni etiketleri görür
+            getattr(instance, "_prefetched_objects_cache", {}).pop("tags", None)
+        return super().update(instance, validated_data)
 
 class CategorySerializer(serializers.ModelSerializer):
+    # Aktif not sayısı; sorgu setinde annotate edilir (bkz. notes/aggregates.py)
+    note_count = serializers.IntegerField(read_only=True, default=0)
+
     class Meta:
         model = Category
-        fields = ['id', 'name', 'color']
+        fields = ['id', 'name', 'color', 'note_count']
         extra_kwargs = {
             'id': {'read_only': True},
         }
@@ -72,9 +137,16 @@ class PublicNoteSerializer(serializers.ModelSerializer):
         fields = [
             "title",
             "content",
+            "content_html",
             "created_at",
             "updated_at",
             "tags",
             "owner",
         ]
-        read_only_fields = fields
\ No newline at end of file
+        read_only_fields = fields
+
+class NoteRevisionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = NoteRevision
+        fields = ["number", "title", "created_at", "length", "is_snapshot"]
+        read_only_fields = fields
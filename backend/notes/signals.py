@@ -0,0 +1,242 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete, m2m_changed
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from taggit.models import Tag
+
+from .models import Note, Category
+from . import stats
+from .authentication import forget_tokens, forget_user_tokens
+from .content import render_note
+from .events import emit
+from .public import invalidate_public_note
+from .revisions import record_revision
+from .search import get_search_backend
+from .tagging import forget_tag_ids
+from .versioning import bump_version, record_tombstones
+
+
+def owner_deleted(origin):
+    """
+    Silme kullanıcı silinmesinden kaynaklanıyorsa (CASCADE) kullanıcıya ait
+    sayaç ve sürüm satırları da siliniyordur; yeniden oluşturulmamalı.
+    """
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is User
+
+
+# --- ARAMA İNDEKSİ ---
+def index_note(note, using):
+    tags = [tag.name for tag in note.tags.all()]
+    get_search_backend(using).index_note(note.pk, note.title, note.content, tags)
+
+
+@receiver(post_init, sender=Note)
+def note_search_state(sender, instance, **kwargs):
+    # İndekslenen başlık/içerik; ertelenmişse None ve not yeniden indekslenir
+    instance._search_state = (instance.__dict__.get('title'), instance.__dict__.get('content'))
+
+
+@receiver(post_save, sender=Note)
+def note_saved(sender, instance, created, using, update_fields=None, **kwargs):
+    # Sabitleme, çöp, paylaşım, sıra gibi kayıtlar aranan metni değiştirmez;
+    # etiket değişiklikleri note_tags_changed ile indekslenir
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    state = (instance.title, instance.content)
+    if not created and getattr(instance, '_search_state', None) == state:
+        return
+    index_note(instance, using)
+    instance._search_state = state
+
+
+@receiver(post_delete, sender=Note)
+def note_deleted(sender, instance, using, **kwargs):
+    get_search_backend(using).remove_note(instance.pk)
+
+
+@receiver(m2m_changed, sender=Note.tags.through)
+def note_tags_changed(sender, instance, action, using, **kwargs):
+    # TaggedItem tüm modeller için ortak olduğundan sadece notlarla ilgileniyoruz
+    if isinstance(instance, Note) and action in ("post_add", "post_remove", "post_clear"):
+        index_note(instance, using)
+
+
+# --- TÜRETİLMİŞ İÇERİK ALANLARI ---
+@receiver(post_init, sender=Note)
+def note_content_loaded(sender, instance, **kwargs):
+    if 'content' not in instance.get_deferred_fields():
+        instance._rendered_content = instance.content if instance.pk else None
+
+
+@receiver(pre_save, sender=Note)
+def note_render(sender, instance, update_fields=None, **kwargs):
+    # İçerik değişmediyse temizleyici tekrar çalışmaz
+    if update_fields is not None and 'content' not in update_fields:
+        return
+    if instance.content != getattr(instance, '_rendered_content', None):
+        render_note(instance)
+
+
+# --- KOLEKSİYON SÜRÜMÜ (ETag / ?since=) ---
+@receiver(pre_save, sender=Note)
+def note_version(sender, instance, **kwargs):
+    instance.version = bump_version(instance.owner_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def collection_changed(sender, instance, origin=None, **kwargs):
+    if not owner_deleted(origin):
+        bump_version(instance.owner_id)
+
+
+@receiver(post_delete, sender=Note)
+def note_tombstone(sender, instance, origin=None, **kwargs):
+    # Satırı kalmayan not ?since= yanıtında `deleted` olarak döner
+    if not owner_deleted(origin):
+        record_tombstones(instance.owner_id, [instance.pk], bump_version(instance.owner_id))
+
+
+@receiver(pre_delete, sender=Category)
+def category_notes_version(sender, instance, origin=None, **kwargs):
+    # SET_NULL notların kategorisini sinyalsiz UPDATE ile boşaltır; ?since=
+    # istemcileri bu notları görsün diye sürümleri önceden artırılır
+    if not owner_deleted(origin):
+        Note.objects.filter(category=instance).update(version=bump_version(instance.owner_id))
+
+
+@receiver(m2m_changed, sender=Note.tags.through)
+def note_tags_version(sender, instance, action, **kwargs):
+    if isinstance(instance, Note) and action in ("post_add", "post_remove", "post_clear"):
+        instance.version = bump_version(instance.owner_id)
+        Note.objects.filter(pk=instance.pk).update(version=instance.version)
+
+
+# --- İSTATİSTİK SAYAÇLARI ---
+@receiver(post_init, sender=Note)
+def note_loaded(sender, instance, **kwargs):
+    instance._stats_state = stats.snapshot(instance)
+
+
+@receiver(post_save, sender=Note)
+def note_stats_saved(sender, instance, created, **kwargs):
+    stats.note_changed(instance, getattr(instance, '_stats_state', None), created)
+    instance._stats_state = stats.snapshot(instance)
+
+
+@receiver(post_delete, sender=Note)
+def note_stats_deleted(sender, instance, origin=None, **kwargs):
+    if not owner_deleted(origin):
+        stats.note_removed(instance, getattr(instance, '_stats_state', None))
+
+
+@receiver(pre_delete, sender=Category)
+def category_stats_deleted(sender, instance, origin=None, **kwargs):
+    if not owner_deleted(origin):
+        stats.category_removed(instance)
+
+
+# --- PAYLAŞILAN NOT ÖNBELLEĞİ ---
+@receiver(post_save, sender=Note)
+@receiver(post_delete, sender=Note)
+def note_public_changed(sender, instance, **kwargs):
+    invalidate_public_note(instance.share_uuid)
+
+
+@receiver(m2m_changed, sender=Note.tags.through)
+def note_public_tags_changed(sender, instance, action, **kwargs):
+    if isinstance(instance, Note) and action in ("post_add", "post_remove", "post_clear"):
+        invalidate_public_note(instance.share_uuid)
+
+
+# --- ETİKET ID ÖNBELLEĞİ ---
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def tag_changed(sender, instance, created=False, **kwargs):
+    # Yeni etiket önbellekteki hiçbir kaydı geçersiz kılmaz
+    if not created:
+        forget_tag_ids()
+
+
+# --- DEĞİŞİKLİK BİLDİRİMLERİ (bkz. notes/events.py) ---
+@receiver(post_init, sender=Note)
+def note_event_state(sender, instance, **kwargs):
+    # Çöpe atma / geri yüklemeyi ayırt etmek için; ertelenmişse None
+    instance._was_deleted = instance.__dict__.get('is_deleted')
+
+
+@receiver(post_save, sender=Note)
+def note_event_saved(sender, instance, created, **kwargs):
+    was_deleted = getattr(instance, '_was_deleted', None)
+    if created:
+        event = 'note.created'
+    elif instance.is_deleted and was_deleted is False:
+        event = 'note.trashed'
+    elif not instance.is_deleted and was_deleted:
+        event = 'note.restored'
+    else:
+        event = 'note.updated'
+    instance._was_deleted = instance.is_deleted
+    emit(instance.owner_id, event, id=instance.pk, version=instance.version)
+
+
+@receiver(post_delete, sender=Note)
+def note_event_deleted(sender, instance, origin=None, **kwargs):
+    if not owner_deleted(origin):
+        emit(instance.owner_id, 'note.deleted', id=instance.pk)
+
+
+@receiver(m2m_changed, sender=Note.tags.through)
+def note_event_tags(sender, instance, action, **kwargs):
+    if isinstance(instance, Note) and action in ("post_add", "post_remove", "post_clear"):
+        emit(instance.owner_id, 'note.tags', id=instance.pk, version=instance.version)
+
+
+@receiver(post_save, sender=Category)
+def category_event_saved(sender, instance, created, **kwargs):
+    emit(instance.owner_id, 'category.created' if created else 'category.updated', id=instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+def category_event_deleted(sender, instance, origin=None, **kwargs):
+    if not owner_deleted(origin):
+        emit(instance.owner_id, 'category.deleted', id=instance.pk)
+
+
+# --- REVİZYON GEÇMİŞİ (bkz. notes/revisions.py) ---
+@receiver(post_init, sender=Note)
+def note_revision_state(sender, instance, **kwargs):
+    # Yüklenen başlık/içerik; ertelenmişse None ve son revizyonla karşılaştırılır
+    instance._revision_state = (instance.__dict__.get('title'), instance.__dict__.get('content'))
+
+
+@receiver(post_save, sender=Note)
+def note_revision_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    title, content = getattr(instance, '_revision_state', (None, None))
+    if not created and (title, content) == (instance.title, instance.content):
+        return
+    record_revision(instance, None if created else content)
+    instance._revision_state = (instance.title, instance.content)
+
+
+# --- TOKEN ÖNBELLEĞİ ---
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance, created=False, **kwargs):
+    # Çıkış (dj_rest_auth token'ı siler) ve token yenileme
+    if not created:
+        key = instance.key
+        transaction.on_commit(lambda: forget_tokens([key]))
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, created=False, update_fields=None, **kwargs):
+    # Her girişte yapılan last_login güncellemesi doğrulama sonucunu değiştirmez
+    if created or (update_fields and set(update_fields) == {"last_login"}):
+        return
+    forget_user_tokens([instance.pk])
@@ -0,0 +1,367 @@
+"""
+Benzer ve tekrarlanan notlar.
+
+Her not başlık, içerik (düz metin) ve etiketlerinden oluşan bir kelime
+kümesiyle temsil edilir; kümenin SIMILARITY_NUM_PERM elemanlı MinHash
+imzası iki notun Jaccard benzerliğini tahmin eder (aynı konumdaki
+değerlerin eşit olma oranı). İmzalar NoteSignature tablosunda saklanır ve
+kullanıcı başına bellekteki bir NumPy matrisine (not sayısı x imza
+uzunluğu, uint32) yüklenir:
+
+- related: notun imzası tüm satırlarla vektörel olarak karşılaştırılır,
+- duplicates: imza bantlara bölünür (LSH); aynı bant değerini paylaşan
+  notlar aday olur ve eşik üzerindekiler gruplanır. Kümesi
+  SIMILARITY_DUPLICATE_MIN_TOKENS'tan küçük notlar ("Not 1" gibi)
+  birbirinin kopyası sayılmaz.
+
+İndeks artımlı güncellenir: her sorguda kullanıcının koleksiyon sürümü
+okunur; değiştiyse sadece o sürümden sonra kaydedilen veya çöpe atılan
+notlar (Note.version) yeniden hesaplanır ya da indeksten çıkarılır. Kayıt
+yolu (sinyaller, toplu işlemler) bu yüzden ek sorgu yapmaz. İmzası
+eksik veya eski olan notlar istek başına en fazla
+SIMILARITY_SIGNATURE_BUDGET tane hesaplanıp tabloya yazılır; hepsi
+hesaplanana kadar sonuçlar eksiktir (uç noktalar 202 döner). Mevcut
+notların imzaları `manage.py compute_note_signatures` ile önceden
+hesaplanır; başka süreçler indeksi içerikleri okumadan yükler.
+"""
+import threading
+import zlib
+from contextlib import contextmanager
+
+import numpy as np
+from cachetools import LRUCache
+from django.conf import settings
+from django.db.models import F, Q
+
+from .aggregates import current_version
+from .content import plain_text
+from .models import Note, NoteSignature
+from .search import tokenize
+from .tagging import tag_names
+
+# h(x) = (a * x + b) mod P; a, b, x < 2^32 olduğundan uint64'te taşmaz
+PRIME = 4294967311
+EMPTY = np.uint32(0xFFFFFFFF)
+# Daha kısa kelimeler (ve, bu, de...) benzerliği bozmasın diye sayılmaz;
+# sayılar ("Not 1" / "Not 2") kısa da olsa ayırt edici olduğu için sayılır
+MIN_TOKEN_LENGTH = 3
+# İmza hesaplamada bir seferde işlenen not sayısı (ara matris belleği için)
+CHUNK_SIZE = 256
+# Bu kadardan kalabalık bant grupları çok yaygın kelimelerden oluşur ve
+# atlanır; gerçek kopyalar diğer bantlarda küçük gruplarda yakalanır
+MAX_BUCKET = 32
+PAIR_CHUNK_SIZE = 100000
+BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def permutations(count):
+    # Sabit tohum: imzalar veritabanında saklandığı için her süreçte aynı olmalı
+    rng = np.random.default_rng(20240611)
+    a = rng.integers(1, 1 << 32, size=count, dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, size=count, dtype=np.uint64)
+    return a, b
+
+
+_permutations = {}
+
+
+def note_tokens(title, content_html, tags):
+    text = f"{title} {plain_text(content_html)}".lower()
+    tokens = {token for token in tokenize(text) if len(token) >= MIN_TOKEN_LENGTH or token.isdigit()}
+    tokens.update(f"#{tag.lower()}" for tag in tags)
+    return tokens
+
+
+def signatures(token_sets):
+    """
+    Kelime kümeleri için MinHash imzaları (len x SIMILARITY_NUM_PERM, uint32).
+    """
+    count = settings.SIMILARITY_NUM_PERM
+    if count not in _permutations:
+        _permutations[count] = permutations(count)
+    a, b = _permutations[count]
+
+    lengths = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=len(token_sets))
+    result = np.full((len(token_sets), count), EMPTY, dtype=np.uint32)
+    if not lengths.sum():
+        return result
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode("utf-8")) for tokens in token_sets for token in tokens),
+        dtype=np.uint64, count=int(lengths.sum()),
+    )
+    values = ((hashes[:, None] * a + b) % PRIME & 0xFFFFFFFF).astype(np.uint32)
+    # Boş kümeler atlanır; kalan parçalar bitişik olduğu için reduceat her
+    # notun kendi satırları üzerinde minimum alır
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    filled = lengths > 0
+    result[filled] = np.minimum.reduceat(values, starts[filled], axis=0)
+    return result
+
+
+def compute_signatures(note_ids):
+    """
+    Notların imzalarını içeriklerinden hesaplar ve NoteSignature'a yazar;
+    (id dizisi, imza matrisi, küme boyları) döner.
+    """
+    note_ids = sorted(note_ids)
+    ids, matrices, sizes = [], [], []
+    for start in range(0, len(note_ids), CHUNK_SIZE):
+        chunk = note_ids[start:start + CHUNK_SIZE]
+        rows = list(Note.objects.filter(pk__in=chunk).values_list("pk", "version", "title", "content_html"))
+        names = tag_names([row[0] for row in rows])
+        token_sets = [note_tokens(title, html, names[pk]) for pk, _, title, html in rows]
+        matrix = signatures(token_sets)
+        NoteSignature.objects.bulk_create(
+            [
+                NoteSignature(note_id=pk, version=version, data=signature.tobytes(), tokens=len(tokens))
+                for (pk, version, _, _), signature, tokens in zip(rows, matrix, token_sets)
+            ],
+            update_conflicts=True, unique_fields=["note"], update_fields=["version", "data", "tokens"],
+        )
+        ids.extend(row[0] for row in rows)
+        matrices.append(matrix)
+        sizes.extend(len(tokens) for tokens in token_sets)
+    if not ids:
+        return (
+            np.empty(0, dtype=np.int64), np.empty((0, settings.SIMILARITY_NUM_PERM), dtype=np.uint32),
+            np.empty(0, dtype=np.int32),
+        )
+    return np.array(ids, dtype=np.int64), np.concatenate(matrices), np.array(sizes, dtype=np.int32)
+
+
+def stale_notes(queryset):
+    """
+    İmzası olmayan veya not son imzalandığından beri değişmiş notlar.
+    """
+    return queryset.filter(Q(signature__isnull=True) | Q(signature__version__lt=F("version")))
+
+
+def backfill_signatures():
+    """
+    Tüm aktif notların eksik veya eski imzalarını parça parça hesaplar;
+    hesaplanan not sayısını döner.
+    """
+    note_ids = list(
+        stale_notes(Note.objects.filter(is_deleted=False)).order_by("pk").values_list("pk", flat=True)
+    )
+    return sum(len(compute_signatures(note_ids[start:start + CHUNK_SIZE])[0])
+               for start in range(0, len(note_ids), CHUNK_SIZE))
+
+
+class SimilarityIndex:
+    """
+    Bir kullanıcının aktif notlarının imzaları; `ids` artan sıralı, `matrix`
+    satırları ve `sizes` (kelime kümesi boyları) onunla hizalı. İmzası henüz hesaplanmamış notlar `pending`
+    içinde bekler ve indekste yer almaz.
+    """
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.version = None
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, settings.SIMILARITY_NUM_PERM), dtype=np.uint32)
+        self.sizes = np.empty(0, dtype=np.int32)
+        self.pending = set()
+        # (eşik, sonuç): indeks değişene kadar aynı eşikle tekrar hesaplanmaz
+        self.last_duplicates = None
+        self.lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self.ids.nbytes + self.matrix.nbytes + self.sizes.nbytes
+
+    def active_notes(self):
+        return Note.objects.filter(owner_id=self.user_id, is_deleted=False)
+
+    # --- Güncelleme ---
+    def refresh(self):
+        version = current_version(self.user_id)
+        if version != self.version:
+            if self.version is None:
+                self.load()
+            else:
+                self.update(self.version)
+                # Kalıcı silinen notlar sürümde iz bırakmaz; sayı tutmuyorsa yeniden yükle
+                if self.active_notes().count() != len(self.ids) + len(self.pending):
+                    self.load()
+            self.version = version
+        if self.pending:
+            self.compute_pending(settings.SIMILARITY_SIGNATURE_BUDGET)
+
+    def load(self):
+        rows = list(
+            self.active_notes().order_by("pk")
+            .values_list("pk", "version", "signature__version", "signature__data", "signature__tokens")
+        )
+        count = settings.SIMILARITY_NUM_PERM
+        fresh = [
+            (pk, data, tokens) for pk, version, signed, data, tokens in rows
+            if signed is not None and signed >= version and len(data) == count * 4
+        ]
+        ids = np.array([pk for pk, _, _ in fresh], dtype=np.int64)
+        matrix = np.frombuffer(b"".join(bytes(data) for _, data, _ in fresh), dtype=np.uint32).reshape(-1, count)
+        self.set(ids, matrix, np.array([tokens for _, _, tokens in fresh], dtype=np.int32))
+        self.pending = {pk for pk, *_ in rows} - {pk for pk, _, _ in fresh}
+
+    def update(self, since):
+        changed = list(
+            Note.objects.filter(owner_id=self.user_id, version__gt=since).values_list("pk", "is_deleted")
+        )
+        removed = np.array([pk for pk, _ in changed], dtype=np.int64)
+        keep = ~np.isin(self.ids, removed)
+        self.set(self.ids[keep], self.matrix[keep], self.sizes[keep])
+        self.pending.difference_update(pk for pk, _ in changed)
+        self.pending.update(pk for pk, is_deleted in changed if not is_deleted)
+
+    def compute_pending(self, limit):
+        note_ids = sorted(self.pending)[:limit]
+        self.pending.difference_update(note_ids)
+        self.merge(*compute_signatures(note_ids))
+
+    def merge(self, ids, matrix, sizes):
+        self.set(
+            np.concatenate((self.ids, ids)), np.concatenate((self.matrix, matrix)),
+            np.concatenate((self.sizes, sizes)),
+        )
+
+    def set(self, ids, matrix, sizes):
+        order = np.argsort(ids, kind="stable")
+        self.ids, self.matrix, self.sizes = ids[order], np.ascontiguousarray(matrix[order]), sizes[order]
+        self.last_duplicates = None
+
+    # --- Sorgular ---
+    def position(self, note_id):
+        position = int(np.searchsorted(self.ids, note_id))
+        if position < len(self.ids) and self.ids[position] == note_id:
+            return position
+        return None
+
+    def scores(self, row):
+        return (self.matrix == row).sum(axis=1, dtype=np.int32) / self.matrix.shape[1]
+
+    def related(self, note_id, limit, min_similarity):
+        """
+        [(note_id, benzerlik), ...], en benzerden başlayarak.
+        """
+        position = self.position(note_id)
+        if position is None or not self.sizes[position]:
+            return []
+        scores = self.scores(self.matrix[position])
+        scores[position] = -1
+        limit = min(limit, len(scores))
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(self.ids[i]), float(scores[i])) for i in top if scores[i] >= min_similarity]
+
+    def duplicates(self, threshold):
+        """
+        Benzerliği eşiği geçen not grupları: [([note_id, ...], en düşük benzerlik), ...].
+        """
+        if self.last_duplicates is None or self.last_duplicates[0] != threshold:
+            self.last_duplicates = (threshold, self.find_duplicates(threshold))
+        return self.last_duplicates[1]
+
+    def find_duplicates(self, threshold):
+        # Çok küçük kümelerde (boş, "Not 1") tek ortak kelime benzerliği 1'e çıkarır
+        valid = np.flatnonzero(self.sizes >= settings.SIMILARITY_DUPLICATE_MIN_TOKENS)
+        matrix = self.matrix[valid]
+        pairs = candidate_pairs(matrix, settings.SIMILARITY_BAND_ROWS)
+        similar = []
+        for start in range(0, len(pairs), PAIR_CHUNK_SIZE):
+            chunk = pairs[start:start + PAIR_CHUNK_SIZE]
+            scores = (matrix[chunk[:, 0]] == matrix[chunk[:, 1]]).mean(axis=1)
+            similar.append(chunk[scores >= threshold])
+
+        parent = {}
+
+        def find(i):
+            parent.setdefault(i, i)
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for first, second in (np.concatenate(similar).tolist() if similar else ()):
+            parent[find(first)] = find(second)
+        clusters = {}
+        for i in list(parent):
+            clusters.setdefault(find(i), []).append(i)
+
+        result = []
+        for members in clusters.values():
+            signatures = matrix[sorted(members)]
+            scores = (signatures[:, None, :] == signatures[None, :, :]).mean(axis=2)
+            note_ids = [int(note_id) for note_id in self.ids[valid[sorted(members)]]]
+            result.append((note_ids, float(scores.min())))
+        result.sort(key=lambda item: (-len(item[0]), -item[1]))
+        return result
+
+
+def candidate_pairs(matrix, rows):
+    """
+    İmzanın `rows` değerlik bantlarından en az birinde aynı değeri taşıyan
+    satır çiftleri (i < j), tekrarsız.
+    """
+    pairs = []
+    for start in range(0, matrix.shape[1] - rows + 1, rows):
+        # Bant değerleri tek bir 64 bitlik anahtara katlanır; çakışmalar
+        # sadece fazladan aday üretir, çiftler aşağıda doğrulanır
+        band = np.zeros(len(matrix), dtype=np.uint64)
+        for column in matrix[:, start:start + rows].T:
+            band = band * BAND_MULTIPLIER + column
+        _, inverse, counts = np.unique(band, return_inverse=True, return_counts=True)
+        sizes = counts[inverse]
+        candidates = np.flatnonzero((sizes > 1) & (sizes <= MAX_BUCKET))
+        # Gruplar ardışık dizilir; aynı boydaki gruplar bir matrise sığar ve
+        # çiftleri tek seferde üretilir
+        order = candidates[np.argsort(inverse[candidates], kind="stable")]
+        group_sizes = sizes[order]
+        for size in np.unique(group_sizes):
+            groups = order[group_sizes == size].reshape(-1, size)
+            first, second = np.triu_indices(size, k=1)
+            pairs.append(np.stack((groups[:, first].ravel(), groups[:, second].ravel()), axis=1))
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.concatenate(pairs).astype(np.int64)
+    keys = np.unique(pairs[:, 0] * len(matrix) + pairs[:, 1])
+    return np.stack(np.divmod(keys, len(matrix)), axis=1)
+
+
+_indexes = LRUCache(maxsize=settings.SIMILARITY_INDEX_CACHE_SIZE)
+_indexes_lock = threading.Lock()
+
+
+@contextmanager
+def locked_index(user_id):
+    """
+    Kullanıcının güncellenmiş indeksi; blok boyunca başka bir istek
+    indeksi değiştiremez. En son kullanılan SIMILARITY_INDEX_CACHE_SIZE
+    kullanıcınınki bellekte tutulur.
+    """
+    with _indexes_lock:
+        index = _indexes.get(user_id)
+        if index is None:
+            index = _indexes[user_id] = SimilarityIndex(user_id)
+    with index.lock:
+        index.refresh()
+        yield index
+
+
+def get_index(user_id):
+    with locked_index(user_id) as index:
+        return index
+
+
+# İkisi de (sonuç, imzası henüz hesaplanmamış not sayısı) döner
+def related_notes(user_id, note_id, limit):
+    with locked_index(user_id) as index:
+        return index.related(note_id, limit, settings.SIMILARITY_RELATED_MIN), len(index.pending)
+
+
+def duplicate_groups(user_id, threshold):
+    with locked_index(user_id) as index:
+        return index.duplicates(threshold), len(index.pending)
+
+
+def forget_indexes():
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,109 @@
+"""
+Tek sayfa uygulamanın kabuğu (frontend/dist/index.html).
+
+Kabuk şablon motorundan geçirilmez: dosya bir kez okunur, gzip ve (brotli
+kuruluysa) br ile sıkıştırılıp bellekte tutulur; `npm run build` dosyayı
+değiştirdiğinde değişiklik zamanından anlaşılır ve yeniden yüklenir.
+Kabuk hash'li asset adlarını içerdiğinden tarayıcı her açılışta ETag ile
+doğrular (`no-cache`, değişmediyse 304); asset'lerin kendisi WhiteNoise
+tarafından süresiz önbelleğe alınır (bkz. WHITENOISE_IMMUTABLE_FILE_TEST).
+"""
+import gzip
+import hashlib
+import os
+import threading
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.views.decorators.http import require_safe
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Tercih sırasına göre
+ENCODINGS = ["br", "gzip"]
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=11) if brotli else None
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+class Shell:
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.path = path
+        self.mtime = stat.st_mtime_ns
+        with open(path, "rb") as f:
+            body = f.read()
+        digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+        # Her kodlama ayrı bir gösterim; ETag'leri de ayrı
+        self.variants = {None: (body, f'"{digest}"')}
+        for encoding in ENCODINGS:
+            compressed = compress(body, encoding)
+            if compressed is not None and len(compressed) < len(body):
+                self.variants[encoding] = (compressed, f'"{digest}-{encoding}"')
+
+    def is_stale(self):
+        try:
+            return os.stat(self.path).st_mtime_ns != self.mtime
+        except FileNotFoundError:
+            return True
+
+
+_shell = None
+_shell_lock = threading.Lock()
+
+
+def get_shell():
+    global _shell
+    shell = _shell
+    if shell is None or shell.path != settings.SPA_INDEX_FILE or shell.is_stale():
+        with _shell_lock:
+            try:
+                shell = _shell = Shell(settings.SPA_INDEX_FILE)
+            except FileNotFoundError:
+                _shell = None
+                raise Http404("Arayüz derlenmemiş (frontend: npm run build).")
+    return shell
+
+
+def accepted_encodings(header):
+    accepted = set()
+    for part in header.split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+@require_safe
+def spa_shell(request, *args, **kwargs):
+    """
+    Kök adres ve uygulama içi derin bağlantılar (ör. /share/<uuid>) için kabuk.
+    """
+    shell = get_shell()
+    accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    encoding = next((name for name in ENCODINGS if name in shell.variants and name in accepted), None)
+    body, etag = shell.variants[encoding]
+
+    response = HttpResponse(b"" if request.method == "HEAD" else body, content_type="text/html; charset=utf-8")
+    response["Content-Length"] = len(body)
+    response["ETag"] = etag
+    response["Cache-Control"] = "no-cache"
+    if encoding:
+        response["Content-Encoding"] = encoding
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return get_conditional_response(request, etag=etag, response=response)
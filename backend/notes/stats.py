@@ -0,0 +1,200 @@
+"""
+Not istatistikleri için artımlı sayaçlar.
+
+Her not, durumuna göre bir dizi sayaca katkı yapar (bkz. `contribution`).
+Not yüklendiğinde katkısı hatırlanır; kaydedilince yeni katkıyla farkı
+NoteStatCounter satırlarına F() ile eklenir. Böylece /api/notes/stats/
+tüm notları okumadan tek sorguyla cevap verir. Sayaçlar bozulursa
+`manage.py rebuild_note_stats` ile sıfırdan hesaplanabilir.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Note, NoteStatCounter
+
+# Not katkısını hesaplamak için gereken alanlar
+SNAPSHOT_FIELDS = (
+    'owner_id', 'is_deleted', 'is_pinned', 'is_shared', 'is_private',
+    'category_id', 'content', 'created_at',
+)
+
+
+def snapshot(note):
+    """
+    Notun sayaçlarla ilgili alanlarının kopyası; alanlardan biri
+    ertelenmişse (defer) None döner.
+    """
+    if note.get_deferred_fields() & set(SNAPSHOT_FIELDS):
+        return None
+    return {
+        'owner_id': note.owner_id,
+        'is_deleted': note.is_deleted,
+        'is_pinned': note.is_pinned,
+        'is_shared': note.is_shared,
+        'is_private': note.is_private,
+        'category_id': note.category_id,
+        'chars': len(note.content or ''),
+        'created_at': note.created_at,
+    }
+
+
+def row_state(row):
+    """
+    values(*SNAPSHOT_FIELDS) satırından snapshot() biçiminde durum üretir.
+    """
+    state = dict(row)
+    state['chars'] = len(state.pop('content') or '')
+    return state
+
+
+def states(note_ids):
+    """
+    {note_id: durum}; toplu işlemlerde öncesi/sonrası farkı için tek sorgu.
+    """
+    rows = Note.objects.filter(pk__in=list(note_ids)).values('pk', *SNAPSHOT_FIELDS)
+    return {row.pop('pk'): row_state(row) for row in rows}
+
+
+def apply_state_changes(before, after):
+    """
+    Toplu işlem öncesi ve sonrası durumlar arasındaki farkı sayaçlara uygular.
+    """
+    deltas = {}
+    for note_id in set(before) | set(after):
+        old, new = before.get(note_id), after.get(note_id)
+        for state, sign in ((old, -1), (new, 1)):
+            if state:
+                owner_deltas = deltas.setdefault(state['owner_id'], Counter())
+                for key, value in contribution(state).items():
+                    owner_deltas[key] += sign * value
+    for owner_id, owner_deltas in deltas.items():
+        apply_deltas(owner_id, owner_deltas)
+
+
+def contribution(state):
+    """
+    Tek bir notun sayaçlara katkısı: {anahtar: değer}.
+    """
+    if not state:
+        return Counter()
+    if state['is_deleted']:
+        return Counter({'trashed': 1})
+    counts = Counter({
+        'total': 1,
+        'pinned': int(state['is_pinned']),
+        'shared': int(state['is_shared']),
+        'private': int(state['is_private']),
+        'chars': state['chars'],
+        f"category:{state['category_id'] or 'none'}": 1,
+    })
+    if state['created_at']:
+        counts[f"day:{timezone.localdate(state['created_at']).isoformat()}"] = 1
+    return counts
+
+
+def apply_deltas(owner_id, deltas):
+    """
+    Sıfırdan farklı farkları sayaç satırlarına ekler (yoksa oluşturur).
+    """
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        updated = NoteStatCounter.objects.filter(owner_id=owner_id, key=key).update(
+            value=F('value') + delta
+        )
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                NoteStatCounter.objects.create(owner_id=owner_id, key=key, value=delta)
+        except IntegrityError:
+            NoteStatCounter.objects.filter(owner_id=owner_id, key=key).update(value=F('value') + delta)
+
+
+def diff(old, new):
+    deltas = Counter(new)
+    deltas.subtract(old)
+    return deltas
+
+
+def note_changed(note, old_state, created=False):
+    """
+    Kaydedilen notun eski ve yeni katkısı arasındaki farkı uygular.
+    Eski durum bilinmiyorsa kullanıcının sayaçları yeniden hesaplanır.
+    """
+    new_state = snapshot(note)
+    if created:
+        # post_init anındaki durum henüz kaydedilmemiş nota ait
+        old_state = {}
+    if new_state is None or old_state is None:
+        rebuild(note.owner_id)
+        return
+    if old_state and old_state['owner_id'] != new_state['owner_id']:
+        apply_deltas(old_state['owner_id'], diff(contribution(old_state), {}))
+        old_state = None
+    apply_deltas(note.owner_id, diff(contribution(old_state), contribution(new_state)))
+
+
+def note_removed(note, old_state):
+    if old_state is None:
+        rebuild(note.owner_id)
+        return
+    apply_deltas(old_state['owner_id'], diff(contribution(old_state), {}))
+
+
+def category_removed(category):
+    """
+    Silinen kategorideki notlar SET_NULL ile kategorisiz kalır; sayacı taşı.
+    """
+    key = f'category:{category.pk}'
+    value = NoteStatCounter.objects.filter(owner_id=category.owner_id, key=key).values_list(
+        'value', flat=True
+    ).first()
+    if value:
+        apply_deltas(category.owner_id, {'category:none': value})
+    NoteStatCounter.objects.filter(owner_id=category.owner_id, key=key).delete()
+
+
+@transaction.atomic
+def rebuild(owner_id):
+    """
+    Kullanıcının sayaçlarını notlardan sıfırdan hesaplar.
+    """
+    totals = Counter()
+    notes = Note.objects.filter(owner_id=owner_id).values(*SNAPSHOT_FIELDS)
+    for row in notes.iterator(chunk_size=2000):
+        totals.update(contribution(row_state(row)))
+
+    NoteStatCounter.objects.filter(owner_id=owner_id).delete()
+    NoteStatCounter.objects.bulk_create([
+        NoteStatCounter(owner_id=owner_id, key=key, value=value)
+        for key, value in totals.items() if value
+    ])
+
+
+def read_stats(owner):
+    """
+    Sayaç satırlarını API yanıtı biçimine dönüştürür.
+    """
+    counters = dict(NoteStatCounter.objects.filter(owner=owner).values_list('key', 'value'))
+    categories = {}
+    per_day = {}
+    for key, value in counters.items():
+        kind, _, name = key.partition(':')
+        if kind == 'category' and value:
+            categories[None if name == 'none' else int(name)] = value
+        elif kind == 'day' and value:
+            per_day[name] = value
+    return {
+        'total': counters.get('total', 0),
+        'pinned': counters.get('pinned', 0),
+        'shared': counters.get('shared', 0),
+        'private': counters.get('private', 0),
+        'trashed': counters.get('trashed', 0),
+        'content_chars': counters.get('chars', 0),
+        'categories': categories,
+        'per_day': dict(sorted(per_day.items())),
+    }
@@ -0,0 +1,167 @@
+"""
+Notlar için küme tabanlı (set-based) etiket yazma yardımcıları.
+
+taggit'in yöneticisi etiketleri tek tek çözer ve her not için ayrı
+sorgular atar. Buradaki fonksiyonlar tüm etiket adlarını tek bir IN
+sorgusuyla (sık kullanılanlar için süreç içi önbellekten) çözer, eksikleri
+toplu oluşturur ve TaggedItem satırlarını mevcut durumla fark alarak tek
+sorguda ekler/siler. Sinyal tetiklenmez; çağıran taraf arama indeksi
+ve sürüm gibi yan etkileri kendisi günceller.
+"""
+import threading
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from taggit.models import Tag, TaggedItem
+
+from .models import Note
+
+
+def clean_tags(value):
+    """
+    Etiketlerdeki olası '##' gibi istenmeyen karakterleri ve boşlukları temizler.
+    """
+    return [tag.strip().lstrip('#') for tag in value if tag.strip()]
+
+
+def note_content_type():
+    # get_for_model sonucu ContentType önbelleğinde tutulur
+    return ContentType.objects.get_for_model(Note)
+
+
+# Sık kullanılan etiketler için süreç içi ad -> id önbelleği. Etiket
+# silindiğinde notes/signals.py kaydı düşürür; TTL diğer süreçlerdeki
+# silmeler için üst sınırdır.
+_tag_ids = TTLCache(maxsize=settings.TAG_ID_CACHE_SIZE, ttl=settings.TAG_ID_CACHE_TTL)
+_tag_ids_lock = threading.Lock()
+
+
+def cache_tag_ids(tag_ids):
+    with _tag_ids_lock:
+        _tag_ids.update(tag_ids)
+
+
+def forget_tag_ids():
+    with _tag_ids_lock:
+        _tag_ids.clear()
+
+
+def resolve_tag_ids(names):
+    """
+    Etiket adlarını id'lere çevirir: {ad: id}. Önbellekte olmayanlar tek
+    sorguda okunur, eksikler toplu oluşturulur.
+    """
+    names = set(names)
+    with _tag_ids_lock:
+        tag_ids = {name: _tag_ids[name] for name in names if name in _tag_ids}
+    unknown = names - set(tag_ids)
+    if not unknown:
+        return tag_ids
+
+    found = dict(Tag.objects.filter(name__in=unknown).values_list('name', 'id'))
+    cache_tag_ids(found)
+    tag_ids.update(found)
+    missing = unknown - set(found)
+    if missing:
+        Tag.objects.bulk_create(
+            [Tag(name=name, slug=Tag().slugify(name)) for name in missing],
+            ignore_conflicts=True,
+        )
+        created = dict(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+        # Slug çakışması yüzünden eklenemeyenler taggit'in kendi yoluyla
+        # (slug'a sonek ekleyerek) oluşturulur
+        for name in missing - set(created):
+            created[name] = Tag.objects.get_or_create(name=name)[0].pk
+        tag_ids.update(created)
+        # Yeni etiketler transaction geri alınırsa önbellekte kalmamalı
+        transaction.on_commit(lambda: cache_tag_ids(created))
+    return tag_ids
+
+
+def add_tags(tags_by_note):
+    """
+    {note_id: [ad, ...]} eşlemesindeki etiketleri notlara ekler.
+    """
+    tag_ids = resolve_tag_ids(name for names in tags_by_note.values() for name in names)
+    content_type = note_content_type()
+    TaggedItem.objects.bulk_create(
+        [
+            TaggedItem(content_type=content_type, object_id=note_id, tag_id=tag_ids[name])
+            for note_id, names in tags_by_note.items()
+            for name in set(names)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def set_tags(tags_by_note):
+    """
+    {note_id: [ad, ...]} eşlemesini notların etiketleri yapar. Mevcut
+    bağlantılarla fark alınır; sadece eklenen ve çıkarılan TaggedItem
+    satırları yazılır. Etiketi değişen not id'lerini döner.
+    """
+    if not tags_by_note:
+        return set()
+    content_type = note_content_type()
+    tag_ids = resolve_tag_ids(name for names in tags_by_note.values() for name in names)
+    wanted = {
+        note_id: {tag_ids[name] for name in names}
+        for note_id, names in tags_by_note.items()
+    }
+    current = {note_id: {} for note_id in tags_by_note}
+    rows = TaggedItem.objects.filter(
+        content_type=content_type, object_id__in=list(tags_by_note)
+    ).values_list('pk', 'object_id', 'tag_id')
+    for pk, note_id, tag_id in rows:
+        current[note_id][tag_id] = pk
+
+    added, removed = [], []
+    for note_id, tags in wanted.items():
+        added += [(note_id, tag_id) for tag_id in tags - set(current[note_id])]
+        removed += [pk for tag_id, pk in current[note_id].items() if tag_id not in tags]
+    if removed:
+        TaggedItem.objects.filter(pk__in=removed).delete()
+    if added:
+        TaggedItem.objects.bulk_create(
+            [TaggedItem(content_type=content_type, object_id=note_id, tag_id=tag_id) for note_id, tag_id in added],
+            ignore_conflicts=True,
+        )
+    return {
+        note_id for note_id, tags in wanted.items() if tags != set(current[note_id])
+    }
+
+
+def remove_tags(tags_by_note):
+    """
+    {note_id: [ad, ...]} eşlemesindeki etiketleri notlardan kaldırır.
+    """
+    condition = Q()
+    for note_id, names in tags_by_note.items():
+        if names:
+            condition |= Q(object_id=note_id, tag__name__in=set(names))
+    if not condition:
+        return 0
+    deleted, _ = TaggedItem.objects.filter(condition, content_type=note_content_type()).delete()
+    return deleted
+
+
+def clear_tags(note_ids):
+    return TaggedItem.objects.filter(
+        content_type=note_content_type(), object_id__in=list(note_ids)
+    ).delete()
+
+
+def tag_names(note_ids):
+    """
+    {note_id: [ad, ...]} döner; tek sorgu.
+    """
+    names = {note_id: [] for note_id in note_ids}
+    rows = TaggedItem.objects.filter(
+        content_type=note_content_type(), object_id__in=list(note_ids)
+    ).values_list('object_id', 'tag__name')
+    for note_id, name in rows:
+        names[note_id].append(name)
+    return names
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+
+from notes.authentication import forget_all_tokens
+from notes.models import Note
+from notes.tagging import forget_tag_ids
+
+
+class NotesTestCase(APITestCase):
+    """
+    Oturum açmış bir kullanıcıyla API testleri.
+
+    SQLite test veritabanında geri alınan id'ler sonraki testte yeniden
+    kullanıldığından sürüm anahtarlı önbellekler ve süreç içi önbellekler
+    her testten önce temizlenir.
+    """
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        forget_all_tokens()
+        forget_tag_ids()
+        self.owner = User.objects.create_user("ayse", "ayse@example.com", "parola")
+        self.client.force_authenticate(self.owner)
+
+    def create_note(self, title="Not", content="", **fields):
+        return Note.objects.create(owner=self.owner, title=title, content=content, **fields)
@@ -0,0 +1,39 @@
+from django.test import override_settings
+from rest_framework.authtoken.models import Token
+
+from notes import ai
+
+from .base import NotesTestCase
+
+
+@override_settings(AI_TAG_PROVIDER="notes.ai.StubTagProvider")
+class AITagViewTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        ai._service = None
+        self.addCleanup(setattr, ai, "_service", None)
+        self.headers = {"HTTP_AUTHORIZATION": f"Token {Token.objects.create(user=self.owner).key}"}
+
+    def post(self, url, body):
+        return self.client.post(url, body, content_type="application/json", **self.headers)
+
+    def test_generate(self):
+        response = self.post("/api/ai/tags/", {"title": "Django", "content": "django performans performans"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("performans", response.json()["tags"])
+
+    def test_batch(self):
+        note = self.create_note("Django", "django sorgu sorgu")
+        response = self.post("/api/ai/tags/batch/", {"note_ids": [note.pk]})
+        self.assertEqual(response.json()["results"][0]["id"], note.pk)
+
+    def test_body_must_be_object(self):
+        for url in ("/api/ai/tags/", "/api/ai/tags/batch/"):
+            for body in ([1, 2], "metin", 3):
+                with self.subTest(url=url, body=body):
+                    self.assertEqual(self.post(url, body).status_code, 400)
+
+    def test_fields_must_be_text(self):
+        self.assertEqual(self.post("/api/ai/tags/", {"title": ["a"]}).status_code, 400)
+        self.assertEqual(self.post("/api/ai/tags/batch/", {"notes": [{"title": 1}]}).status_code, 400)
+        self.assertEqual(self.post("/api/ai/tags/batch/", {"note_ids": 5}).status_code, 400)
@@ -0,0 +1,387 @@
+import json
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from notes.models import Category, Note
+from notes.purge import request_purge, run_purge
+from notes.versioning import prune_tombstones
+
+from .base import NotesTestCase
+
+
+def note_ids(response):
+    return [note["id"] for note in response.json()]
+
+
+class PaginationTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.notes = [self.create_note(f"Not {i}", order=i) for i in range(5)]
+
+    def test_without_parameters_returns_plain_list(self):
+        response = self.client.get("/api/notes/")
+        self.assertEqual(note_ids(response), [note.pk for note in self.notes])
+
+    def test_cursor_walks_all_pages(self):
+        seen, url = [], "/api/notes/?page_size=2"
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page["results"]), 2)
+            seen += [note["id"] for note in page["results"]]
+            url = page["next"]
+        self.assertEqual(seen, [note.pk for note in self.notes])
+
+    def test_pages_do_not_shift_when_notes_are_added(self):
+        page = self.client.get("/api/notes/?page_size=2").json()
+        self.create_note("Araya giren", order=0)
+        rest = self.client.get(page["next"]).json()
+        self.assertEqual(rest["results"][0]["id"], self.notes[2].pk)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get("/api/notes/?cursor=bozuk").status_code, 404)
+
+
+class DeltaTests(NotesTestCase):
+    def test_since_returns_changed_and_trashed(self):
+        kept, edited, trashed = (self.create_note(f"Not {i}") for i in range(3))
+        first = self.client.get("/api/notes/?since=0").json()
+        self.assertCountEqual([note["id"] for note in first["changed"]], [kept.pk, edited.pk, trashed.pk])
+
+        edited.content = "yeni içerik"
+        edited.save()
+        self.client.post(f"/api/notes/{trashed.pk}/trash/")
+        delta = self.client.get(f"/api/notes/?since={first['version']}").json()
+        self.assertEqual([note["id"] for note in delta["changed"]], [edited.pk])
+        self.assertEqual(delta["trashed"], [trashed.pk])
+        self.assertGreater(delta["version"], first["version"])
+
+        unchanged = self.client.get(f"/api/notes/?since={delta['version']}").json()
+        self.assertEqual((unchanged["changed"], unchanged["trashed"]), ([], []))
+
+    def test_category_delete_marks_notes_changed(self):
+        category = Category.objects.create(owner=self.owner, name="İş")
+        filed = self.create_note("Rapor", category=category)
+        self.create_note("Diğer")
+        version = self.client.get("/api/notes/?since=0").json()["version"]
+
+        self.client.delete(f"/api/categories/{category.pk}/")
+        delta = self.client.get(f"/api/notes/?since={version}").json()
+        self.assertEqual([(note["id"], note["category"]) for note in delta["changed"]], [(filed.pk, None)])
+
+    def test_hard_deletes_are_returned(self):
+        single, batched, purged = (self.create_note(f"Not {i}") for i in range(3))
+        version = self.client.get("/api/notes/?since=0").json()["version"]
+
+        self.client.delete(f"/api/notes/{single.pk}/")
+        self.client.post("/api/notes/batch/", {"operations": [{"op": "delete", "id": batched.pk}]}, format="json")
+        self.client.post(f"/api/notes/{purged.pk}/trash/")
+        run_purge(request_purge(self.owner))
+        delta = self.client.get(f"/api/notes/?since={version}").json()
+        self.assertCountEqual(delta["deleted"], [single.pk, batched.pk, purged.pk])
+
+        unchanged = self.client.get(f"/api/notes/?since={delta['version']}").json()
+        self.assertEqual(unchanged["deleted"], [])
+
+    def test_resync_after_tombstones_pruned(self):
+        note = self.create_note()
+        version = self.client.get("/api/notes/?since=0").json()["version"]
+        self.client.delete(f"/api/notes/{note.pk}/")
+        self.assertEqual(prune_tombstones(days=0), 1)
+
+        delta = self.client.get(f"/api/notes/?since={version}").json()
+        self.assertTrue(delta["resync"])
+        self.assertNotIn("resync", self.client.get(f"/api/notes/?since={delta['version']}").json())
+
+    def test_invalid_version(self):
+        self.assertEqual(self.client.get("/api/notes/?since=dün").status_code, 400)
+
+
+class ReorderTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.a, self.b, self.c = (self.create_note(name, order=i) for i, name in enumerate("abc"))
+
+    def test_full_order(self):
+        response = self.client.put(
+            "/api/notes/update-order/", {"ordered_ids": [self.c.pk, self.a.pk, self.b.pk]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(note_ids(self.client.get("/api/notes/")), [self.c.pk, self.a.pk, self.b.pk])
+
+    def test_move_between_notes(self):
+        response = self.client.post(
+            "/api/notes/update-order/", {"note_id": self.a.pk, "after_id": self.b.pk, "before_id": self.c.pk},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(note_ids(self.client.get("/api/notes/")), [self.b.pk, self.a.pk, self.c.pk])
+
+    def test_move_to_end(self):
+        self.client.post("/api/notes/update-order/", {"note_id": self.a.pk, "after_id": self.c.pk}, format="json")
+        self.assertEqual(note_ids(self.client.get("/api/notes/")), [self.b.pk, self.c.pk, self.a.pk])
+
+    def test_move_after_keeps_following_note(self):
+        # b'nin hemen ardına: c'nin önünde kalmalı (b + ORDER_GAP değil)
+        self.client.post("/api/notes/update-order/", {"note_id": self.a.pk, "after_id": self.b.pk}, format="json")
+        self.assertEqual(note_ids(self.client.get("/api/notes/")), [self.b.pk, self.a.pk, self.c.pk])
+        self.client.post("/api/notes/update-order/", {"note_id": self.c.pk, "before_id": self.a.pk}, format="json")
+        self.assertEqual(note_ids(self.client.get("/api/notes/")), [self.b.pk, self.c.pk, self.a.pk])
+
+    def test_full_order_skips_trashed(self):
+        trashed = self.create_note("Çöp", order=7, is_deleted=True)
+        self.client.put("/api/notes/update-order/", {"ordered_ids": [trashed.pk, self.a.pk]}, format="json")
+        trashed.refresh_from_db()
+        self.assertEqual(trashed.order, 7)
+
+    def test_errors(self):
+        other = User.objects.create_user("mehmet")
+        foreign = Note.objects.create(owner=other, title="Başkasının")
+        response = self.client.post("/api/notes/update-order/", {"note_id": foreign.pk, "after_id": self.a.pk}, format="json")
+        self.assertEqual(response.status_code, 404)
+        for anchor in (foreign.pk, 10**6, self.a.pk):
+            with self.subTest(anchor=anchor):
+                response = self.client.post(
+                    "/api/notes/update-order/", {"note_id": self.a.pk, "after_id": anchor}, format="json"
+                )
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post("/api/notes/update-order/", {"ordered_ids": ["x"]}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+
+class BatchTests(NotesTestCase):
+    def batch(self, *operations):
+        return self.client.post("/api/notes/batch/", {"operations": list(operations)}, format="json")
+
+    def test_operations(self):
+        pinned, trashed, renamed = (self.create_note(f"Not {i}") for i in range(3))
+        category = Category.objects.create(owner=self.owner, name="İş")
+        response = self.batch(
+            {"op": "create", "title": "Yeni", "content": "<p>kalın <em>metin</em></p>", "tags": ["a"]},
+            {"op": "pin", "id": pinned.pk},
+            {"op": "trash", "id": trashed.pk},
+            {"op": "update", "id": renamed.pk, "title": "Yeni ad"},
+            {"op": "set_category", "id": renamed.pk, "category": category.pk},
+            {"op": "add_tags", "id": pinned.pk, "tags": ["b", "c"]},
+        )
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual({result["status"] for result in results}, {"ok"})
+
+        created = Note.objects.get(pk=results[0]["id"])
+        self.assertEqual(created.excerpt, "kalın metin")
+        self.assertEqual(list(created.tags.names()), ["a"])
+        pinned.refresh_from_db()
+        self.assertTrue(pinned.is_pinned)
+        self.assertCountEqual(pinned.tags.names(), ["b", "c"])
+        trashed.refresh_from_db()
+        self.assertTrue(trashed.is_deleted)
+        self.assertIsNotNone(trashed.deleted_at)
+        renamed.refresh_from_db()
+        self.assertEqual((renamed.title, renamed.category_id), ("Yeni ad", category.pk))
+        # Sinyalsiz yol da koleksiyon sürümünü ve arama indeksini günceller
+        self.assertCountEqual(note_ids(self.client.get("/api/notes/?search=Yeni")), [created.pk, renamed.pk])
+
+    def test_per_operation_errors(self):
+        note = self.create_note()
+        foreign = Note.objects.create(owner=User.objects.create_user("mehmet"), title="Başkasının")
+        results = self.batch(
+            {"op": "pin", "id": note.pk},
+            {"op": "uçur", "id": note.pk},
+            {"op": "pin", "id": foreign.pk},
+            {"op": "set_category", "id": note.pk, "category": 999},
+            "pin",
+        ).json()["results"]
+        self.assertEqual([result["status"] for result in results], ["ok", "error", "error", "error", "error"])
+        foreign.refresh_from_db()
+        self.assertFalse(foreign.is_pinned)
+
+    def test_update_category_and_sharing(self):
+        note = self.create_note()
+        category = Category.objects.create(owner=self.owner, name="İş")
+        foreign = Category.objects.create(owner=User.objects.create_user("mehmet"), name="Başkasının")
+        results = self.batch(
+            {"op": "update", "id": note.pk, "category": category.pk, "is_shared": True},
+            {"op": "create", "title": "Paylaşılan", "tags": [], "category": category.pk, "is_shared": True},
+            {"op": "update", "id": note.pk, "category": foreign.pk},
+            {"op": "update", "id": note.pk, "order": 5},
+        ).json()["results"]
+        self.assertEqual([result["status"] for result in results], ["ok", "ok", "error", "error"])
+        self.assertIn("order", results[3]["errors"])
+
+        for note in Note.objects.filter(pk__in=[note.pk, results[1]["id"]]):
+            self.assertEqual((note.category_id, note.is_shared), (category.pk, True))
+            self.assertEqual(self.client.get(f"/api/public-notes/{note.share_uuid}/").status_code, 200)
+
+    def test_delete(self):
+        note = self.create_note()
+        self.batch({"op": "delete", "id": note.pk})
+        self.assertFalse(Note.objects.filter(pk=note.pk).exists())
+
+    def test_requires_list(self):
+        self.assertEqual(self.client.post("/api/notes/batch/", {"operations": {}}, format="json").status_code, 400)
+
+
+class SearchIndexTests(NotesTestCase):
+    def test_reindexes_only_searchable_changes(self):
+        note = self.create_note("Alışveriş", "<p>süt</p>")
+        with CaptureQueriesContext(connection) as queries:
+            note.is_pinned = True
+            note.save()
+            note.refresh_from_db()
+            note.order = 3
+            note.save(update_fields=["order"])
+        self.assertFalse([query for query in queries if "notes_note_fts" in query["sql"]])
+
+        note.title = "Pazar"
+        note.save()
+        self.assertEqual(note_ids(self.client.get("/api/notes/?search=Pazar")), [note.pk])
+        self.assertEqual(note_ids(self.client.get("/api/notes/?search=Alışveriş")), [])
+        note.tags.add("market")
+        self.assertEqual(note_ids(self.client.get("/api/notes/?search=market")), [note.pk])
+
+
+class PublicNoteTests(NotesTestCase):
+    def test_shared_caches_revalidate_with_etag(self):
+        note = self.create_note("Paylaşılan", is_shared=True, share_uuid=uuid.uuid4())
+        url = f"/api/public-notes/{note.share_uuid}/"
+        response = self.client.get(url)
+        cache_control = {part.strip() for part in response["Cache-Control"].split(",")}
+        self.assertEqual(cache_control, {"public", f"max-age={settings.PUBLIC_NOTE_MAX_AGE}", "must-revalidate"})
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+        note.is_shared = False
+        note.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 404)
+
+
+    def test_cached_payload_is_rechecked(self):
+        # Başka bir worker'daki değişiklik bu sürecin önbelleğini silmez
+        note = self.create_note("Paylaşılan", is_shared=True, share_uuid=uuid.uuid4())
+        url = f"/api/public-notes/{note.share_uuid}/"
+        self.assertEqual(self.client.get(url).json()["title"], "Paylaşılan")
+
+        Note.objects.filter(pk=note.pk).update(title="Yeni", version=note.version + 1)
+        self.assertEqual(self.client.get(url).json()["title"], "Yeni")
+        Note.objects.filter(pk=note.pk).update(is_shared=False)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class RevisionTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.note = self.create_note("Taslak", "bir iki üç")
+        for content in ("bir iki dört", "bir beş dört"):
+            self.note.content = content
+            self.note.save()
+        self.url = f"/api/notes/{self.note.pk}/revisions/"
+
+    def test_list_and_detail(self):
+        revisions = self.client.get(self.url).json()
+        self.assertEqual([revision["number"] for revision in revisions], [3, 2, 1])
+        self.assertEqual(self.client.get(f"{self.url}1/").json()["content"], "bir iki üç")
+        self.assertEqual(self.client.get(f"{self.url}3/").json()["content"], "bir beş dört")
+        self.assertEqual(self.client.get(f"{self.url}9/").status_code, 404)
+
+    def test_diff(self):
+        diff = self.client.get(f"{self.url}2/diff/").json()
+        self.assertEqual(diff["against"], 1)
+        self.assertIsNone(diff["title"])
+        self.assertEqual(
+            [(change["op"], change["text"].strip()) for change in diff["changes"] if change["op"] != "equal"],
+            [("delete", "üç"), ("insert", "dört")],
+        )
+        against = self.client.get(f"{self.url}3/diff/?against=1").json()
+        self.assertEqual(against["against"], 1)
+
+    def test_restore(self):
+        response = self.client.post(f"{self.url}1/restore/")
+        self.assertEqual(response.status_code, 200)
+        self.note.refresh_from_db()
+        self.assertEqual(self.note.content, "bir iki üç")
+        # Geri yükleme de yeni bir revizyon
+        self.assertEqual(self.client.get(self.url).json()[0]["number"], 4)
+
+
+class TransferTests(NotesTestCase):
+    def export(self, query=""):
+        response = self.client.get(f"/api/notes/export/{query}")
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_round_trip(self):
+        category = Category.objects.create(owner=self.owner, name="Ev", color="#ff0000")
+        note = self.create_note("Alışveriş", "süt, ekmek", category=category, is_pinned=True)
+        note.tags.add("market")
+        self.create_note("Eski", is_deleted=True)
+
+        records = self.export()
+        self.assertEqual([record["title"] for record in records], ["Alışveriş"])
+        self.assertEqual(len(self.export("?trashed=1")), 2)
+        self.assertEqual(records[0]["tags"], ["market"])
+        self.assertEqual(records[0]["category"], {"name": "Ev", "color": "#ff0000"})
+
+        other = User.objects.create_user("mehmet")
+        self.client.force_authenticate(other)
+        body = "\n".join(json.dumps(record) for record in records) + "\n{bozuk\n"
+        response = self.client.post("/api/notes/import/", body, content_type="application/x-ndjson")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.json()["imported"], response.json()["failed"]), (1, 1))
+
+        imported = Note.objects.get(owner=other)
+        self.assertEqual((imported.title, imported.content, imported.is_pinned), ("Alışveriş", "süt, ekmek", True))
+        self.assertEqual(list(imported.tags.names()), ["market"])
+        self.assertEqual(imported.category.name, "Ev")
+        self.assertNotEqual(imported.category_id, category.pk)
+        self.assertEqual(note_ids(self.client.get("/api/notes/?search=süt")), [imported.pk])
+
+    def test_import_requires_body(self):
+        response = self.client.post("/api/notes/import/", {}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+
+class TrashTests(NotesTestCase):
+    def test_restore_all(self):
+        notes = [self.create_note(f"Not {i}") for i in range(3)]
+        for note in notes:
+            self.client.post(f"/api/notes/{note.pk}/trash/")
+        self.assertEqual(len(self.client.get("/api/trashed-notes/").json()), 3)
+
+        response = self.client.post("/api/trashed-notes/restore-all/")
+        self.assertEqual(response.json()["count"], 3)
+        self.assertEqual(self.client.get("/api/trashed-notes/").json(), [])
+        self.assertCountEqual(note_ids(self.client.get("/api/notes/")), [note.pk for note in notes])
+
+    def test_empty_all_runs_inline_without_worker(self):
+        note = self.create_note()
+        self.client.post(f"/api/notes/{note.pk}/trash/")
+        Note.objects.filter(pk=note.pk).update(deleted_at=None) # deleted_at alanından önce atılmış
+        response = self.client.delete("/api/trashed-notes/empty-all/")
+        self.assertEqual((response.status_code, response.json()["count"]), (200, 1))
+        self.assertFalse(Note.objects.filter(pk=note.pk).exists())
+
+    @override_settings(TRASH_PURGE_WORKER=True)
+    def test_pending_purge_hides_notes_without_deleted_at(self):
+        legacy = self.create_note("Eski")
+        self.client.post(f"/api/notes/{legacy.pk}/trash/")
+        Note.objects.filter(pk=legacy.pk).update(deleted_at=None)
+        self.assertEqual(self.client.delete("/api/trashed-notes/empty-all/").status_code, 202)
+        self.assertEqual(self.client.get("/api/trashed-notes/").json(), [])
+        self.assertEqual(self.client.post("/api/trashed-notes/restore-all/").json()["count"], 0)
+
+    @override_settings(TRASH_PURGE_WORKER=True)
+    def test_restore_all_skips_pending_purge(self):
+        purged = self.create_note("Boşaltılacak")
+        self.client.post(f"/api/notes/{purged.pk}/trash/")
+        request_purge(self.owner)
+        kept = self.create_note("Sonra atılan")
+        self.client.post(f"/api/notes/{kept.pk}/trash/")
+
+        self.assertEqual(note_ids(self.client.get("/api/trashed-notes/")), [kept.pk])
+        self.assertEqual(self.client.put("/api/trashed-notes/restore-all/").json()["count"], 1)
+        purged.refresh_from_db()
+        self.assertTrue(purged.is_deleted)
@@ -0,0 +1,48 @@
+"""
+Önbellekli token doğrulama: sinyal tetiklemeyen toplu admin işlemlerinden
+sonra önbellekteki token'lar geçersizleşir.
+"""
+from unittest import mock
+
+from cachetools import TTLCache
+from django.contrib.auth.models import User
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from .base import NotesTestCase
+
+
+class TokenCacheTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(None)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=self.owner).key}")
+        self.admin = APIClient()
+        self.admin.force_login(User.objects.create_superuser("yonetici", "yonetici@example.com", "parola"))
+        # Token önbelleğe girsin
+        self.assertEqual(self.client.get("/api/notes/").status_code, 200)
+
+    def run_action(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.admin.post(
+                "/admin/auth/user/", {"action": action, "_selected_action": [self.owner.pk]},
+            )
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivate_action_forgets_cached_tokens(self):
+        self.run_action("deactivate_users")
+        self.owner.refresh_from_db()
+        self.assertFalse(self.owner.is_active)
+        self.assertEqual(self.client.get("/api/notes/").status_code, 401)
+
+    def test_revoke_action_forgets_cached_tokens(self):
+        self.run_action("revoke_tokens")
+        self.assertFalse(Token.objects.filter(user=self.owner).exists())
+        self.assertEqual(self.client.get("/api/notes/").status_code, 401)
+
+    def test_zero_ttl_disables_local_cache(self):
+        # AUTH_TOKEN_CACHE_TTL=0: sinyalsiz pasifleştirme de hemen geçerli
+        with mock.patch("notes.authentication._tokens", TTLCache(maxsize=10, ttl=0)):
+            self.assertEqual(self.client.get("/api/notes/").status_code, 200)
+            User.objects.filter(pk=self.owner.pk).update(is_active=False)
+            self.assertEqual(self.client.get("/api/notes/").status_code, 401)
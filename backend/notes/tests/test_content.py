@@ -0,0 +1,16 @@
+from django.test import SimpleTestCase
+
+from notes.content import render, sanitize
+
+
+class SanitizeTests(SimpleTestCase):
+    def test_literal_escaped_markup_stays_text(self):
+        content = "<p>&lt;b&gt;kalın değil&lt;/b&gt; &amp;amp;</p>"
+        self.assertEqual(sanitize(content), content)
+        self.assertEqual(render(content)["excerpt"], "<b>kalın değil</b> &amp;")
+
+    def test_fully_escaped_legacy_content_is_unescaped(self):
+        self.assertEqual(sanitize("&lt;p&gt;eski &amp;amp; not&lt;/p&gt;"), "<p>eski &amp; not</p>")
+
+    def test_plain_text_with_entities(self):
+        self.assertEqual(sanitize("a &lt; b"), "a &lt; b")
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from notes.events import EventStreamApplication, get_broker
+from notes.models import Note
+
+ORIGIN = "http://localhost:5173"
+
+
+async def not_found(scope, receive, send):
+    await send({"type": "http.response.start", "status": 404, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+class Connection:
+    """
+    EventStreamApplication'a tek bir HTTP isteği gönderir; yanıt başlığını
+    ve gövde parçalarını toplar, `close` ile istemci kopmuş gibi davranır.
+    """
+    def __init__(self, app, method="GET", query="", headers=()):
+        self.scope = {
+            "type": "http", "method": method, "path": "/api/events/",
+            "query_string": query.encode(), "headers": list(headers),
+        }
+        self.start = None
+        self.chunks = asyncio.Queue()
+        self.disconnect = asyncio.Event()
+        self.task = asyncio.ensure_future(app(self.scope, self.receive, self.send))
+
+    async def receive(self):
+        await self.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+        else:
+            await self.chunks.put(message.get("body", b""))
+
+    @property
+    def status(self):
+        return self.start["status"]
+
+    @property
+    def headers(self):
+        return dict(self.start["headers"])
+
+    async def read(self):
+        return await asyncio.wait_for(self.chunks.get(), 5)
+
+    async def events(self, count):
+        events = []
+        while len(events) < count:
+            chunk = await self.read()
+            if chunk.startswith(b"data: "):
+                events.append(json.loads(chunk[6:]))
+        return events
+
+    async def close(self):
+        self.disconnect.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+class EventStreamTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("ayse")
+        self.token = Token.objects.create(user=self.user)
+        self.app = EventStreamApplication(not_found)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ticket(self):
+        response = self.client.post("/api/events/ticket/")
+        self.assertEqual(response.status_code, 201)
+        return response.json()["ticket"]
+
+    async def test_ticket_is_single_use(self):
+        ticket = await sync_to_async(self.ticket)()
+        connection = Connection(self.app, query=f"ticket={ticket}")
+        self.assertEqual((await connection.events(1))[0]["type"], "ready")
+        self.assertEqual(connection.status, 200)
+        await connection.close()
+
+        reused = Connection(self.app, query=f"ticket={ticket}")
+        await reused.task
+        self.assertEqual(reused.status, 401)
+
+    async def test_query_token_is_not_accepted(self):
+        connection = Connection(self.app, query=f"token={self.token.key}")
+        await connection.task
+        self.assertEqual(connection.status, 401)
+
+    async def test_authorization_header(self):
+        connection = Connection(self.app, headers=[(b"authorization", f"Token {self.token.key}".encode())])
+        self.assertEqual((await connection.events(1))[0]["type"], "ready")
+        await connection.close()
+
+    def test_ticket_requires_authentication(self):
+        self.assertEqual(APIClient().post("/api/events/ticket/").status_code, 401)
+
+    @override_settings(CORS_ALLOWED_ORIGINS=[ORIGIN], CORS_ALLOW_CREDENTIALS=True)
+    async def test_cors(self):
+        allowed = Connection(self.app, headers=[(b"origin", ORIGIN.encode())])
+        await allowed.task
+        self.assertEqual(allowed.status, 401)
+        self.assertEqual(allowed.headers[b"access-control-allow-origin"], ORIGIN.encode())
+
+        preflight = Connection(self.app, method="OPTIONS", headers=[(b"origin", ORIGIN.encode())])
+        await preflight.task
+        self.assertIn(b"authorization", preflight.headers[b"access-control-allow-headers"])
+
+        other = Connection(self.app, headers=[(b"origin", b"https://example.com")])
+        await other.task
+        self.assertNotIn(b"access-control-allow-origin", other.headers)
+
+
+class IdleConnectionTests(TransactionTestCase):
+    """
+    backend.asgi üzerinden çok sayıda boştaki bağlantı: thread tutulmaz,
+    olay kullanıcının tüm bağlantılarına ulaşır, kopanların aboneliği kalmaz.
+    """
+    connections = 200
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(f"kullanici{i}") for i in range(4)]
+        self.tokens = [Token.objects.create(user=user).key for user in self.users]
+
+    async def test_many_idle_connections(self):
+        from backend.asgi import application
+
+        broker = get_broker()
+        threads = threading.active_count()
+        clients = [
+            Connection(application, headers=[(b"authorization", f"Token {self.tokens[i % 4]}".encode())])
+            for i in range(self.connections)
+        ]
+        for client in clients:
+            self.assertEqual((await client.events(1))[0]["type"], "ready")
+        self.assertEqual(broker.connection_count(), self.connections)
+        # Doğrulama ortak thread havuzunda yapılır; bağlantı başına thread yok
+        self.assertLess(threading.active_count() - threads, 40)
+
+        note = await sync_to_async(Note.objects.create)(owner=self.users[0], title="Yeni")
+        for client in clients[::4]:
+            self.assertEqual(await client.events(1), [{"type": "note.created", "id": note.pk, "version": note.version}])
+        self.assertTrue(all(client.chunks.empty() for index, client in enumerate(clients) if index % 4))
+
+        await asyncio.gather(*(client.close() for client in clients))
+        self.assertEqual(broker.connection_count(), 0)
@@ -0,0 +1,36 @@
+"""
+Sıcak sorguların tablo taraması yerine indeks kullandığı
+(bkz. notes/benchmarks/explain.py).
+"""
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+
+from notes.benchmarks.data import seed_notes
+from notes.benchmarks.explain import hot_queries
+from notes.models import Category, Note
+
+# Tablo veya indeksin baştan sona taranması. SQLite: "SCAN notes_note"
+# (SEARCH değil), PostgreSQL: "Seq Scan on notes_note"
+FULL_SCAN = re.compile(rf"\bSCAN {Note._meta.db_table}\b|Seq Scan on {Note._meta.db_table}\b")
+
+
+class HotQueryIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owners = [User.objects.create(username=f"kullanici{i}") for i in range(5)]
+        for index, owner in enumerate(owners):
+            categories = [Category.objects.create(owner=owner, name=f"kategori{i}") for i in range(5)]
+            seed_notes(owner, 400, trashed_ratio=0.2, content_words=20, seed=index, categories=categories)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.owner = owners[0]
+
+    def test_hot_queries_use_index(self):
+        for name, queryset, index in hot_queries(self.owner):
+            with self.subTest(name):
+                plan = queryset.explain()
+                self.assertIn(index, plan)
+                self.assertNotRegex(plan, FULL_SCAN)
@@ -0,0 +1,46 @@
+"""
+İstek ölçümü: serileştirici süresi view süresinden ayrı raporlanır.
+"""
+import time
+from unittest import mock
+
+from django.test import override_settings
+
+from notes.instrumentation import registry
+from notes.serializers import NoteSerializer
+
+from .base import NotesTestCase
+
+
+def timings(response):
+    entries = {}
+    for entry in response["Server-Timing"].split(", "):
+        name, _, params = entry.partition(";")
+        entries[name] = float(params.split(";")[0].removeprefix("dur="))
+    return entries
+
+
+@override_settings(PERF_INSTRUMENTATION=True)
+class ServerTimingTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        registry.reset()
+        self.create_note("Not")
+
+    def test_serializer_time_is_not_counted_as_view_time(self):
+        original = NoteSerializer.to_representation
+
+        def slow(serializer, instance):
+            time.sleep(0.05)
+            return original(serializer, instance)
+
+        with mock.patch.object(NoteSerializer, "to_representation", slow):
+            response = self.client.get("/api/notes/")
+        entries = timings(response)
+        self.assertGreaterEqual(entries["serializer"], 50)
+        self.assertLess(entries["view"], 50)
+
+    def test_serializer_time_in_metrics(self):
+        self.client.get("/api/notes/")
+        endpoints = registry.snapshot()["endpoints"]
+        self.assertIn("serializer_mean_ms", endpoints["GET note-list"])
@@ -0,0 +1,17 @@
+"""
+Not uç noktalarının sorgu bütçeleri (bkz. notes/benchmarks/queries.py).
+Sorgu sayısı not sayısından bağımsız olmalı ve bütçeyi aşmamalıdır.
+"""
+from notes.benchmarks.queries import BUDGETS, measure_all
+
+from .base import NotesTestCase
+
+
+class QueryBudgetTests(NotesTestCase):
+    def test_endpoints_within_budget(self):
+        small = measure_all(20)
+        large = measure_all(60)
+        for url, budget in BUDGETS.items():
+            with self.subTest(url=url):
+                self.assertLessEqual(large[url], budget)
+                self.assertEqual(small[url], large[url], "Sorgu sayısı not sayısına bağlı.")
@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from notes.models import NoteSignature
+from notes.similarity import forget_indexes, note_tokens
+
+from .base import NotesTestCase
+
+
+class SimilarityTests(NotesTestCase):
+    def setUp(self):
+        super().setUp()
+        forget_indexes()
+        self.original = self.create_note("Market listesi", "<p>süt ekmek peynir zeytin domates yumurta</p>")
+        self.copy = self.create_note("Market listesi", "<p>süt ekmek peynir zeytin domates biber</p>")
+        self.other = self.create_note("Toplantı", "<p>bütçe planı sunum tarihleri</p>")
+
+    def test_related(self):
+        response = self.client.get(f"/api/notes/{self.original.pk}/related/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["id"], self.copy.pk)
+
+    def test_duplicates(self):
+        response = self.client.get("/api/notes/duplicates/?threshold=0.5")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [[note["id"] for note in group["notes"]] for group in response.json()],
+            [[self.original.pk, self.copy.pk]],
+        )
+
+    @override_settings(SIMILARITY_SIGNATURE_BUDGET=2)
+    def test_missing_signatures_are_computed_in_steps(self):
+        first = self.client.get("/api/notes/duplicates/?threshold=0.5")
+        self.assertEqual(first.status_code, 202)
+        self.assertNotIn("ETag", first)
+        self.assertEqual(NoteSignature.objects.count(), 2)
+        second = self.client.get("/api/notes/duplicates/?threshold=0.5")
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.json()), 1)
+
+    def test_backfill_command(self):
+        call_command("compute_note_signatures", stdout=StringIO())
+        self.assertEqual(NoteSignature.objects.count(), 3)
+        self.original.content = "<p>yepyeni içerik</p>"
+        self.original.save()
+        call_command("compute_note_signatures", stdout=StringIO())
+        signature = NoteSignature.objects.get(note=self.original)
+        self.original.refresh_from_db()
+        self.assertEqual(signature.version, self.original.version)
+
+    def test_short_notes_are_not_duplicates(self):
+        for number in range(3):
+            self.create_note(f"Not {number}")
+        self.create_note("Not")
+        self.create_note("Not")
+        groups = self.client.get("/api/notes/duplicates/?threshold=0.5").json()
+        self.assertEqual(
+            [[note["id"] for note in group["notes"]] for group in groups],
+            [[self.original.pk, self.copy.pk]],
+        )
+
+    def test_numbers_are_tokens(self):
+        self.assertEqual(note_tokens("Not 2", "<p>ve 15 kg</p>", ["ev"]), {"not", "2", "15", "#ev"})
@@ -0,0 +1,290 @@
+"""
+Kullanıcının notlarının toplu dışa ve içe aktarılması.
+
+Dışa aktarma notları id sırasıyla EXPORT_CHUNK_SIZE'lık parçalar halinde
+okur ve StreamingHttpResponse ile akıtır; not sayısından bağımsız olarak
+bellekte sadece bir parça tutulur. İki biçim vardır:
+- NDJSON: satır başına bir not; içe aktarmanın kabul ettiği kayıpsız biçim,
+- zip: not başına bir Markdown dosyası (başlık, etiket, kategori ve tarihler
+  front matter olarak), başka araçlara taşımak için.
+
+İçe aktarma NDJSON girdiyi satır satır okur ve IMPORT_BATCH_SIZE'lık
+partiler halinde işler. Her parti kendi transaction'ında kategoriler,
+notlar ve etiketler için bulk_create ile yazılır; sinyaller tetiklenmediği
+için arama indeksi, istatistik sayaçları ve koleksiyon sürümü burada
+güncellenir (bkz. notes/bulk.py). Hatalı satırlar atlanır ve raporlanır.
+"""
+import io
+import json
+import zipfile
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, When, Value
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from . import stats
+from .content import markdown, render
+from .events import emit
+from .models import Note, Category
+from .revisions import record_snapshots
+from .search import get_search_backend
+from .serializers import NoteSerializer
+from .tagging import add_tags, clean_tags, tag_names
+from .versioning import bump_version
+
+# Kayıtta bulunan ve içe aktarmada kullanılan alanlar
+EXPORT_FIELDS = ('title', 'content', 'is_pinned', 'is_private', 'is_deleted', 'order', 'created_at', 'updated_at')
+
+
+# --- DIŞA AKTARMA ---
+def iter_notes(owner, include_trashed=False, chunk_size=None):
+    """
+    Notları id sırasıyla parça parça okur; her not için bir kayıt (dict) üretir.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    categories = {
+        pk: {'name': name, 'color': color}
+        for pk, name, color in Category.objects.filter(owner=owner).values_list('pk', 'name', 'color')
+    }
+    notes = Note.objects.filter(owner=owner).order_by('pk')
+    if not include_trashed:
+        notes = notes.filter(is_deleted=False)
+    notes = notes.values('pk', 'category_id', 'content_html', *EXPORT_FIELDS)
+    last_pk = 0
+    while True:
+        chunk = list(notes.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        names = tag_names([row['pk'] for row in chunk])
+        for row in chunk:
+            yield {
+                'id': row['pk'],
+                **{name: row[name] for name in EXPORT_FIELDS},
+                'created_at': row['created_at'].isoformat(),
+                'updated_at': row['updated_at'].isoformat(),
+                'category': categories.get(row['category_id']),
+                'tags': sorted(names[row['pk']]),
+                'content_html': row['content_html'],
+            }
+        last_pk = chunk[-1]['pk']
+
+
+def export_ndjson(owner, include_trashed=False):
+    for record in iter_notes(owner, include_trashed):
+        record.pop('content_html')
+        yield json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class ZipStream(io.RawIOBase):
+    """
+    zipfile'ın yazdığı baytları biriktiren, geri sarılamayan (unseekable)
+    akış. zipfile bu durumda yerel başlıkları veri tanımlayıcılarıyla yazar;
+    böylece her dosyadan sonra biriken baytlar hemen gönderilebilir.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def markdown_document(record):
+    front_matter = {
+        'title': record['title'],
+        'tags': record['tags'],
+        'category': record['category']['name'] if record['category'] else None,
+        'pinned': record['is_pinned'],
+        'created_at': record['created_at'],
+        'updated_at': record['updated_at'],
+    }
+    # JSON değerleri geçerli YAML'dır; başlıklardaki özel karakterler kaçışlanır
+    lines = ['---'] + [f'{key}: {json.dumps(value, ensure_ascii=False)}' for key, value in front_matter.items()]
+    return '\n'.join(lines) + '\n---\n\n' + markdown(record['content_html'])
+
+
+def export_markdown_zip(owner, include_trashed=False):
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for record in iter_notes(owner, include_trashed):
+            folder = 'trash/' if record['is_deleted'] else ''
+            name = f"{folder}{slugify(record['title'], allow_unicode=True) or 'not'}-{record['id']}.md"
+            archive.writestr(name, markdown_document(record))
+            yield stream.pop()
+    # Merkezi dizin
+    yield stream.pop()
+
+
+# --- İÇE AKTARMA ---
+class RecordError(Exception):
+    pass
+
+
+def iter_lines(stream):
+    """
+    Yüklenen dosya veya istek gövdesinden satır satır (line_number, kayıt) üretir.
+    JSON olmayan satırlar için kayıt yerine RecordError döner.
+    """
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except (UnicodeDecodeError, ValueError):
+            yield line_number, RecordError("Geçersiz JSON.")
+            continue
+        yield line_number, record if isinstance(record, dict) else RecordError("Her satır bir nesne olmalı.")
+
+
+class NoteImporter:
+    """
+    NDJSON kayıtlarını partiler halinde kullanıcının notları olarak ekler.
+    """
+    def __init__(self, owner, batch_size=None):
+        self.owner = owner
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.categories = None
+        self.summary = {'imported': 0, 'failed': 0, 'batches': 0, 'errors': []}
+
+    def run(self, stream):
+        for _ in self.batches(stream):
+            pass
+        return self.summary
+
+    def batches(self, stream):
+        """
+        Her parti yazıldıktan sonra o ana kadarki özeti üretir (ilerleme için).
+        """
+        self.categories = dict(Category.objects.filter(owner=self.owner).values_list('name', 'pk'))
+        batch = []
+        for line_number, record in iter_lines(stream):
+            try:
+                if isinstance(record, RecordError):
+                    raise record
+                batch.append(self.parse(line_number, record))
+            except RecordError as e:
+                self.fail(line_number, e.args[0])
+            if len(batch) >= self.batch_size:
+                yield self.flush(batch)
+                batch = []
+        if batch:
+            yield self.flush(batch)
+
+    def fail(self, line_number, errors):
+        self.summary['failed'] += 1
+        # Yanıt boyutu sınırlı kalsın
+        if len(self.summary['errors']) < settings.IMPORT_MAX_ERRORS:
+            self.summary['errors'].append({'line': line_number, 'errors': errors})
+
+    def flush(self, batch):
+        self.apply(batch)
+        self.summary['imported'] += len(batch)
+        self.summary['batches'] += 1
+        return self.summary
+
+    # --- Doğrulama (sorgusuz) ---
+    def parse(self, line_number, record):
+        payload = {
+            'title': record.get('title'),
+            'content': record.get('content') or '',
+            'is_pinned': record.get('is_pinned', False),
+            'is_private': record.get('is_private', False),
+            'tags': record.get('tags') or [],
+        }
+        serializer = NoteSerializer(data=payload)
+        if not serializer.is_valid():
+            raise RecordError(serializer.errors)
+        data = serializer.validated_data
+        parsed = {
+            'line': line_number,
+            'fields': {name: data[name] for name in ('title', 'content', 'is_pinned', 'is_private') if name in data},
+            'tags': clean_tags(data.get('tags') or []),
+            'is_deleted': bool(record.get('is_deleted')),
+            'created_at': None,
+            'category': None,
+        }
+        order = record.get('order')
+        if order is not None:
+            if not isinstance(order, int) or order < 0:
+                raise RecordError({'order': 'Negatif olmayan bir tamsayı olmalı.'})
+            parsed['fields']['order'] = order
+        if record.get('created_at'):
+            created_at = parse_datetime(str(record['created_at']))
+            if created_at is None:
+                raise RecordError({'created_at': 'Geçersiz tarih.'})
+            if timezone.is_naive(created_at):
+                created_at = timezone.make_aware(created_at)
+            parsed['created_at'] = created_at
+        category = record.get('category')
+        if category:
+            if isinstance(category, str):
+                category = {'name': category}
+            name = str(category.get('name') or '').strip()[:Category._meta.get_field('name').max_length]
+            if name:
+                parsed['category'] = {'name': name, 'color': str(category.get('color') or '')[:7]}
+        return parsed
+
+    # --- Uygulama ---
+    @transaction.atomic
+    def apply(self, batch):
+        now = timezone.now()
+        version = bump_version(self.owner.pk)
+
+        # 1. Eksik kategoriler
+        missing = {}
+        for item in batch:
+            category = item['category']
+            if category and category['name'] not in self.categories:
+                missing.setdefault(category['name'], category['color'])
+        if missing:
+            created = Category.objects.bulk_create([
+                Category(owner=self.owner, name=name, **({'color': color} if color else {}))
+                for name, color in missing.items()
+            ])
+            self.categories.update({category.name: category.pk for category in created})
+
+        # 2. Notlar
+        notes = Note.objects.bulk_create([
+            Note(
+                owner=self.owner, version=version,
+                is_deleted=item['is_deleted'], deleted_at=now if item['is_deleted'] else None,
+                category_id=self.categories[item['category']['name']] if item['category'] else None,
+                **item['fields'], **render(item['fields'].get('content')),
+            )
+            for item in batch
+        ])
+        note_ids = [note.pk for note in notes]
+
+        # created_at auto_now_add olduğu için bulk_create'te yok sayılır
+        created_at = {note.pk: item['created_at'] for item, note in zip(batch, notes) if item['created_at']}
+        if created_at:
+            Note.objects.filter(pk__in=list(created_at)).update(created_at=Case(
+                *[When(pk=pk, then=Value(value)) for pk, value in created_at.items()],
+                output_field=Note._meta.get_field('created_at'),
+            ))
+
+        # 3. Etiketler
+        tags = {note.pk: item['tags'] for item, note in zip(batch, notes) if item['tags']}
+        if tags:
+            add_tags(tags)
+
+        # Yan etkiler: arama indeksi, istatistikler ve ilk revizyonlar
+        names = tag_names(note_ids)
+        get_search_backend().index_notes(
+            (note.pk, note.title, note.content, names[note.pk]) for note in notes
+        )
+        stats.apply_state_changes({}, stats.states(note_ids))
+        record_snapshots((note.pk, note.title, note.content, now) for note in notes)
+        emit(self.owner.pk, 'notes.changed', count=len(note_ids), version=version)
@@ -3,11 +3,16 @@ from rest_framework.routers import DefaultRouter
 # View'leri import ediyoruz
 from .views import (
     NoteViewSet,
+    AITagGeneratorView,
+    AITagBatchView,
     TagCloudView,
-    # TrendingTagsView, # Bu view henüz implemente edilmedi.
+    TrendingTagsView,
     TrashedNoteViewSet,
     PublicNoteViewSet,
-    CategoryViewSet
+    CategoryViewSet,
+    MetricsView,
+    NoteEventsView,
+    NoteEventTicketView,
 )
 
 router = DefaultRouter()
@@ -18,6 +23,11 @@ router.register("categories", CategoryViewSet, basename="category")
 
 urlpatterns = [
     path("tags/", TagCloudView.as_view(), name="tag-cloud"),
-    # path("trending-tags/", TrendingTagsView.as_view(), name="trending-tags"),
+    path("ai/tags/", AITagGeneratorView.as_view(), name="ai-tags"),
+    path("ai/tags/batch/", AITagBatchView.as_view(), name="ai-tags-batch"),
+    path("trending-tags/", TrendingTagsView.as_view(), name="trending-tags"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("events/", NoteEventsView.as_view(), name="note-events"),
+    path("events/ticket/", NoteEventTicketView.as_view(), name="note-events-ticket"),
     path("", include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+Kullanıcı bazlı koleksiyon sürümü, ETag/Last-Modified ve artımlı senkronizasyon.
+
+Not, kategori ve etiket yazmaları (notes/signals.py ve toplu güncellemeler)
+`bump_version` ile kullanıcının sayacını artırır. Liste uç noktaları bu
+sayaçtan ETag üretir; `If-None-Match` tutarsa sorgu seti ve serializer hiç
+çalışmadan 304 döner.
+
+Kalıcı silinen notların satırı kalmadığından silmeler NoteTombstone olarak
+sürümüyle kaydedilir (`record_tombstones`); ?since= yanıtı bunları `deleted`
+listesinde döner. NOTE_TOMBSTONE_RETENTION_DAYS günden eski kayıtlar
+`prune_tombstones` ile silinir; silinen aralıktan eski bir ?since= için
+`resync` döner ve istemci listeyi baştan çeker.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from .models import CollectionVersion, NoteTombstone
+
+
+def bump_version(user_id):
+    """
+    Kullanıcının sürümünü bir artırır ve yeni değeri döner.
+    """
+    with transaction.atomic():
+        updated = CollectionVersion.objects.filter(user_id=user_id).update(
+            version=F('version') + 1, updated_at=timezone.now()
+        )
+        if not updated:
+            try:
+                with transaction.atomic():
+                    CollectionVersion.objects.create(user_id=user_id, version=1)
+                return 1
+            except IntegrityError:
+                # Aynı anda başka bir istek satırı oluşturdu
+                CollectionVersion.objects.filter(user_id=user_id).update(
+                    version=F('version') + 1, updated_at=timezone.now()
+                )
+        return CollectionVersion.objects.values_list('version', flat=True).get(user_id=user_id)
+
+
+def record_tombstones(owner_id, note_ids, version):
+    NoteTombstone.objects.bulk_create([
+        NoteTombstone(owner_id=owner_id, note_id=note_id, version=version) for note_id in note_ids
+    ])
+
+
+def deleted_since(request, since):
+    """
+    `since` sürümünden sonra kalıcı silinen not id'leri; o aralığın kayıtları
+    temizlendiyse None (istemci listeyi baştan çekmeli).
+    """
+    get_version(request)
+    if since < request._tombstones_pruned:
+        return None
+    return list(NoteTombstone.objects.filter(owner_id=request.user.pk, version__gt=since).values_list('note_id', flat=True))
+
+
+def prune_tombstones(days=None):
+    """
+    Saklama süresini aşan silme kayıtlarını siler ve kullanıcıların
+    `tombstones_pruned` sürümünü ilerletir; silinen kayıt sayısını döner.
+    """
+    days = settings.NOTE_TOMBSTONE_RETENTION_DAYS if days is None else days
+    expired = NoteTombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days))
+    with transaction.atomic():
+        for owner_id, version in expired.values_list('owner_id').annotate(version=Max('version')):
+            CollectionVersion.objects.filter(user_id=owner_id, tombstones_pruned__lt=version).update(
+                tombstones_pruned=version
+            )
+        deleted, _ = expired.delete()
+    return deleted
+
+
+def get_version(request):
+    """
+    (sürüm, son değişiklik zamanı) çiftini döner; istek başına bir kez sorgulanır.
+    """
+    if not hasattr(request, '_collection_version'):
+        row = CollectionVersion.objects.filter(user_id=request.user.pk).values_list(
+            'version', 'updated_at', 'tombstones_pruned'
+        ).first() or (0, None, 0)
+        request._collection_version = row[:2]
+        request._tombstones_pruned = row[2]
+    return request._collection_version
+
+
+def collection_etag(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    version, _ = get_version(request)
+    # Aynı sürümde farklı sorgu parametreleri farklı gövde döndürür
+    variant = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()[:12]
+    return f'W/"{request.user.pk}-{version}-{variant}"'
+
+
+def collection_last_modified(request, *args, **kwargs):
+    if not request.user.is_authenticated:
+        return None
+    return get_version(request)[1]
+
+
+def conditional_collection(view_method):
+    """
+    Liste metotları için koşullu GET. İstemci her seferinde doğrulama yapsın
+    diye yanıtlar `private, no-cache` olarak işaretlenir.
+    """
+    conditional = method_decorator(condition(
+        etag_func=collection_etag,
+        last_modified_func=collection_last_modified,
+    ))(view_method)
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        response = conditional(self, request, *args, **kwargs)
+        if response.status_code not in (200, 304):
+            # Hata ve eksik (202) yanıtlar sürümün gösterimi değildir; ETag
+            # taşırlarsa sonraki istek tam sonuç yerine 304 alır
+            response.headers.pop('ETag', None)
+            response.headers.pop('Last-Modified', None)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
@@ -1,57 +1,223 @@
-import google.generativeai as genai
+import json
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.db.models import Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotAuthenticated, NotFound, ParseError
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
-from taggit.models import Tag
-from .models import Note, Category
-from .serializers import NoteSerializer, CategorySerializer, TagSerializer, PublicNoteSerializer
+from .models import Note, Category, NoteRevision
+from .serializers import (
+    NoteSerializer, CategorySerializer, PublicNoteSerializer, NoteRevisionSerializer,
+    is_summary_request,
+)
 from .filters import NoteFilter
+from .events import issue_ticket
+from .instrumentation import registry
+from .ordering import OrderingError, apply_full_order, move_note
+from .pagination import KeysetPagination
+from .public import get_public_note, public_queryset
+from .purge import exclude_pending, request_purge
+from .revisions import reconstruct, word_diff
+from .bulk import NoteBatch, restore_all
+from .transfer import NoteImporter, export_markdown_zip, export_ndjson
+from .ai import TagGenerationError, get_tag_service
+from .aggregates import TREND_WINDOWS, annotate_note_counts, category_counts, tag_counts
+from .search import search_notes
+from .stats import read_stats
+from .versioning import conditional_collection, deleted_since, get_version
+
+
+def summarize(queryset, request):
+    """
+    Özet modunda büyük içerik sütunları okunmaz; önceden hesaplanmış excerpt yeterli.
+    """
+    if request.method == 'GET' and is_summary_request(request):
+        queryset = queryset.defer('content', 'content_html')
+    return queryset
+
+
+def optional_int(value):
+    return None if value in (None, '') else int(value)
+
 
 # --- AI ETIKET OLUSTURUCU ---
-genai.configure(api_key=settings.GOOGLE_API_KEY)
+def authenticate_json_request(request):
+    """
+    Django async view'ları için DRF kimlik doğrulaması ve JSON gövdesi.
+    (kullanıcı, veri) döner; yetkisizse NotAuthenticated, gövde bir JSON
+    nesnesi değilse ParseError fırlatır.
+    """
+    drf_request = Request(
+        request,
+        parsers=[JSONParser()],
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    if not drf_request.user or not drf_request.user.is_authenticated:
+        raise NotAuthenticated()
+    if not isinstance(drf_request.data, dict):
+        raise ParseError("Gövde bir JSON nesnesi olmalı.")
+    return drf_request.user, drf_request.data
 
-class AITagGeneratorView(APIView):
-    permission_classes = [permissions.IsAuthenticated]
 
-    def post(self, request):
-        title = request.data.get("title", "")
-        content = request.data.get("content", "")
-        
+# CSRF, DRF'in SessionAuthentication sınıfı tarafından denetlenir (APIView'daki gibi)
+@method_decorator(csrf_exempt, name='dispatch')
+class AITagGeneratorView(View):
+    """
+    Başlık ve içerikten etiket önerir. Asenkron çalışır; backend/asgi.py
+    üzerinden servis edildiğinde model cevabı beklenirken worker boşta kalmaz.
+    """
+    async def post(self, request):
+        try:
+            user, data = await sync_to_async(authenticate_json_request)(request)
+        except APIException as e:
+            return JsonResponse({"error": str(e.detail)}, status=e.status_code)
+
+        title = data.get("title") or ""
+        content = data.get("content") or ""
+        if not isinstance(title, str) or not isinstance(content, str):
+            return JsonResponse({"error": "Başlık ve içerik metin olmalı."}, status=400)
         if not title and not content:
-            return Response({"error": "Başlık veya içerik gerekli."}, status=400)
+            return JsonResponse({"error": "Başlık veya içerik gerekli."}, status=400)
 
-        prompt = f"""
-        Aşağıdaki metni analiz et ve Türkçe olarak en uygun 3 ila 5 etiketi bul.
-        Sadece etiketleri virgül ile ayırarak yaz. Başka açıklama yapma.
-        
-        Başlık: {title}
-        İçerik: {content}
-        """
+        try:
+            tags = await get_tag_service().generate(title, content)
+        except TagGenerationError as e:
+            return JsonResponse({"error": str(e)}, status=502)
+        return JsonResponse({"tags": tags})
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AITagBatchView(View):
+    """
+    Birden çok not için tek istekte etiket üretir.
+    Gövde: {"notes": [{"title": ..., "content": ...}]} veya {"note_ids": [1, 2]}
+    """
+    async def post(self, request):
+        try:
+            user, data = await sync_to_async(authenticate_json_request)(request)
+        except APIException as e:
+            return JsonResponse({"error": str(e.detail)}, status=e.status_code)
+
+        try:
+            items = await sync_to_async(batch_items)(user, data)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        results = await get_tag_service().generate_many(
+            [(item["title"], item["content"]) for item in items]
+        )
+        return JsonResponse({"results": [
+            dict(item["ref"], **({"error": str(result)} if isinstance(result, Exception) else {"tags": result}))
+            for item, result in zip(items, results)
+        ]})
 
+
+def batch_items(user, data):
+    if "note_ids" in data:
         try:
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            response = model.generate_content(prompt)
-            tags_list = [tag.strip() for tag in response.text.strip().split(',') if tag.strip()]
-            return Response({"tags": tags_list})
-        except Exception as e:
-            return Response({"error": str(e)}, status=500)
+            ids = [int(note_id) for note_id in data["note_ids"]]
+        except (TypeError, ValueError):
+            raise ValueError("Geçersiz not id.")
+        notes = Note.objects.filter(owner=user, id__in=ids).values("id", "title", "content")
+        items = [{"ref": {"id": n["id"]}, "title": n["title"], "content": n["content"]} for n in notes]
+    else:
+        notes = data.get("notes")
+        if not isinstance(notes, list):
+            raise ValueError("'notes' veya 'note_ids' listesi gerekli.")
+        items = [
+            {"ref": {"index": index}, "title": note.get("title") or "", "content": note.get("content") or ""}
+            for index, note in enumerate(notes) if isinstance(note, dict)
+        ]
+        if not all(isinstance(item["title"], str) and isinstance(item["content"], str) for item in items):
+            raise ValueError("Başlık ve içerik metin olmalı.")
+    if len(items) > settings.AI_TAG_BATCH_LIMIT:
+        raise ValueError(f"En fazla {settings.AI_TAG_BATCH_LIMIT} not gönderilebilir.")
+    return items
+
+
+# --- DEĞİŞİKLİK BİLDİRİMLERİ (SSE) ---
+class NoteEventsView(View):
+    """
+    /api/events/ akışı backend/asgi.py'deki EventStreamApplication tarafından
+    Django'ya gelmeden servis edilir (bkz. notes/events.py). İstek buraya
+    ulaştıysa uygulama WSGI ile (veya sarmalayıcı olmadan) çalışıyordur;
+    her bağlantı bir worker'ı tutacağından akış açılmaz.
+    """
+    async def get(self, request):
+        return JsonResponse({"error": "Olay akışı sadece backend.asgi ile servis edilir."}, status=501)
+
+
+class NoteEventTicketView(APIView):
+    """
+    Olay akışı için tek kullanımlık bilet: EventSource başlık gönderemediği
+    için tarayıcı API token'ı yerine bunu ?ticket= ile gönderir.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        return Response(
+            {'ticket': issue_ticket(request.user.pk), 'expires_in': settings.NOTE_EVENTS_TICKET_TTL},
+            status=status.HTTP_201_CREATED,
+        )
+
 
 # --- TAGS ---
 class TagCloudView(APIView):
     """
-    Kullanıcıya ait notlardaki tüm etiketleri listeler.
+    Kullanıcıya ait notlardaki tüm etiketleri kullanım sayılarıyla listeler.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    @conditional_collection
+    def get(self, request, *args, **kwargs):
+        # Çöpteki notlar sayılmaz; sonuç koleksiyon sürümüne göre önbellekte
+        version, _ = get_version(request)
+        counts = tag_counts(request.user, version)
+        return Response([
+            {'id': tag['id'], 'name': tag['name'], 'slug': tag['slug'], 'count': tag['count']}
+            for tag in counts
+        ])
+
+
+class TrendingTagsView(APIView):
+    """
+    Son `window` gün içinde güncellenen notlarda en çok geçen etiketler.
+    Örn: ?window=7&limit=10
     """
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        # Sadece mevcut kullanıcıya ait notların etiketlerini al
-        tags = Tag.objects.filter(note__owner=request.user).distinct()
-        serializer = TagSerializer(tags, many=True)
-        return Response(serializer.data)
+        try:
+            window = int(request.query_params.get('window', 7))
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response({'error': 'Geçersiz parametre.'}, status=status.HTTP_400_BAD_REQUEST)
+        if window not in TREND_WINDOWS:
+            return Response(
+                {'error': f'window şunlardan biri olmalı: {", ".join(map(str, TREND_WINDOWS))}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        version, _ = get_version(request)
+        trending = [tag for tag in tag_counts(request.user, version) if tag['windows'][window]]
+        trending.sort(key=lambda tag: (-tag['windows'][window], -tag['count'], tag['name']))
+        return Response([
+            {'id': tag['id'], 'name': tag['name'], 'slug': tag['slug'],
+             'count': tag['windows'][window], 'total': tag['count']}
+            for tag in trending[:max(limit, 0)]
+        ])
 
 
 # --- NORMAL NOTLAR (Not Listesi) ---
@@ -60,29 +226,144 @@ class NoteViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_class = NoteFilter
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         # Arama parametresi var mı?
         queryset = Note.objects.filter(owner=self.request.user, is_deleted=False)
+        # Sahip ve etiketler not başına ayrı sorgu atılmasın diye önceden yüklenir
+        queryset = queryset.select_related('owner').prefetch_related('tags')
+        queryset = summarize(queryset, self.request)
         search_query = self.request.query_params.get('search', None)
         
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(content__icontains=search_query) |
-                Q(tags__name__icontains=search_query)
-            ).distinct()
-            
+            # Tam metin indeksi üzerinden ara, sonuçları alakaya göre sırala
+            queryset = search_notes(queryset, search_query)
+            return queryset.order_by('-is_pinned', 'search_rank', 'order', '-updated_at')
+
         return queryset.order_by('-is_pinned', 'order', '-updated_at')
 
+    @conditional_collection
+    def list(self, request, *args, **kwargs):
+        since = request.query_params.get('since')
+        if since is None:
+            return super().list(request, *args, **kwargs)
+        return self.delta(request, since)
+
+    def delta(self, request, since):
+        """
+        ?since=<version>: o sürümden sonra değişen aktif notlar ile
+        çöpe atılan ve kalıcı silinen notların id'lerini döner. Silme
+        kayıtları o sürüme kadar temizlendiyse sadece `resync` döner.
+        """
+        try:
+            since = int(since)
+        except ValueError:
+            return Response({'error': 'Geçersiz sürüm.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        version, _ = get_version(request)
+        deleted = deleted_since(request, since)
+        if deleted is None:
+            return Response({'version': version, 'resync': True})
+        changed = Note.objects.filter(owner=request.user, version__gt=since)
+        active = changed.filter(is_deleted=False).select_related('owner').prefetch_related('tags')
+        trashed = changed.filter(is_deleted=True).values_list('id', flat=True)
+        return Response({
+            'version': version,
+            'changed': self.get_serializer(active.order_by('version'), many=True).data,
+            'trashed': list(trashed),
+            'deleted': deleted,
+        })
+
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
+    # İSTATİSTİKLER (sayaçlardan, notları okumadan)
+    @action(detail=False, methods=['get'])
+    @conditional_collection
+    def stats(self, request):
+        data = read_stats(request.user)
+        names = dict(
+            Category.objects.filter(owner=request.user, pk__in=[pk for pk in data['categories'] if pk])
+            .values_list('id', 'name')
+        )
+        data['categories'] = [
+            {'id': pk, 'name': names.get(pk), 'count': count}
+            for pk, count in sorted(data['categories'].items(), key=lambda item: -item[1])
+        ]
+        return Response(data)
+
+    # TOPLU İŞLEMLER (çoklu seçim)
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        {"operations": [{"op": "pin", "id": 1}, {"op": "create", "title": "..."}]}
+        İşlemler tek transaction içinde uygulanır, her biri için sonuç döner.
+        """
+        operations = request.data.get('operations')
+        if not isinstance(operations, list):
+            return Response({'error': "'operations' listesi gerekli."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(operations) > settings.NOTE_BATCH_LIMIT:
+            return Response(
+                {'error': f'En fazla {settings.NOTE_BATCH_LIMIT} işlem gönderilebilir.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        results = NoteBatch(request.user, self.get_serializer_context()).run(operations)
+        return Response({'results': results})
+
+    # DIŞA / İÇE AKTARMA (bkz. notes/transfer.py)
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Tüm notlar NDJSON olarak akıtılır; ?trashed=1 çöptekileri de ekler.
+        """
+        include_trashed = request.query_params.get('trashed') in ('1', 'true')
+        response = StreamingHttpResponse(
+            export_ndjson(request.user, include_trashed), content_type='application/x-ndjson'
+        )
+        response['Content-Disposition'] = f'attachment; filename="notlar-{timezone.localdate()}.ndjson"'
+        return response
+
+    @action(detail=False, methods=['get'], url_path='export-markdown')
+    def export_markdown(self, request):
+        include_trashed = request.query_params.get('trashed') in ('1', 'true')
+        response = StreamingHttpResponse(
+            export_markdown_zip(request.user, include_trashed), content_type='application/zip'
+        )
+        response['Content-Disposition'] = f'attachment; filename="notlar-{timezone.localdate()}.zip"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_notes(self, request):
+        """
+        NDJSON içe aktarma: multipart 'file' alanı veya doğrudan istek gövdesi
+        (application/x-ndjson). ?progress=1 ile her partiden sonra bir
+        ilerleme satırı, en sonda da 'done' işaretli özet akıtılır (NDJSON);
+        aksi halde sonunda özet döner.
+        """
+        if request.content_type.startswith('multipart/form-data'):
+            stream = request.FILES.get('file')
+        else:
+            stream = request.stream
+        if stream is None:
+            return Response({'error': "Dosya ('file') veya NDJSON gövde gerekli."}, status=status.HTTP_400_BAD_REQUEST)
+
+        importer = NoteImporter(request.user)
+        if request.query_params.get('progress') in ('1', 'true'):
+            def progress():
+                for summary in importer.batches(stream):
+                    yield json.dumps(summary, ensure_ascii=False) + '\n'
+                yield json.dumps({**importer.summary, 'done': True}, ensure_ascii=False) + '\n'
+            return StreamingHttpResponse(progress(), content_type='application/x-ndjson')
+        summary = importer.run(stream)
+        return Response(summary, status=status.HTTP_201_CREATED if summary['imported'] else status.HTTP_200_OK)
+
     # 1. NOTU ÇÖPE ATMA (Soft Delete)
     @action(detail=True, methods=['post'])
     def trash(self, request, pk=None):
         note = self.get_object()
         note.is_deleted = True
+        note.deleted_at = timezone.now()
         note.save()
         return Response({'status': 'not çöp kutusuna taşındı'})
 
@@ -106,53 +387,228 @@ class NoteViewSet(viewsets.ModelViewSet):
         note.save()
         return Response(NoteSerializer(note).data)
 
+    # REVİZYON GEÇMİŞİ (bkz. notes/revisions.py)
+    @action(detail=True, methods=['get'])
+    def revisions(self, request, pk=None):
+        note = self.get_object()
+        queryset = note.revisions.defer('data').order_by('-number')
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(NoteRevisionSerializer(page, many=True).data)
+        return Response(NoteRevisionSerializer(queryset, many=True).data)
+
+    def get_revision(self, number):
+        note = self.get_object()
+        try:
+            return note, reconstruct(note.pk, int(number))
+        except NoteRevision.DoesNotExist:
+            raise NotFound('Revizyon bulunamadı.')
+
+    @action(detail=True, methods=['get'], url_path=r'revisions/(?P<number>\d+)')
+    def revision(self, request, pk=None, number=None):
+        _, revision = self.get_revision(number)
+        return Response({**NoteRevisionSerializer(revision).data, 'content': revision.content})
+
+    @action(detail=True, methods=['get'], url_path=r'revisions/(?P<number>\d+)/diff')
+    def revision_diff(self, request, pk=None, number=None):
+        """
+        Revizyonun bir öncekine (veya ?against=<numara>) göre kelime farkı.
+        """
+        note, revision = self.get_revision(number)
+        try:
+            against = optional_int(request.query_params.get('against'))
+        except ValueError:
+            return Response({'error': 'Geçersiz revizyon numarası.'}, status=status.HTTP_400_BAD_REQUEST)
+        if against is None:
+            against = (
+                note.revisions.filter(number__lt=revision.number)
+                .order_by('-number').values_list('number', flat=True).first()
+            )
+        if against is None:
+            base_title, base_content = '', ''
+        else:
+            _, base = self.get_revision(against)
+            base_title, base_content = base.title, base.content
+        return Response({
+            'number': revision.number,
+            'against': against,
+            'title': {'old': base_title, 'new': revision.title} if base_title != revision.title else None,
+            'changes': word_diff(base_content, revision.content),
+        })
+
+    @action(detail=True, methods=['post'], url_path=r'revisions/(?P<number>\d+)/restore')
+    def restore_revision(self, request, pk=None, number=None):
+        """
+        Notun başlık ve içeriğini revizyondakiyle değiştirir; geri yükleme de
+        yeni bir revizyon olarak kaydedilir.
+        """
+        note, revision = self.get_revision(number)
+        note.title = revision.title
+        note.content = revision.content
+        note.save()
+        return Response(self.get_serializer(note).data)
+
+    # BENZER VE TEKRARLANAN NOTLAR (bkz. notes/similarity.py)
+    def similar_notes(self, note_ids):
+        notes = Note.objects.filter(owner=self.request.user, is_deleted=False, pk__in=note_ids)
+        return {note['id']: note for note in notes.values('id', 'title', 'excerpt', 'updated_at')}
+
+    @staticmethod
+    def similarity_response(data, pending):
+        # İmzası hesaplanmamış notlar varsa sonuç eksiktir: 202 ile döner,
+        # istemci tekrar sorarak indeksin tamamlanmasını bekler
+        if pending:
+            return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Retry-After': '1'})
+        return Response(data)
+
+    @action(detail=True, methods=['get'])
+    @conditional_collection
+    def related(self, request, pk=None):
+        # numpy sadece bu uç noktalar kullanıldığında yüklenir
+        from .similarity import related_notes
+
+        note = self.get_object()
+        try:
+            limit = min(optional_int(request.query_params.get('limit')) or 10, 50)
+        except ValueError:
+            return Response({'error': 'Geçersiz limit.'}, status=status.HTTP_400_BAD_REQUEST)
+        matches, pending = related_notes(request.user.pk, note.pk, max(limit, 1))
+        notes = self.similar_notes([note_id for note_id, _ in matches])
+        return self.similarity_response([
+            {**notes[note_id], 'similarity': round(score, 3)}
+            for note_id, score in matches if note_id in notes
+        ], pending)
+
+    @action(detail=False, methods=['get'])
+    @conditional_collection
+    def duplicates(self, request):
+        """
+        Birbirinin kopyası olması muhtemel not grupları; ?threshold=0.5-1.
+        """
+        from .similarity import duplicate_groups
+
+        try:
+            threshold = float(request.query_params.get('threshold') or settings.SIMILARITY_DUPLICATE_THRESHOLD)
+            limit = min(optional_int(request.query_params.get('limit')) or 50, 200)
+        except ValueError:
+            return Response({'error': 'Geçersiz parametre.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 0.5 <= threshold <= 1:
+            return Response({'error': 'threshold 0.5 ile 1 arasında olmalı.'}, status=status.HTTP_400_BAD_REQUEST)
+        groups, pending = duplicate_groups(request.user.pk, threshold)
+        groups = groups[:max(limit, 1)]
+        notes = self.similar_notes([note_id for note_ids, _ in groups for note_id in note_ids])
+        return self.similarity_response([
+            {'similarity': round(score, 3), 'notes': [notes[note_id] for note_id in note_ids if note_id in notes]}
+            for note_ids, score in groups
+        ], pending)
+
     # 4. SIRALAMA GÜNCELLEME (Sürükle Bırak)
-    @action(detail=False, methods=['put'])
+    @action(detail=False, methods=['post', 'put'], url_path='update-order')
+    def reorder(self, request):
+        """
+        İki biçim kabul eder:
+        - {"ordered_ids": [3, 1, 2]}: listenin tamamını yeniden sıralar.
+        - {"note_id": 3, "after_id": 1, "before_id": 2}: tek notu iki notun
+          arasına taşır (listenin başı/sonu için biri boş bırakılabilir).
+        """
+        try:
+            if 'note_id' in request.data:
+                orders = move_note(
+                    request.user,
+                    int(request.data['note_id']),
+                    after_id=optional_int(request.data.get('after_id')),
+                    before_id=optional_int(request.data.get('before_id')),
+                )
+            else:
+                ordered_ids = [int(note_id) for note_id in request.data.get('ordered_ids', [])]
+                orders = apply_full_order(request.user, ordered_ids)
+        except (TypeError, ValueError):
+            return Response({'error': 'Geçersiz not id.'}, status=status.HTTP_400_BAD_REQUEST)
+        except OrderingError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Note.DoesNotExist:
+            return Response({'error': 'Not bulunamadı.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'status': 'sıralama güncellendi', 'orders': orders})
+
+    # Eski istemciler için: PUT /api/notes/update_order/
+    @action(detail=False, methods=['post', 'put'])
     def update_order(self, request):
-        ordered_ids = request.data.get('ordered_ids', [])
-        for index, note_id in enumerate(ordered_ids):
-            try:
-                note = Note.objects.get(id=note_id, owner=request.user)
-                note.order = index
-                note.save()
-            except Note.DoesNotExist:
-                continue
-        return Response({'status': 'sıralama güncellendi'})
+        return self.reorder(request)
 
 
 # --- PUBLIC NOTES (Paylaşılan Notlar) ---
 class PublicNoteViewSet(viewsets.ReadOnlyModelViewSet):
     """
     Paylaşım linki (UUID) ile bir notu halka açık olarak görüntüler.
+    Yanıtlar önbellekten gelir ve CDN/proxy'lerin kısa süre saklayıp ETag ile
+    doğrulayabilmesi için ETag ile Cache-Control başlıkları taşır.
     """
-    queryset = Note.objects.filter(is_shared=True, share_uuid__isnull=False)
+    queryset = public_queryset()
     serializer_class = PublicNoteSerializer
     permission_classes = [permissions.AllowAny] # Herkes erişebilir
     lookup_field = 'share_uuid'
 
+    def retrieve(self, request, share_uuid=None):
+        payload = get_public_note(share_uuid)
+        if payload is None:
+            raise NotFound()
+
+        response = get_conditional_response(request, etag=payload['etag'])
+        if response is None:
+            response = Response(payload['data'])
+        response['ETag'] = payload['etag']
+        # Paylaşım kaldırılınca veya not değişince eski kopya en fazla
+        # max-age kadar görünür; CDN'ler de aynı süreyi kullanır (s-maxage yok)
+        # ve süre dolunca ETag ile doğrular.
+        patch_cache_control(
+            response, public=True,
+            max_age=settings.PUBLIC_NOTE_MAX_AGE,
+            must_revalidate=True,
+        )
+        return response
+
 
 # --- ÇÖP KUTUSU (Silinmiş Notlar) ---
 class TrashedNoteViewSet(viewsets.ModelViewSet):
     serializer_class = NoteSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         # Sadece silinmişleri getir
-        return Note.objects.filter(owner=self.request.user, is_deleted=True).order_by('-updated_at')
+        # Boşaltılmayı bekleyenler gösterilmez
+        queryset = exclude_pending(Note.objects.filter(
+            owner=self.request.user, is_deleted=True
+        )).select_related('owner').prefetch_related('tags')
+        return summarize(queryset, self.request).order_by('-updated_at')
+
+    @conditional_collection
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
     # 1. GERİ YÜKLEME
     @action(detail=True, methods=['post'])
     def restore(self, request, pk=None):
         note = self.get_object()
         note.is_deleted = False
+        note.deleted_at = None
         note.save()
         return Response({'status': 'not geri yüklendi'})
 
-    # 2. ÇÖPÜ BOŞALT (Hepsini Kalıcı Sil)
+    # 2. HEPSİNİ GERİ YÜKLE
+    @action(detail=False, methods=['put', 'post'], url_path='restore-all')
+    def restore_all(self, request):
+        count = restore_all(request.user)
+        return Response({'status': 'notlar geri yüklendi', 'count': count})
+
+    # 3. ÇÖPÜ BOŞALT (Hepsini Kalıcı Sil)
+    # Silme arka planda parça parça yapılır (bkz. notes/purge.py)
     @action(detail=False, methods=['delete'], url_path='empty-all')
     def empty_all(self, request):
-        Note.objects.filter(owner=request.user, is_deleted=True).delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        job = request_purge(request.user)
+        if job.finished_at:
+            return Response({'status': 'çöp kutusu boşaltıldı', 'job': job.pk, 'count': job.purged})
+        return Response({'status': 'çöp kutusu boşaltılıyor', 'job': job.pk}, status=status.HTTP_202_ACCEPTED)
 
 
 # --- KATEGORİLER ---
@@ -162,7 +618,28 @@ class CategoryViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Category.objects.filter(owner=self.request.user)
+        return annotate_note_counts(Category.objects.filter(owner=self.request.user))
+
+    @conditional_collection
+    def list(self, request, *args, **kwargs):
+        # Not sayılarıyla birlikte, koleksiyon sürümüne göre önbellekte
+        version, _ = get_version(request)
+        return Response(category_counts(request.user, version))
 
     def perform_create(self, serializer):
-        serializer.save(owner=self.request.user)
\ No newline at end of file
+        serializer.save(owner=self.request.user)
+
+# --- PERFORMANS METRİKLERİ ---
+class MetricsView(APIView):
+    """
+    Bu süreçteki uç nokta bazlı gecikme histogramları (bkz. notes/instrumentation.py).
+    DELETE ile sıfırlanır.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response({'enabled': settings.PERF_INSTRUMENTATION, **registry.snapshot()})
+
+    def delete(self, request):
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,45 @@
+"""
+Süreç içi arka plan worker'ı.
+
+İstek içinde yapılması pahalı olan işler (çöp boşaltma, revizyon
+sıkıştırma) ilgili ayarla açılırsa bir daemon thread'de çalıştırılır.
+Ayarlar varsayılan olarak kapalıdır: her web süreci kendi thread'ini
+açacağından çok worker'lı kurulumlarda bu işleri yönetim komutları (cron
+veya `--loop`) yapar. İlk `wake` çağrısında thread başlatılır; her uyandırmada görev fonksiyonu bir kez çalışır,
+uyandırmalar birikirse tek çalıştırmada birleşir. Süreç kapanırsa yarım
+kalan işler ilgili yönetim komutuyla tamamlanır.
+"""
+import logging
+import threading
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    def __init__(self, name, task):
+        self.name = name
+        self.task = task
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def wake(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name=self.name, daemon=True)
+                self.thread.start()
+        self.event.set()
+
+    def run(self):
+        while True:
+            self.event.wait()
+            self.event.clear()
+            try:
+                self.task()
+            except Exception:
+                logger.exception("Arka plan işi başarısız oldu: %s", self.name)
+            finally:
+                # Bu thread'e ait bağlantılar
+                connections.close_all()
@@ -25,6 +25,9 @@ import 'react-quill/dist/quill.snow.css'; // Quill'in stil dosyasını ekleyin
 // tekrar HTML'e çevirmek için bir yardımcı fonksiyon.
 const unescapeHtml = (html) => {
   if (!html) return '';
+  // Sadece tamamı escape edilmiş eski içerik çözülür; editör içeriğindeki
+  // metin olarak yazılmış "&lt;b&gt;" korunur (bkz. backend notes/content.py)
+  if (html.includes('<') || !/^\s*&lt;\/?[a-zA-Z]/.test(html)) return html;
   const txt = document.createElement("textarea");
   txt.innerHTML = html;
   return txt.value;
@@ -12,6 +12,9 @@ import {
 
 const unescapeHtml = (html) => {
   if (!html) return '';
+  // Sadece tamamı escape edilmiş eski içerik çözülür; editör içeriğindeki
+  // metin olarak yazılmış "&lt;b&gt;" korunur (bkz. backend notes/content.py)
+  if (html.includes('<') || !/^\s*&lt;\/?[a-zA-Z]/.test(html)) return html;
   const txt = document.createElement("textarea");
   txt.innerHTML = html;
   return txt.value;
@@ -109,7 +112,10 @@ const NotKarti = ({ note, onSelect, onDelete, onTogglePin, onTagClick, onDragSta
       <div className="note-body">
         <h3 className="note-title-modern">{note.title}</h3>
         <div className="note-preview-modern">
-            {note.content && (
+            {/* content_html sunucuda kayıt anında temizlenmiş HTML'dir */}
+            {note.content_html ? (
+                <div className="ql-editor" dangerouslySetInnerHTML={{ __html: note.content_html }} />
+            ) : note.content && (
                 <div className="ql-editor" dangerouslySetInnerHTML={{ __html: unescapeHtml(note.content) }} />
             )}
         </div>
@@ -1,5 +1,5 @@
-import { useEffect, useState, useCallback, useMemo } from "react";
-import { useDebounce } from './hooks.js';
+import { useEffect, useState, useCallback, useMemo, useRef } from "react";
+import { useDebounce, useEventStream } from './hooks.js';
 import React from 'react';
 import { ThemeProvider, createTheme, useTheme } from '@mui/material/styles';
 import CssBaseline from '@mui/material/CssBaseline';
@@ -303,10 +303,76 @@ export default function Uygulama() {
     }
   }, [notes, reloadTags]);
 
+  // --- Canlı senkronizasyon (GET /api/events/) ---
+  // Başka sekme/cihazdaki değişikliklerde liste baştan çekilmez; bilinen
+  // sürümden sonra değişen notlar ?since= ile alınıp listeye işlenir.
+  const syncVersion = useRef(null);
+  const syncTimer = useRef(null);
+
+  const syncChanges = useCallback(async () => {
+    // Arama açıkken değişen notların sonuçlara girip girmediği bilinmez
+    if (debouncedSearchTerm || syncVersion.current === null) {
+      load(debouncedSearchTerm);
+      return;
+    }
+    try {
+      const delta = await apiFetch(`/api/notes/?since=${syncVersion.current}`);
+      if (delta.resync) {
+        // Bu sürümden sonraki silme kayıtları temizlenmiş; liste baştan alınır
+        syncVersion.current = delta.version;
+        load();
+        return;
+      }
+      syncVersion.current = delta.version;
+      const changed = new Map(delta.changed.map((n) => [n.id, {
+        ...n,
+        owner: (typeof n.owner === 'object' && n.owner !== null ? n.owner.username : n.owner) ?? "Anonim",
+        updated_at: n.updated_at || n.created_at,
+      }]));
+      // Çöpe atılan ve kalıcı silinen notlar listeden çıkar
+      const removed = new Set([...delta.trashed, ...delta.deleted]);
+      if (changed.size || removed.size) {
+        setNotes((prev) => [
+          ...prev.filter((n) => !changed.has(n.id) && !removed.has(n.id)),
+          ...changed.values(),
+        ].sort((a, b) => b.is_pinned - a.is_pinned || a.order - b.order));
+        reloadTags();
+      }
+    } catch (e) {
+      console.error("Değişiklikler alınamadı:", e);
+    }
+  }, [debouncedSearchTerm, load, reloadTags]);
+
+  useEventStream(token, useCallback((event) => {
+    if (event.type === 'ready') {
+      // Yeniden bağlanınca eski sürümden devam edilir; arada kaçanlar da gelir
+      if (syncVersion.current === null) syncVersion.current = event.version;
+      return;
+    }
+    if (event.type === 'resync') {
+      syncVersion.current = null;
+    } else if (event.type === 'note.deleted') {
+      setNotes((prev) => prev.filter((n) => n.id !== event.id));
+      return;
+    } else if (event.version === undefined || event.version <= syncVersion.current) {
+      // Kategori olayları ve bu sürüme kadar zaten alınmış değişiklikler
+      return;
+    }
+    // Art arda gelen olaylar tek istekte toplanır
+    clearTimeout(syncTimer.current);
+    syncTimer.current = setTimeout(syncChanges, 300);
+  }, [syncChanges]));
+
+  useEffect(() => {
+    // Başka kullanıcıyla girişte sürüm baştan alınır
+    syncVersion.current = null;
+    return () => clearTimeout(syncTimer.current);
+  }, [token]);
+
   const handleNoteRestored = useCallback(() => {
     showSuccess("Not başarıyla geri getirildi!");
-    load(debouncedSearchTerm);
-  }, [load, debouncedSearchTerm]);
+    syncChanges();
+  }, [syncChanges]);
 
   const onSave = useCallback(async (note) => {
     const payload = {
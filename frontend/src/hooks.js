@@ -1,5 +1,6 @@
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
+import { apiFetch } from './api.js';
 
 export function useDebounce(value, delay) { 
   const [debouncedValue, setDebouncedValue] = useState(value);
@@ -15,4 +16,58 @@ export function useDebounce(value, delay) {
   }, [value, delay]); 
 
   return debouncedValue;
-}
\ No newline at end of file
+}
+// Sunucunun değişiklik bildirimlerini (GET /api/events/) dinler. EventSource
+// başlık gönderemediği için önce tek kullanımlık bir bilet alınır ve
+// ?ticket= ile bağlanılır; bilet ikinci kez kullanılamadığından bağlantı
+// koparsa tarayıcının aynı adresle yeniden denemesi yerine yeni bilet alınır.
+const RECONNECT_MS = 3000;
+
+export function useEventStream(token, onEvent) {
+  const handler = useRef(onEvent);
+
+  useEffect(() => {
+    handler.current = onEvent;
+  }, [onEvent]);
+
+  useEffect(() => {
+    if (!token || typeof EventSource === 'undefined') return;
+    let source = null;
+    let timer = null;
+    let closed = false;
+
+    const reconnect = () => {
+      if (!closed) timer = setTimeout(connect, RECONNECT_MS);
+    };
+
+    async function connect() {
+      let ticket;
+      try {
+        ({ ticket } = await apiFetch('/api/events/ticket/', { method: 'POST' }));
+      } catch (e) {
+        reconnect();
+        return;
+      }
+      if (closed) return;
+      source = new EventSource(`/api/events/?ticket=${encodeURIComponent(ticket)}`);
+      source.onmessage = (message) => {
+        try {
+          handler.current(JSON.parse(message.data));
+        } catch (e) {
+          console.error("Olay işlenemedi:", e);
+        }
+      };
+      source.onerror = () => {
+        source.close();
+        reconnect();
+      };
+    }
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(timer);
+      if (source) source.close();
+    };
+  }, [token]);
+}